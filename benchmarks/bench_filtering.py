@@ -0,0 +1,89 @@
+"""
+Times QACareersPage filtering and listing verification against the local stand-in
+site (utils/stand_in_site.py) at several listing sizes, without network access.
+
+    python benchmarks/bench_filtering.py --browser chrome --jobs 10 100 1000 10000 --filter-latency 0.3
+    python benchmarks/bench_filtering.py --jobs 1000 10000 --page-size 50   # lazy-loaded listing
+
+Every size gets a fresh stand-in site; the browser session is reused. "verify" is the
+in-page check of the rendered cards, "stream" the incremental collector walking the
+whole listing (strict mode). Medians per size are printed at the end.
+
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.base_page import BasePage  # noqa: E402
+from pages.qa_careers_page import QACareersPage  # noqa: E402
+from utils.browser_profiles import BROWSER_PROFILES  # noqa: E402
+from utils.driver_factory import SUPPORTED_BROWSERS, create_driver  # noqa: E402
+from utils.logger import configure_logging  # noqa: E402
+from utils.stand_in_site import StandInSite  # noqa: E402
+
+
+def bench(driver, jobs, filter_latency, page_size, runs):
+    """
+    :return: Per-run rows with filter, verify and stream seconds and success
+    :rtype: list
+
+    """
+    site = StandInSite(jobs=jobs, filter_latency=filter_latency, page_size=page_size).start()
+    BasePage.site_url = site.url
+    page = QACareersPage(driver)
+    rows = []
+    try:
+        for run in range(runs):
+            driver.get(f"{site.url}/careers/open-positions/?department=qualityassurance")
+            started = time.perf_counter()
+            filtered = page.select_location_if_department_is_qa()
+            page.wait_for_job_cards_to_load()
+            filtering = time.perf_counter() - started
+            started = time.perf_counter()
+            passed = filtered and page.verify_job_listings()
+            verify = time.perf_counter() - started
+            started = time.perf_counter()
+            streamed = page.verify_job_listings_incrementally(strict=True)
+            stream = time.perf_counter() - started
+            passed = passed and streamed
+            rows.append({"filter": filtering, "verify": verify, "stream": stream, "passed": passed})
+            print(f"[{jobs} jobs] run {run + 1}: filter {filtering:.2f}s, verify {verify:.2f}s, "
+                  f"stream {stream:.2f}s, {'passed' if passed else 'FAILED'}")
+    finally:
+        site.stop()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=SUPPORTED_BROWSERS, default="chrome")
+    parser.add_argument("--profile", choices=sorted(BROWSER_PROFILES), default="lean")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--filter-latency", type=float, default=0.3)
+    parser.add_argument("--page-size", type=int, default=0, help="Cards rendered per scroll (0: all at once)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--log-level", default="WARNING", help="Level of page-object logs shown on stderr")
+    args = parser.parse_args()
+    configure_logging(level=args.log_level, console=True)
+
+    driver = create_driver(args.browser, profile=args.profile)
+    try:
+        results = {jobs: bench(driver, jobs, args.filter_latency, args.page_size, args.runs) for jobs in args.jobs}
+    finally:
+        driver.quit()
+
+    print(f"\n{'jobs':>6} {'filter p50':>11} {'verify p50':>11} {'stream p50':>11} {'passed':>7}")
+    for jobs, rows in results.items():
+        filtering = statistics.median(row["filter"] for row in rows)
+        verify = statistics.median(row["verify"] for row in rows)
+        stream = statistics.median(row["stream"] for row in rows)
+        passed = sum(bool(row["passed"]) for row in rows)
+        print(f"{jobs:>6} {filtering:>10.2f}s {verify:>10.2f}s {stream:>10.2f}s {passed:>4}/{len(rows)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compares browser startup and E2E flow times across browser profiles.
+
+    python benchmarks/bench_profiles.py --browser chrome --profiles default headless lean fast --runs 3
+
+Every run launches a fresh browser (startup time), then runs the careers flow of
+tests/test_insider_career.py on it (flow time). Medians per profile are printed at the end.
+
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.careers_page import CareersPage  # noqa: E402
+from pages.home_page import HomePage  # noqa: E402
+from pages.qa_careers_page import QACareersPage  # noqa: E402
+from utils.browser_profiles import BROWSER_PROFILES, get_browser_profile  # noqa: E402
+from utils.driver_factory import SUPPORTED_BROWSERS, create_driver  # noqa: E402
+from utils.logger import configure_logging  # noqa: E402
+
+
+def run_flow(driver):
+    """
+    Runs the careers flow and returns whether every check passed.
+
+    """
+    home, careers, qa = HomePage(driver), CareersPage(driver), QACareersPage(driver)
+    home.open()
+    home.accept_cookies()
+    home.navigate_to_careers()
+    careers.go_to_qa_careers()
+    qa.click_see_all_qa_jobs()
+    qa.select_location_if_department_is_qa()
+    qa.wait_for_job_cards_to_be_replaced()
+    qa.wait_for_job_cards_to_load()
+    return qa.verify_job_listings() and qa.verify_view_role_redirects()
+
+
+def bench(browser, profile, runs):
+    """
+    :return: Per-run rows with startup, flow seconds and success
+    :rtype: list
+
+    """
+    rows = []
+    for run in range(runs):
+        started = time.perf_counter()
+        driver = create_driver(browser, profile=profile)
+        startup = time.perf_counter() - started
+        try:
+            get_browser_profile(profile).prepare_session(driver)
+            started = time.perf_counter()
+            passed = run_flow(driver)
+            flow = time.perf_counter() - started
+        finally:
+            driver.quit()
+        rows.append({"startup": startup, "flow": flow, "passed": passed})
+        print(f"[{browser}/{profile}] run {run + 1}: startup {startup:.2f}s, flow {flow:.2f}s, "
+              f"{'passed' if passed else 'FAILED'}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=SUPPORTED_BROWSERS, default="chrome")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(BROWSER_PROFILES), default=sorted(BROWSER_PROFILES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--log-level", default="WARNING", help="Level of page-object logs shown on stderr")
+    args = parser.parse_args()
+    configure_logging(level=args.log_level, console=True)
+
+    results = {profile: bench(args.browser, profile, args.runs) for profile in args.profiles}
+
+    print(f"\n{'profile':<10} {'startup p50':>12} {'flow p50':>10} {'total p50':>10} {'passed':>7}")
+    for profile, rows in results.items():
+        startup = statistics.median(row["startup"] for row in rows)
+        flow = statistics.median(row["flow"] for row in rows)
+        passed = sum(row["passed"] for row in rows)
+        print(f"{profile:<10} {startup:>11.2f}s {flow:>9.2f}s {startup + flow:>9.2f}s {passed:>4}/{len(rows)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,59 @@
+import threading
+import time
+
 from influxdb import InfluxDBClient
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def build_point(measurement, tags, fields, timestamp):
+    """
+    Builds a generic InfluxDB JSON point.
+
+    :param str measurement: Measurement name
+    :param dict tags: Tag set (values are stored as strings)
+    :param dict fields: Field set
+    :param timestamp: Timestamp of the point (UTC)
+    :type timestamp: datetime.datetime
+    :return: InfluxDB JSON point
+    :rtype: dict
+
+    """
+    return {
+        "measurement": measurement,
+        "tags": {key: str(value) for key, value in tags.items() if value is not None},
+        "time": timestamp.isoformat(),
+        "fields": fields,
+    }
+
+
+def build_test_result_point(test_name, status, duration, timestamp, tags=None):
+    """
+    Builds a single 'ui_test_results' point for InfluxDB.
+
+    :param test_name: Name of the test case
+    :type test_name: str
+    :param status: Status of the test ('passed' or 'failed')
+    :type status: str
+    :param duration: Duration of the test execution in seconds
+    :type duration: float
+    :param timestamp: Timestamp of the test execution (UTC)
+    :type timestamp: datetime.datetime
+    :param tags: Optional extra tags merged into the point
+    :type tags: dict
+    :return: InfluxDB JSON point
+    :rtype: dict
+
+    """
+    point_tags = {
+        "test_name": test_name,
+        "status": status,
+    }
+    if tags:
+        point_tags.update(tags)
+
+    return build_point("ui_test_results", point_tags, {"duration": float(duration)}, timestamp)
 
 
 # InfluxDB'ye test sonucu yazan fonksiyon
@@ -6,6 +61,9 @@ def insert_test_result_to_influxdb(test_name, status, duration, timestamp):
     """
     Inserts a test result into the InfluxDB database.
 
+    Opens a dedicated connection for a single point. Prefer InfluxDBBatchWriter
+    when reporting many results from the same session.
+
     :param test_name: Name of the test case
     :type test_name: str
     :param status: Status of the test ('passed' or 'failed')
@@ -20,24 +78,164 @@ def insert_test_result_to_influxdb(test_name, status, duration, timestamp):
         client = InfluxDBClient(host='localhost', port=8086)
         client.switch_database('test_results')
 
-        json_body = [
-            {
-                "measurement": "ui_test_results",
-                "tags": {
-                    "test_name": test_name,
-                    "status": status,
-                },
-                "time": timestamp.isoformat(),
-                "fields": {
-                    "duration": float(duration)
-                }
-            }
-        ]
+        json_body = [build_test_result_point(test_name, status, duration, timestamp)]
 
         client.write_points(json_body)
         client.close()
-        print(f"✅ InfluxDB'ye veri yazıldı: {test_name} | {status} | {duration:.2f}s")
+        logger.info("✅ InfluxDB'ye veri yazıldı: %s | %s | %.2fs", test_name, status, duration)
 
     except Exception as e:
-        print(f"❌ InfluxDB yazım hatası: {e}")
+        logger.error("❌ InfluxDB yazım hatası: %s", e)
+
+
+class InfluxDBBatchWriter:
+    """
+    Session-scoped InfluxDB writer.
+
+    Keeps a single client (and its pooled HTTP connection) for the whole session,
+    buffers points in memory and writes them in batches. A batch is flushed when
+    `batch_size` points are buffered, when `flush_interval` seconds have passed
+    since the last flush, and always on close().
+
+    :param str host: InfluxDB host
+    :param int port: InfluxDB HTTP port
+    :param str database: Target database
+    :param int batch_size: Number of buffered points that triggers a flush
+    :param float flush_interval: Max seconds between flushes while points are buffered
+    :param float timeout: HTTP timeout for a single write request
+    :param client: Optional pre-built InfluxDBClient (mainly for tests)
+
+    """
+
+    def __init__(self, host='localhost', port=8086, database='test_results',
+                 batch_size=100, flush_interval=10.0, timeout=5, client=None):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.client = client or InfluxDBClient(host=host, port=port, database=database,
+                                               timeout=timeout, retries=1)
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._created_at = time.monotonic()
+        self._last_flush = self._created_at
+        self._closed = False
+        self.stats = {
+            "points_received": 0,
+            "points_written": 0,
+            "points_failed": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "flush_seconds": 0.0,
+        }
+
+    def write(self, point):
+        """
+        Buffers a point and flushes if the batch size or interval is reached.
+
+        :param dict point: InfluxDB JSON point
+        :return: True if this call triggered a flush
+        :rtype: bool
+
+        """
+        with self._lock:
+            if self._closed:
+                self.stats["points_failed"] += 1
+                return False
+            self._buffer.append(point)
+            self.stats["points_received"] += 1
+            due = len(self._buffer) >= self.batch_size or self._interval_elapsed()
+        if due:
+            self.flush()
+        return due
+
+    def write_test_result(self, test_name, status, duration, timestamp, tags=None):
+        """
+        Buffers a 'ui_test_results' point.
+
+        :param str test_name: Name of the test case
+        :param str status: Status of the test ('passed' or 'failed')
+        :param float duration: Duration of the test execution in seconds
+        :param datetime.datetime timestamp: Timestamp of the test execution (UTC)
+        :param dict tags: Optional extra tags
+
+        """
+        return self.write(build_test_result_point(test_name, status, duration, timestamp, tags))
+
+    def flush_if_due(self):
+        """
+        Flushes buffered points if the flush interval has elapsed.
+        Meant to be called periodically by an idle background thread.
+
+        :return: True if a flush happened
+        :rtype: bool
+
+        """
+        with self._lock:
+            due = bool(self._buffer) and self._interval_elapsed()
+        if due:
+            self.flush()
+        return due
+
+    def flush(self):
+        """
+        Writes all buffered points in a single request.
+        Failed batches are dropped and counted, never raised.
+
+        :return: Number of points written
+        :rtype: int
+
+        """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+
+        started = time.monotonic()
+        try:
+            self.client.write_points(batch, database=self.database)
+        except Exception as e:
+            with self._lock:
+                self.stats["failed_flushes"] += 1
+                self.stats["points_failed"] += len(batch)
+                self.stats["flush_seconds"] += time.monotonic() - started
+            logger.error("❌ InfluxDB batch write error (%d points): %s", len(batch), e)
+            return 0
+
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["points_written"] += len(batch)
+            self.stats["flush_seconds"] += time.monotonic() - started
+        return len(batch)
+
+    def close(self):
+        """
+        Flushes remaining points and closes the underlying client.
+
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.flush()
+        self.client.close()
+
+    def summary(self):
+        """
+        Returns counters plus derived throughput figures.
+
+        :return: Copy of stats with 'pending', 'points_per_flush_second' and 'points_per_second'
+        :rtype: dict
+
+        """
+        with self._lock:
+            summary = dict(self.stats)
+            summary["pending"] = len(self._buffer)
+        elapsed = time.monotonic() - self._created_at
+        flush_seconds = summary["flush_seconds"]
+        summary["points_per_flush_second"] = summary["points_written"] / flush_seconds if flush_seconds else 0.0
+        summary["points_per_second"] = summary["points_written"] / elapsed if elapsed else 0.0
+        return summary
 
+    def _interval_elapsed(self):
+        return time.monotonic() - self._last_flush >= self.flush_interval
@@ -0,0 +1,308 @@
+import asyncio
+import time
+
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils.wait_engine import AsyncEventWaiter
+from utils.dom_extract import EXTRACT_JS, VERIFY_JS
+from utils.tracing import instrument_class
+from utils.browser_profiles import DEFAULT_SITE_URL
+from .base_page import BasePage
+from .locators import LOCATORS, Locator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncBasePage:
+    """
+    asyncio counterpart of BasePage for utils.async_webdriver sessions: the same helpers
+    and return values, awaited (`await page.wait_for_element(...)`). While one page waits,
+    the event loop drives the pages of other sessions, so many flows share one thread.
+    Waits run in-page (see utils.wait_engine.AsyncEventWaiter) and Locators resolve through
+    the shared registry. Public methods are traced as spans (see utils.tracing).
+    :param driver: AsyncWebDriver instance
+    :param int timeout: Maximum wait time for element actions
+
+    """
+
+    site_url = DEFAULT_SITE_URL
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    def __init__(self, driver, timeout=15):
+        self.driver = driver
+        self.timeout = timeout
+        self.waiter = AsyncEventWaiter(driver)
+
+    async def _wait(self, condition, by, locator=None, expected=None, timeout=None):
+        """
+        Runs an in-page wait for a (by, locator) pair or a registered Locator.
+        :raises TimeoutException: If the condition does not hold in time
+
+        """
+        timeout = timeout or self.timeout
+        if isinstance(by, Locator):
+            return await LOCATORS.resolve_async(self.waiter, condition, by, expected=expected, timeout=timeout)
+        return await self.waiter.until(condition, by, locator, expected=expected, timeout=timeout)
+
+    _label = staticmethod(BasePage._label)
+    _extract_payload = staticmethod(BasePage._extract_payload)
+    _ready_state = BasePage._ready_state
+
+    async def wait_for_element(self, by, locator=None, timeout=None):
+        """
+        Waits until the presence of an element is located.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param int timeout: Optional timeout override
+        :return: AsyncWebElement or False
+
+        """
+        try:
+            return await self._wait("present", by, locator, timeout=timeout)
+        except TimeoutException:
+            logger.error("❌ Element not found: %s", self._label(by, locator))
+            return False
+
+    async def wait_for_element_to_be_clickable(self, by, locator=None, timeout=None):
+        """
+        Waits until the element is clickable.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param int timeout: Optional timeout override
+        :return: AsyncWebElement or False
+
+        """
+        try:
+            return await self._wait("clickable", by, locator, timeout=timeout)
+        except TimeoutException:
+            logger.error("❌ Element not clickable: %s", self._label(by, locator))
+            return False
+
+    async def wait_for_more_elements(self, by, locator=None, count=0, timeout=None):
+        """
+        Waits until more than `count` elements match.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param int count: Number of elements already seen
+        :param int timeout: Optional timeout override
+        :return: New number of matching elements, or 0 if none were added in time
+        :rtype: int
+
+        """
+        try:
+            return await self._wait("more", by, locator, expected=count, timeout=timeout)
+        except TimeoutException:
+            logger.debug("🔍 No more elements than %d: %s", count, self._label(by, locator))
+            return 0
+
+    async def click_element(self, by, locator=None):
+        """
+        Waits for the element to be clickable and clicks it. Falls back to JS click.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+
+        """
+        element = await self.wait_for_element_to_be_clickable(by, locator)
+        if element:
+            await self.click(element, self._label(by, locator))
+        else:
+            logger.warning("⚠️ Could not click element: %s", self._label(by, locator))
+
+    async def click(self, element, description="element"):
+        """
+        Clicks an already located element. Falls back to JS click.
+        :param element: AsyncWebElement to click
+        :param description: Name used in log output
+
+        """
+        try:
+            await element.click()
+            logger.info("✅ Click successful: %s", description)
+        except Exception:
+            logger.warning("⚠️ WebDriver click failed, using JavaScript click: %s", description)
+            await self.execute_js_click(element)
+
+    async def scroll_to_element(self, by, locator=None):
+        """
+        Scrolls to the specified element on the page.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+
+        """
+        element = await self.wait_for_element(by, locator)
+        if element:
+            await self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
+                                             element)
+            logger.debug("🔽 Scrolled to element: %s", self._label(by, locator))
+        else:
+            logger.warning("⚠️ Element not found for scrolling: %s", self._label(by, locator))
+
+    async def scroll_into_view(self, element):
+        """
+        Instantly scrolls an already located element to the center of the viewport.
+        :param element: AsyncWebElement to scroll to
+
+        """
+        await self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+
+    async def get_element_text(self, by, locator=None):
+        """
+        Retrieves the text of the specified element.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :return: Cleaned string or empty string if not found
+
+        """
+        element = await self.wait_for_element(by, locator)
+        if element:
+            return (await element.text()).strip()
+        return ""
+
+    async def find_element(self, by, locator=None):
+        """
+        Finds a single element without waiting.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :return: AsyncWebElement or False
+
+        """
+        try:
+            if isinstance(by, Locator):
+                element = await LOCATORS.find_async(self.driver, by)
+                if element is None:
+                    raise NoSuchElementException(str(by))
+                return element
+            return await self.driver.find_element(by, locator)
+        except NoSuchElementException:
+            logger.error("❌ Element not found via find_element: %s", self._label(by, locator))
+            return False
+
+    async def find_elements(self, by, locator=None):
+        """
+        Finds multiple elements without waiting.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :return: List of AsyncWebElements or empty list
+
+        """
+        if isinstance(by, Locator):
+            return await LOCATORS.find_async(self.driver, by, multiple=True)
+        return await self.driver.find_elements(by, locator)
+
+    async def execute_js_click(self, element):
+        """
+        Performs JavaScript-based click on a given element.
+        :param element: AsyncWebElement to click
+
+        """
+        await self.driver.execute_script("arguments[0].click();", element)
+
+    async def extract(self, spec, root=None):
+        """
+        See BasePage.extract.
+
+        """
+        return (await self.extract_many({"records": spec}, root))["records"]
+
+    async def extract_many(self, specs, root=None):
+        """
+        See BasePage.extract_many.
+
+        """
+        payload = {name: self._extract_payload(spec) for name, spec in specs.items()}
+        return await self.driver.execute_script(EXTRACT_JS, payload, root)
+
+    async def verify_records(self, spec, rules, max_mismatches=20, root=None):
+        """
+        See BasePage.verify_records.
+
+        """
+        payload = self._extract_payload(spec)
+        payload["rules"] = [[field, op, expected] for field, op, expected in rules]
+        payload["max_mismatches"] = max_mismatches
+        return await self.driver.execute_script(VERIFY_JS, payload, root)
+
+    async def wait_for_page_to_load(self):
+        """
+        See BasePage.wait_for_page_to_load.
+
+        """
+        try:
+            await self.waiter.until("ready", expected=self._ready_state(), timeout=self.timeout)
+            logger.info("✅ Page fully loaded.")
+        except TimeoutException:
+            logger.warning("⚠️ Page load timeout.")
+
+    async def wait_for_new_window(self, handles_before, timeout=5):
+        """
+        Waits until a window that was not in handles_before is opened.
+        :param handles_before: Window handles captured before the triggering action
+        :param int timeout: Max wait time
+        :return: Handle of the new window, or None if none was opened
+
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            new_handles = [h for h in await self.driver.window_handles() if h not in handles_before]
+            if new_handles:
+                return new_handles[0]
+            if time.monotonic() >= deadline:
+                logger.warning("⚠️ No new window opened.")
+                return None
+            await asyncio.sleep(0.1)
+
+    async def close_other_windows(self):
+        """
+        Closes every window but the first one and switches back to it.
+
+        """
+        handles = await self.driver.window_handles()
+        for handle in handles[1:]:
+            await self.driver.switch_to_window(handle)
+            await self.driver.close()
+        await self.driver.switch_to_window(handles[0])
+
+    async def wait_for_url_to_contain(self, fragment, timeout=None):
+        """
+        Waits until the current URL contains the given fragment.
+        :param fragment: Expected URL substring
+        :param int timeout: Optional timeout override
+        :return: True if matched, else False
+
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            current_url = await self.driver.current_url()
+            if fragment in current_url:
+                return True
+            if time.monotonic() >= deadline:
+                logger.error("❌ URL does not contain '%s': %s", fragment, current_url)
+                return False
+            await asyncio.sleep(0.1)
+
+    async def wait_for_element_text_to_be(self, by, locator=None, expected_text=None, timeout=10):
+        """
+        Waits until the specified element contains the expected text.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param expected_text: Text to match
+        :param timeout: Max wait time
+        :return: True if matched, else False
+
+        """
+        try:
+            await self._wait("text", by, locator, expected=expected_text, timeout=timeout)
+            logger.info("✅ Element text is '%s'", expected_text)
+            return True
+        except TimeoutException:
+            # The wait already used up the timeout: read whatever is there without waiting again
+            element = await self.find_element(by, locator)
+            actual_text = (await element.text()).strip() if element else ""
+            logger.error("❌ Expected text '%s', but found '%s'", expected_text, actual_text)
+            return False
+
+
+instrument_class(AsyncBasePage)
@@ -0,0 +1,99 @@
+from .async_base_page import AsyncBasePage
+from .careers_page import CareersPage
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncCareersPage(AsyncBasePage):
+    LOCATIONS = CareersPage.LOCATIONS
+    TEAMS = CareersPage.TEAMS
+    LIFE_AT_INSIDER = CareersPage.LIFE_AT_INSIDER
+    SEE_ALL_TEAMS = CareersPage.SEE_ALL_TEAMS
+    QA_CAREERS = CareersPage.QA_CAREERS
+    QA_OPEN_POSITIONS = CareersPage.QA_OPEN_POSITIONS
+    SEE_ALL_QA_JOBS = CareersPage.SEE_ALL_QA_JOBS
+
+    async def is_accessible(self):
+        """
+        Checks if the current page is accessible by verifying the title and URL.
+
+        :return: True if the page appears to be the Careers or QA page, False otherwise.
+        :rtype: bool
+
+        """
+        try:
+            await self.wait_for_page_to_load()
+            title = (await self.driver.title()).lower()
+            url = (await self.driver.current_url()).lower()
+            logger.info("📄 QA Page Title: %s", title)
+            logger.info("🌐 QA Page URL: %s", url)
+            return "careers" in title or "quality assurance" in title or "/careers" in url
+        except Exception as e:
+            logger.error("❌ Accessibility check failed: %s", e)
+            return False
+
+    async def verify_sections(self):
+        """
+        Verifies that the Locations, Teams and Life at Insider sections exist, in one bulk
+        extraction after the first section appears (see CareersPage.verify_sections).
+
+        :return: True if all sections are found, False otherwise.
+        :rtype: bool
+
+        """
+        try:
+            sections = {
+                "Locations": self.LOCATIONS,
+                "Teams": self.TEAMS,
+                "Life at Insider": self.LIFE_AT_INSIDER,
+            }
+            await self.wait_for_element(self.LOCATIONS)
+            found = await self.extract_many({
+                name: {"selector": locator, "fields": {"visible": "visible"}, "limit": 1}
+                for name, locator in sections.items()
+            })
+
+            all_found = True
+            for name, locator in sections.items():
+                if found.get(name) or await self.wait_for_element(locator):
+                    logger.info("✅ %s section found!", name)
+                else:
+                    logger.error("❌ %s section not found", name)
+                    all_found = False
+            return all_found
+        except Exception as e:
+            logger.error("❌ Section not found: %s", e)
+            return False
+
+    async def go_to_qa_careers(self):
+        """
+        Navigates to the Quality Assurance careers section: "See All Teams", then
+        "Open Positions" under QA (JS click on the section as fallback), then waits for
+        the "See all QA jobs" button.
+
+        """
+        try:
+            await self.scroll_to_element(self.SEE_ALL_TEAMS)
+            if not await self.wait_for_element_to_be_clickable(self.SEE_ALL_TEAMS):
+                logger.error("❌ Could not click 'See All Teams'")
+                return
+            await self.click_element(self.SEE_ALL_TEAMS)
+            logger.info("✅ Clicked 'See All Teams'")
+
+            await self.wait_for_page_to_load()
+            await self.scroll_to_element(self.QA_CAREERS)
+            qa_careers_section = await self.wait_for_element(self.QA_CAREERS)
+
+            qa_open_link = await self.wait_for_element_to_be_clickable(self.QA_OPEN_POSITIONS)
+            if qa_open_link:
+                await self.scroll_into_view(qa_open_link)
+                await self.click(qa_open_link, "Open Positions")
+                logger.info("✅ Navigated to QA Careers via link.")
+            else:
+                logger.warning("⚠️ Link not found, using fallback JS click...")
+                await self.execute_js_click(qa_careers_section)
+
+            await self.wait_for_element(self.SEE_ALL_QA_JOBS, timeout=10)
+        except Exception as e:
+            logger.error("❌ Navigation to QA Careers page failed: %s", e)
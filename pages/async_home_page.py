@@ -0,0 +1,51 @@
+from .async_base_page import AsyncBasePage
+from .home_page import HomePage
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncHomePage(AsyncBasePage):
+    COMPANY_MENU = HomePage.COMPANY_MENU
+    CAREERS_LINK = HomePage.CAREERS_LINK
+    COOKIE_BUTTON = HomePage.COOKIE_BUTTON
+    CONSENT_COOKIE = HomePage.CONSENT_COOKIE
+
+    async def open(self):
+        """
+        Opens the Insider homepage.
+
+        """
+        await self.driver.get(self.site_url)
+
+    async def is_accessible(self):
+        """
+        Checks whether the homepage is accessible by verifying the title.
+        :return: True if title contains 'Insider', else False
+        :rtype: bool
+
+        """
+        return "Insider" in await self.driver.title()
+
+    async def accept_cookies(self):
+        """
+        Accepts cookies unless the consent cookie is already set.
+
+        """
+        if await self.driver.get_cookie(self.CONSENT_COOKIE):
+            logger.info("✅ Cookie consent already given, skipping banner.")
+            return
+        cookie_button = await self.wait_for_element_to_be_clickable(self.COOKIE_BUTTON)
+        if cookie_button:
+            await self.click(cookie_button, "Accept cookies")
+            logger.info("✅ Cookies accepted.")
+        else:
+            logger.warning("⚠️ Cookie button not found or already accepted.")
+
+    async def navigate_to_careers(self):
+        """
+        Navigates to the Careers page through the Company menu.
+
+        """
+        await self.click_element(self.COMPANY_MENU)
+        await self.click_element(self.CAREERS_LINK)
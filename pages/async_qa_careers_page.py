@@ -0,0 +1,173 @@
+import asyncio
+
+from .async_base_page import AsyncBasePage
+from .qa_careers_page import QACareersPage
+from utils.link_check import check_links
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncQACareersPage(AsyncBasePage):
+    """
+    asyncio counterpart of QACareersPage. The sync page's retries (utils.retry) are not applied.
+
+    """
+
+    DEPARTMENT_CONTAINER = QACareersPage.DEPARTMENT_CONTAINER
+    LOCATION_CONTAINER = QACareersPage.LOCATION_CONTAINER
+    LOCATION_ISTANBUL = QACareersPage.LOCATION_ISTANBUL
+    VIEW_ROLE_BUTTON = QACareersPage.VIEW_ROLE_BUTTON
+    SEE_ALL_QA_JOBS = QACareersPage.SEE_ALL_QA_JOBS
+    JOB_CARD = QACareersPage.JOB_CARD
+    JOB_LIST = QACareersPage.JOB_LIST
+    JOB_FIELDS = QACareersPage.JOB_FIELDS
+    QA_ISTANBUL_RULES = QACareersPage.QA_ISTANBUL_RULES
+
+    async def is_accessible(self):
+        """
+        Checks if the QA careers page is accessible: page loaded, 'View Role' button present
+        and URL containing 'quality-assurance' or 'qa'.
+
+        :return: True if accessible, False otherwise
+        :rtype: bool
+
+        """
+        try:
+            await self.wait_for_page_to_load()
+            await self.wait_for_element(self.VIEW_ROLE_BUTTON)
+            current_url = await self.driver.current_url()
+            logger.info("🌐 QA Page URL: %s", current_url)
+            return "quality-assurance" in current_url or "qa" in current_url
+        except Exception as e:
+            logger.error("❌ Accessibility check failed: %s", e)
+            return False
+
+    async def click_see_all_qa_jobs(self):
+        """
+        Clicks the 'See all QA jobs' button after ensuring it is clickable.
+
+        """
+        button = await self.wait_for_element_to_be_clickable(self.SEE_ALL_QA_JOBS)
+        if button:
+            await self.scroll_into_view(button)
+            await self.click(button, "See all QA jobs")
+            logger.info("✅ Clicked 'See all QA jobs' button.")
+        else:
+            logger.error("❌ 'See all QA jobs' button not found.")
+
+    async def select_location_if_department_is_qa(self):
+        """
+        Waits for 'Quality Assurance' to appear as selected department, then selects
+        'Istanbul, Turkiye' and waits for the job cards to update.
+
+        :return: True if Istanbul was selected, False otherwise
+        :rtype: bool
+
+        """
+        department = await self.wait_for_element(self.DEPARTMENT_CONTAINER)
+        if department:
+            await self.scroll_into_view(department)
+
+        if not await self.wait_for_element_text_to_be(self.DEPARTMENT_CONTAINER, expected_text="Quality Assurance",
+                                                      timeout=self.timeout):
+            logger.error("❌ Failed to set department to 'Quality Assurance'.")
+            return False
+
+        await self.wait_for_job_cards_to_be_replaced()
+        await self.click_element(self.LOCATION_CONTAINER)
+        await self.click_element(self.LOCATION_ISTANBUL)
+        logger.info("✅ 'Istanbul, Turkiye' selected.")
+        return bool(await self.wait_for_element(self.JOB_CARD))
+
+    async def wait_for_job_cards_to_load(self, timeout=15):
+        """
+        Waits until job cards are present in the DOM.
+
+        :param timeout: Max wait time in seconds (default: 15)
+
+        """
+        await self._wait("present", self.JOB_LIST, timeout=timeout)
+        logger.info("✅ Job cards loaded.")
+
+    async def wait_for_job_cards_to_be_replaced(self):
+        """
+        Waits for old job cards to disappear and new ones to be loaded into the DOM.
+
+        """
+        try:
+            await self._wait("invisible", self.JOB_CARD)
+        except Exception:
+            logger.warning("⚠️ Old job cards may still be visible. Continuing anyway...")
+
+        await self._wait("present", self.JOB_CARD)
+        logger.info("✅ New job cards loaded in the DOM.")
+
+    async def check_job_listings(self, rules=None, max_mismatches=20):
+        """
+        See QACareersPage.check_job_listings.
+
+        """
+        return await self.verify_records({"selector": self.JOB_CARD, "fields": self.JOB_FIELDS},
+                                         self.QA_ISTANBUL_RULES if rules is None else rules, max_mismatches)
+
+    async def verify_job_listings(self, rules=None, strict=False):
+        """
+        Validates the job cards in-page (see QACareersPage.verify_job_listings).
+
+        :param rules: Optional rules replacing QA_ISTANBUL_RULES
+        :param bool strict: Fail on any mismatching card instead of requiring one valid job
+        :return: True if at least one valid job found (every job if strict), False otherwise
+        :rtype: bool
+
+        """
+        report = await self.check_job_listings(rules)
+        for card in report["mismatches"]:
+            logger.warning("⚠️ Job %d INVALID (%s): %s | %s | %s", card["index"] + 1, ", ".join(card["failed_rules"]),
+                           card["position"], card["department"], card["location"])
+
+        valid_jobs = report["total"] - report["mismatched"]
+        logger.info("🎯 Total valid jobs: %d/%d", valid_jobs, report["total"])
+        if strict:
+            return report["total"] > 0 and report["mismatched"] == 0
+        return valid_jobs > 0
+
+    async def get_view_role_links(self):
+        """
+        Collects every 'View Role' link on the listing in one round-trip.
+
+        :return: Dicts with the absolute 'href', 'text' and 'visible' per link
+        :rtype: list
+
+        """
+        return await self.extract({
+            "selector": self.VIEW_ROLE_BUTTON,
+            "fields": {"href": "prop:href", "text": "text", "visible": "visible"},
+        })
+
+    async def verify_view_role_links(self, expected="lever.co", concurrency=16, timeout=10):
+        """
+        Resolves every 'View Role' link over HTTP (see QACareersPage.verify_view_role_links).
+        The blocking link check runs on a worker thread so other flows keep running.
+
+        :param str expected: Text the final URL of every link must contain
+        :param int concurrency: Max requests in flight
+        :param float timeout: Socket timeout per request in seconds
+        :return: True if there are links and all of them resolve to the expected host
+        :rtype: bool
+
+        """
+        hrefs = [link["href"] for link in await self.get_view_role_links() if link["href"]]
+        if not hrefs:
+            logger.error("❌ No 'View Role' links found.")
+            return False
+
+        user_agent = await self.driver.execute_script("return navigator.userAgent;")
+        results = await asyncio.to_thread(check_links, hrefs, concurrency=concurrency, timeout=timeout,
+                                          headers={"User-Agent": user_agent})
+        failed = [result for result in results if not result.ok or expected not in result.final_url]
+        for result in failed:
+            logger.warning("⚠️ View Role link broken: %s -> %s (%s)", result.url, result.final_url,
+                           result.error or result.status)
+        logger.info("🔗 %d/%d View Role links resolve to %s", len(results) - len(failed), len(results), expected)
+        return not failed
@@ -2,24 +2,62 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils.wait_engine import EventWaiter
+from utils.dom_extract import EXTRACT_JS, SCROLL_PAST_JS, VERIFY_JS
+from utils.tracing import instrument_class
+from utils.checkpoints import capture_checkpoint, resume
+from utils.browser_profiles import DEFAULT_SITE_URL
+from .locators import LOCATORS, Locator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class BasePage:
     """
     Initialize BasePage with driver and default timeout.
+    Wait helpers are event-driven (see utils.wait_engine.EventWaiter) instead of polling.
+    Element helpers take either a (by, locator) pair or a registered Locator (pages/locators.py)
+    as `by` with `locator` omitted.
+    Public methods of BasePage and every page object are traced as spans (see utils.tracing).
+    Pages are opened on `site_url` ($SITE_URL, --site-url or the stand-in site of --stand-in-site).
     :param driver: Selenium WebDriver instance
     :param int timeout: Maximum wait time for element actions
 
     """
 
+    site_url = DEFAULT_SITE_URL
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
     def __init__(self, driver, timeout=15):
         self.driver = driver
+        self.timeout = timeout
         self.wait = WebDriverWait(driver, timeout)
+        # Drivers sharing a session with other flows (utils.multi_context) wait in slices
+        self.waiter = EventWaiter(driver, wait_slice=getattr(driver, "wait_slice", None))
 
-    def wait_for_element(self, by, locator, timeout=None):
+    def _wait(self, condition, by, locator=None, expected=None, timeout=None):
+        """
+        Runs an event-driven wait for a (by, locator) pair or a registered Locator.
+        :raises TimeoutException: If the condition does not hold in time
+
+        """
+        timeout = timeout or self.timeout
+        if isinstance(by, Locator):
+            return LOCATORS.resolve(self.waiter, condition, by, expected=expected, timeout=timeout)
+        return self.waiter.until(condition, by, locator, expected=expected, timeout=timeout)
+
+    @staticmethod
+    def _label(by, locator):
+        return locator if locator is not None else str(by)
+
+    def wait_for_element(self, by, locator=None, timeout=None):
         """
          Waits until the presence of an element is located.
-         :param by: Selenium By strategy (e.g., By.ID, By.XPATH)
+         :param by: Selenium By strategy (e.g., By.ID, By.XPATH) or a Locator
          :param locator: The locator string to find the element
          :param int timeout: Optional timeout override
          :return: WebElement or None
@@ -27,16 +65,15 @@ class BasePage:
 
          """
         try:
-            wait = WebDriverWait(self.driver, timeout) if timeout else self.wait
-            return wait.until(EC.presence_of_element_located((by, locator)))
+            return self._wait("present", by, locator, timeout=timeout)
         except TimeoutException:
-            print(f"❌ ERROR: Element not found: {locator}")
+            logger.error("❌ Element not found: %s", self._label(by, locator))
             return False
 
-    def wait_for_element_to_be_clickable(self, by, locator, timeout=None):
+    def wait_for_element_to_be_clickable(self, by, locator=None, timeout=None):
         """
         Waits until the element is clickable.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
         :param int timeout: Optional timeout override
         :return: WebElement or None
@@ -44,48 +81,115 @@ class BasePage:
 
         """
         try:
-            wait = WebDriverWait(self.driver, timeout) if timeout else self.wait
-            return wait.until(EC.element_to_be_clickable((by, locator)))
+            return self._wait("clickable", by, locator, timeout=timeout)
         except TimeoutException:
-            print(f"❌ ERROR: Element not clickable: {locator}")
+            logger.error("❌ Element not clickable: %s", self._label(by, locator))
             return False
 
-    def click_element(self, by, locator):
+    def wait_for_more_elements(self, by, locator=None, count=0, timeout=None):
+        """
+        Waits until more than `count` elements match, e.g. after scrolling a lazy-loaded list.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param int count: Number of elements already seen
+        :param int timeout: Optional timeout override
+        :return: New number of matching elements, or 0 if none were added in time
+        :rtype: int
+
+        """
+        try:
+            return self._wait("more", by, locator, expected=count, timeout=timeout)
+        except TimeoutException:
+            logger.debug("🔍 No more elements than %d: %s", count, self._label(by, locator))
+            return 0
+
+    def wait_for_unseen_elements(self, by, locator=None, fields=(), seen=(), timeout=None):
+        """
+        Waits until an element matches whose key fields have none of the `seen` values. Unlike
+        wait_for_more_elements it also detects virtualized lists, which recycle a fixed
+        number of nodes instead of appending new ones.
+        :param by: Selenium By strategy or a Locator
+        :param locator: The locator string
+        :param fields: Key fields in extraction syntax, e.g. "attr:data-job-id" (see extract)
+        :param seen: Key values already read
+        :param int timeout: Optional timeout override
+        :return: Number of unseen matching elements, or 0 if none appeared in time
+        :rtype: int
+
+        """
+        expected = {"fields": list(fields), "values": [str(value) for value in seen]}
+        try:
+            return self._wait("unseen", by, locator, expected=expected, timeout=timeout)
+        except TimeoutException:
+            logger.debug("🔍 No unseen elements: %s", self._label(by, locator))
+            return 0
+
+    def click_element(self, by, locator=None):
         """
         Waits for the element to be clickable and clicks it. Falls back to JS click.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
 
         """
         element = self.wait_for_element_to_be_clickable(by, locator)
         if element:
-            try:
-                element.click()
-                print(f"✅ Click successful: {locator}")
-            except Exception:
-                print(f"⚠️ Selenium click failed, using JavaScript click: {locator}")
-                self.driver.execute_script("arguments[0].click();", element)
+            self.click(element, self._label(by, locator))
         else:
-            print(f"⚠️ WARNING: Could not click element: {locator}")
+            logger.warning("⚠️ Could not click element: %s", self._label(by, locator))
+
+    def click(self, element, description="element"):
+        """
+        Clicks an already located element. Falls back to JS click.
+        Use it to act on a handle returned by a wait instead of looking it up again.
+        :param element: WebElement to click
+        :param description: Name used in log output
+
+        """
+        try:
+            element.click()
+            logger.info("✅ Click successful: %s", description)
+        except Exception:
+            logger.warning("⚠️ Selenium click failed, using JavaScript click: %s", description)
+            self.execute_js_click(element)
 
-    def scroll_to_element(self, by, locator):
+    def scroll_to_element(self, by, locator=None):
         """
         Scrolls to the specified element on the page.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
 
         """
         element = self.wait_for_element(by, locator)
         if element:
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            print(f"🔽 Scrolled to element: {locator}")
+            logger.debug("🔽 Scrolled to element: %s", self._label(by, locator))
         else:
-            print(f"⚠️ WARNING: Element not found for scrolling: {locator}")
+            logger.warning("⚠️ Element not found for scrolling: %s", self._label(by, locator))
+
+    def scroll_into_view(self, element):
+        """
+        Instantly scrolls an already located element to the center of the viewport.
+        Unlike scroll_to_element, it neither re-queries the element nor animates.
+        :param element: WebElement to scroll to
+
+        """
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
 
-    def get_element_text(self, by, locator):
+    def scroll_past(self, selector):
+        """
+        Scrolls the last element matching `selector` to the top of the viewport, so a lazy-loaded
+        or virtualized list renders its next part.
+        :param selector: CSS selector string, (by, locator) tuple or Locator
+        :return: True if the page (or the list's scroll container) moved
+        :rtype: bool
+
+        """
+        return bool(self.driver.execute_script(SCROLL_PAST_JS, self._extract_payload({"selector": selector})))
+
+    def get_element_text(self, by, locator=None):
         """
         Retrieves the text of the specified element.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
         :return: Cleaned string or empty string if not found
 
@@ -95,32 +199,39 @@ class BasePage:
             return element.text.strip()
         return ""
 
-    def find_element(self, by, locator):
+    def find_element(self, by, locator=None):
         """
         Finds a single element without waiting.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
         :return: WebElement or False
 
         """
         try:
+            if isinstance(by, Locator):
+                element = LOCATORS.find(self.driver, by)
+                if element is None:
+                    raise NoSuchElementException(str(by))
+                return element
             return self.driver.find_element(by, locator)
         except NoSuchElementException:
-            print(f"❌ ERROR: Element not found via find_element: {locator}")
+            logger.error("❌ Element not found via find_element: %s", self._label(by, locator))
             return False
 
-    def find_elements(self, by, locator):
+    def find_elements(self, by, locator=None):
         """
         Finds multiple elements without waiting.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
         :return: List of WebElements or empty list
 
         """
         try:
+            if isinstance(by, Locator):
+                return LOCATORS.find(self.driver, by, multiple=True)
             return self.driver.find_elements(by, locator)
         except NoSuchElementException:
-            print(f"❌ ERROR: Elements not found via find_elements: {locator}")
+            logger.error("❌ Elements not found via find_elements: %s", self._label(by, locator))
             return []
 
     def execute_js_click(self, element):
@@ -131,10 +242,10 @@ class BasePage:
         """
         self.driver.execute_script("arguments[0].click();", element)
 
-    def click_with_fallback(self, by, locator):
+    def click_with_fallback(self, by, locator=None):
         """
         Clicks an element using standard click. If it fails, uses JavaScript as fallback.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
 
         """
@@ -143,24 +254,188 @@ class BasePage:
             try:
                 element.click()
             except Exception:
-                print(f"⚠️ Regular click failed for {locator}, using JS fallback")
+                logger.warning("⚠️ Regular click failed for %s, using JS fallback", self._label(by, locator))
                 self.execute_js_click(element)
 
+    def extract(self, spec, root=None):
+        """
+        Extracts structured records for every element matching a declarative spec,
+        in a single WebDriver round-trip.
+
+        Spec keys:
+        - selector: CSS selector string, (by, locator) tuple or Locator
+        - fields: {name: field} where field is "text", "html", "visible", "rect", "element",
+          "attr:<name>", "prop:<name>" or {"selector": css, "value": field} for a descendant
+          (default: {"text": "text"})
+        - offset: Optional number of leading matches to skip (for reading in chunks)
+        - limit: Optional max number of elements
+        - exclude: Optional {"fields": [name, ...], "values": [...]}; matches with a value in
+          `values` for any of these fields are skipped before offset and limit apply
+
+        :param dict spec: Extraction spec
+        :param root: Optional WebElement to search within
+        :return: One dict per matched element
+        :rtype: list
+
+        """
+        return self.extract_many({"records": spec}, root)["records"]
+
+    def extract_many(self, specs, root=None):
+        """
+        Runs several extraction specs (see extract) in a single WebDriver round-trip.
+
+        :param dict specs: {name: spec}
+        :param root: Optional WebElement to search within
+        :return: {name: list of records}
+        :rtype: dict
+
+        """
+        payload = {name: self._extract_payload(spec) for name, spec in specs.items()}
+        return self.driver.execute_script(EXTRACT_JS, payload, root)
+
+    def verify_records(self, spec, rules, max_mismatches=20, root=None):
+        """
+        Checks field-level rules against every element matching an extraction spec
+        (see extract) inside the page. Only counts and the failing records are returned,
+        so the cost per round-trip does not grow with the number of passing elements.
+
+        Rules are (field, op, expected) tuples over the spec's fields, with op one of
+        "contains", "equals" (both case-insensitive), "matches" (case-insensitive regex)
+        or "not_empty".
+
+        :param dict spec: Extraction spec
+        :param rules: Iterable of (field, op, expected) rules
+        :param int max_mismatches: Max number of failing records returned
+        :param root: Optional WebElement to search within
+        :return: {"total", "mismatched", "failures": {rule: count}, "mismatches": [record, ...]};
+            each mismatch also carries "index" and "failed_rules"
+        :rtype: dict
+
+        """
+        payload = self._extract_payload(spec)
+        payload["rules"] = [[field, op, expected] for field, op, expected in rules]
+        payload["max_mismatches"] = max_mismatches
+        return self.driver.execute_script(VERIFY_JS, payload, root)
+
+    @staticmethod
+    def _extract_payload(spec):
+        selector = spec["selector"]
+        if isinstance(selector, Locator):
+            strategies = [list(selector.strategies[i]) for i in LOCATORS.ordered(selector)]
+        elif isinstance(selector, tuple):
+            strategies = [list(selector)]
+        else:
+            strategies = [[By.CSS_SELECTOR, selector]]
+        return {
+            "strategies": strategies,
+            "fields": spec.get("fields") or {"text": "text"},
+            "offset": spec.get("offset") or 0,
+            "limit": spec.get("limit"),
+            "exclude": spec.get("exclude"),
+        }
+
     def wait_for_page_to_load(self):
         """
-        Waits until the page is fully loaded (document.readyState = complete).
+        Waits until the page is fully loaded (document.readyState = complete). Sessions that
+        load pages eagerly (see utils.browser_profiles) only wait for readyState = interactive,
+        as the driver itself does, instead of waiting for the load event after all.
 
         """
         try:
-            self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-            print("✅ Page fully loaded.")
+            self.waiter.until("ready", expected=self._ready_state(), timeout=self.timeout)
+            logger.info("✅ Page fully loaded.")
         except TimeoutException:
-            print("⚠️ Page load timeout.")
+            logger.warning("⚠️ Page load timeout.")
+
+    def _ready_state(self):
+        """
+        :return: readyState wait_for_page_to_load waits for, given the session's page load strategy
+        :rtype: str
+
+        """
+        capabilities = getattr(self.driver, "capabilities", None) or {}
+        return "interactive" if capabilities.get("pageLoadStrategy") == "eager" else "complete"
+
+    def wait_for_new_window(self, handles_before, timeout=5):
+        """
+        Waits until a window that was not in handles_before is opened.
+        :param handles_before: Window handles captured before the triggering action
+        :param int timeout: Max wait time
+        :return: Handle of the new window, or None if none was opened
+
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(EC.new_window_is_opened(handles_before))
+        except TimeoutException:
+            logger.warning("⚠️ No new window opened.")
+            return None
+        new_handles = [h for h in self.driver.window_handles if h not in handles_before]
+        return new_handles[0] if new_handles else None
+
+    def save_checkpoint(self, store, name, **state):
+        """
+        Saves the current page as a resumable checkpoint (see utils.checkpoints).
+        :param store: Session CheckpointStore (or one of its scopes), or None when checkpoints are off
+        :param str name: Checkpoint name
+        :param state: Page-object state re-applied by apply_checkpoint_state
+
+        """
+        if store is not None:
+            store.save(capture_checkpoint(self.driver, name, state))
 
-    def wait_for_element_text_to_be(self, by, locator, expected_text, timeout=10):
+    def resume_from_checkpoint(self, store, name):
+        """
+        Jumps straight to a checkpoint saved earlier in the session.
+        :param store: Session CheckpointStore (or one of its scopes), or None when checkpoints are off
+        :param str name: Checkpoint name
+        :return: True if resumed, False if the navigation path must be walked
+        :rtype: bool
+
+        """
+        return resume(self, store, name)
+
+    def apply_checkpoint_state(self, state):
+        """
+        Re-applies page state that the URL, cookies and localStorage do not restore and
+        verifies the page. Page objects with such state (e.g. filters) override it.
+        :param dict state: State given to save_checkpoint
+        :return: True if the page is usable
+        :rtype: bool
+
+        """
+        self.wait_for_page_to_load()
+        return True
+
+    def close_other_windows(self):
+        """
+        Closes every window but the first one and switches back to it.
+
+        """
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+    def wait_for_url_to_contain(self, fragment, timeout=None):
+        """
+        Waits until the current URL contains the given fragment.
+        :param fragment: Expected URL substring
+        :param int timeout: Optional timeout override
+        :return: True if matched, else False
+
+        """
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.1).until(EC.url_contains(fragment))
+            return True
+        except TimeoutException:
+            logger.error("❌ URL does not contain '%s': %s", fragment, self.driver.current_url)
+            return False
+
+    def wait_for_element_text_to_be(self, by, locator=None, expected_text=None, timeout=10):
         """
         Waits until the specified element contains the expected text.
-        :param by: Selenium By strategy
+        :param by: Selenium By strategy or a Locator
         :param locator: The locator string
         :param expected_text: Text to match
         :param timeout: Max wait time
@@ -168,12 +443,15 @@ class BasePage:
 
         """
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.text_to_be_present_in_element((by, locator), expected_text)
-            )
-            print(f"✅ Element text is '{expected_text}'")
+            self._wait("text", by, locator, expected=expected_text, timeout=timeout)
+            logger.info("✅ Element text is '%s'", expected_text)
             return True
         except TimeoutException:
-            actual_text = self.get_element_text(by, locator)
-            print(f"❌ ERROR: Expected text '{expected_text}', but found '{actual_text}'")
+            # The wait already used up the timeout: read whatever is there without waiting again
+            element = self.find_element(by, locator)
+            actual_text = element.text.strip() if element else ""
+            logger.error("❌ Expected text '%s', but found '%s'", expected_text, actual_text)
             return False
+
+
+instrument_class(BasePage)
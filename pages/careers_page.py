@@ -1,14 +1,20 @@
-from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from . import locators
+from utils.page_metrics import measure_navigation
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class CareersPage(BasePage):
-    LOCATIONS_XPATH = "//*[@id='career-our-location']/div/div/div/div[1]"
-    TEAMS_PATH = "//*[@id='career-find-our-calling']/div/div/a"
-    LIFE_AT_INSIDER_XPATH = "//h2[contains(text(), 'Life at Insider')]"
-    SEE_ALL_TEAMS_XPATH = "//a[contains(text(), 'See all teams')]"
-    QA_CAREERS_XPATH = "//h3[contains(text(), 'Quality Assurance')]"
-    COOKIE_ACCEPT_ID = "//*[@id='wt-cli-accept-all-btn']"
-    QA_OPEN_POSITIONS_XPATH = "//h3[contains(text(), 'Quality Assurance')]/following-sibling::a[contains(text(), 'Open Positions')]"
+    LOCATIONS = locators.CAREERS_LOCATIONS
+    TEAMS = locators.CAREERS_TEAMS
+    LIFE_AT_INSIDER = locators.CAREERS_LIFE_AT_INSIDER
+    SEE_ALL_TEAMS = locators.CAREERS_SEE_ALL_TEAMS
+    QA_CAREERS = locators.CAREERS_QA_SECTION
+    COOKIE_ACCEPT = locators.COOKIE_ACCEPT_BUTTON
+    QA_OPEN_POSITIONS = locators.CAREERS_QA_OPEN_POSITIONS
+    SEE_ALL_QA_JOBS = locators.QA_SEE_ALL_QA_JOBS
 
     def is_accessible(self):
         """
@@ -20,15 +26,15 @@ class CareersPage(BasePage):
 
         """
         try:
-            print("🔍 Checking QA page title...")
+            logger.debug("🔍 Checking QA page title...")
             self.wait_for_page_to_load()
             title = self.driver.title.lower()
             url = self.driver.current_url.lower()
-            print(f"📄 QA Page Title: {title}")
-            print(f"🌐 QA Page URL: {url}")
+            logger.info("📄 QA Page Title: %s", title)
+            logger.info("🌐 QA Page URL: %s", url)
             return "careers" in title or "quality assurance" in title or "/careers" in url
         except Exception as e:
-            print(f"❌ ERROR during accessibility check: {e}")
+            logger.error("❌ Accessibility check failed: %s", e)
             return False
 
     def verify_sections(self):
@@ -38,27 +44,40 @@ class CareersPage(BasePage):
         - Teams
         - Life at Insider
 
+        Waits for the first section, then checks all of them in one bulk extraction.
+        Only sections missing at that point get an individual wait.
+
         :return: True if all sections are found, False otherwise.
         :rtype: bool
 
         """
         try:
-            print("🔄 Waiting for Locations section...")
-            self.wait_for_element(By.XPATH, self.LOCATIONS_XPATH)
-            print("✅ Locations section found!")
-
-            print("🔄 Waiting for Teams section...")
-            self.wait_for_element(By.XPATH, self.TEAMS_PATH)
-            print("✅ Teams section found!")
-
-            self.wait_for_element(By.XPATH, self.LIFE_AT_INSIDER_XPATH)
-            print("✅ Life at Insider section found!")
-
-            return True
+            sections = {
+                "Locations": self.LOCATIONS,
+                "Teams": self.TEAMS,
+                "Life at Insider": self.LIFE_AT_INSIDER,
+            }
+            logger.debug("🔄 Waiting for Locations section...")
+            self.wait_for_element(self.LOCATIONS)
+
+            found = self.extract_many({
+                name: {"selector": locator, "fields": {"visible": "visible"}, "limit": 1}
+                for name, locator in sections.items()
+            })
+
+            all_found = True
+            for name, locator in sections.items():
+                if found.get(name) or self.wait_for_element(locator):
+                    logger.info("✅ %s section found!", name)
+                else:
+                    logger.error("❌ %s section not found", name)
+                    all_found = False
+            return all_found
         except Exception as e:
-            print(f"❌ ERROR: Section not found: {e}")
+            logger.error("❌ Section not found: %s", e)
             return False
 
+    @measure_navigation("qa_careers")
     def go_to_qa_careers(self):
         """
         Navigates to the Quality Assurance careers section on the Careers page.
@@ -75,40 +94,38 @@ class CareersPage(BasePage):
 
         """
         try:
-            print("🔄 Scrolling to 'See All Teams' button...")
-            self.scroll_to_element(By.XPATH, self.SEE_ALL_TEAMS_XPATH)
+            logger.debug("🔄 Scrolling to 'See All Teams' button...")
+            self.scroll_to_element(self.SEE_ALL_TEAMS)
 
             # 🔁 Scroll sonrası tekrar clickable kontrolü yap
-            see_all_teams_button = self.wait_for_element_to_be_clickable(By.XPATH, self.SEE_ALL_TEAMS_XPATH)
+            see_all_teams_button = self.wait_for_element_to_be_clickable(self.SEE_ALL_TEAMS)
             if see_all_teams_button:
-                self.click_element(By.XPATH, self.SEE_ALL_TEAMS_XPATH)
-                print("✅ Clicked 'See All Teams'")
+                self.click_element(self.SEE_ALL_TEAMS)
+                logger.info("✅ Clicked 'See All Teams'")
             else:
-                print("❌ Could not click 'See All Teams'")
+                logger.error("❌ Could not click 'See All Teams'")
                 return
 
-            print("🔄 Waiting for full page load...")
+            logger.debug("🔄 Waiting for full page load...")
             self.wait_for_page_to_load()
 
-            print("🔄 Waiting for 'QA Careers' section...")
-            self.scroll_to_element(By.XPATH, self.QA_CAREERS_XPATH)
-            qa_careers_section = self.wait_for_element(By.XPATH, self.QA_CAREERS_XPATH)
+            logger.debug("🔄 Waiting for 'QA Careers' section...")
+            self.scroll_to_element(self.QA_CAREERS)
+            qa_careers_section = self.wait_for_element(self.QA_CAREERS)
 
-            qa_open_link = self.wait_for_element_to_be_clickable(By.XPATH, self.QA_OPEN_POSITIONS_XPATH)
+            qa_open_link = self.wait_for_element_to_be_clickable(self.QA_OPEN_POSITIONS)
 
             if qa_open_link:
-                print("🖱 Clicking 'Open Positions' link...")
-                self.scroll_to_element(By.XPATH, self.QA_OPEN_POSITIONS_XPATH)
+                logger.debug("🖱 Clicking 'Open Positions' link...")
+                self.scroll_to_element(self.QA_OPEN_POSITIONS)
                 qa_open_link.click()
-                print("✅ Navigated to QA Careers via link.")
+                logger.info("✅ Navigated to QA Careers via link.")
             else:
-                print("⚠️ Link not found, using fallback JS click...")
+                logger.warning("⚠️ Link not found, using fallback JS click...")
                 self.driver.execute_script("arguments[0].click();", qa_careers_section)
-                print("✅ Fallback click successful.")
+                logger.info("✅ Fallback click successful.")
 
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//a[contains(text(), 'See all QA jobs')]"))
-            )
+            self.wait_for_element(self.SEE_ALL_QA_JOBS, timeout=10)
 
         except Exception as e:
-            print(f"❌ ERROR while navigating to QA Careers page: {e}")
+            logger.error("❌ Navigation to QA Careers page failed: %s", e)
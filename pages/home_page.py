@@ -1,19 +1,26 @@
 from selenium.common import NoSuchElementException
-from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from . import locators
+from utils.page_metrics import measure_navigation
+from utils.browser_profiles import CONSENT_COOKIE_NAME
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class HomePage(BasePage):
-    URL = "https://useinsider.com"
-    COMPANY_MENU_XPATH = "(//*[@id='navbarDropdownMenuLink'])[5]"
-    CAREERS_LINK_XPATH = "//*[@id='navbarNavDropdown']/ul[1]/li[6]/div/div[2]/a[2]"
-    COOKIE_BUTTON_XPATH = "//*[@id='wt-cli-accept-all-btn']"
+    COMPANY_MENU = locators.HOME_COMPANY_MENU
+    CAREERS_LINK = locators.HOME_CAREERS_LINK
+    COOKIE_BUTTON = locators.COOKIE_ACCEPT_BUTTON
+    CONSENT_COOKIE = CONSENT_COOKIE_NAME
 
+    @measure_navigation("home")
     def open(self):
         """
         Opens the Insider homepage.
 
         """
-        self.driver.get(self.URL)
+        self.driver.get(self.site_url)
 
     def is_accessible(self):
         """
@@ -27,22 +34,27 @@ class HomePage(BasePage):
     def accept_cookies(self):
         """
         Accepts cookies using BasePage method.
+        Skipped when the consent cookie is already set (e.g. preset by the "fast" browser profile).
 
         """
+        if self.driver.get_cookie(self.CONSENT_COOKIE):
+            logger.info("✅ Cookie consent already given, skipping banner.")
+            return
         try:
-            cookie_button = self.wait_for_element_to_be_clickable(By.XPATH, self.COOKIE_BUTTON_XPATH)
+            cookie_button = self.wait_for_element_to_be_clickable(self.COOKIE_BUTTON)
             if cookie_button:
                 cookie_button.click()
-                print("✅ Cookies accepted.")
+                logger.info("✅ Cookies accepted.")
             else:
-                print("⚠️ Cookie button not found or already accepted.")
+                logger.warning("⚠️ Cookie button not found or already accepted.")
         except NoSuchElementException:
-            print("⚠️ Cookie button not visible, skipping.")
+            logger.warning("⚠️ Cookie button not visible, skipping.")
 
+    @measure_navigation("careers")
     def navigate_to_careers(self):
         """
         Navigates to the Careers page through the Company menu.
 
         """
-        self.click_element(By.XPATH, self.COMPANY_MENU_XPATH)
-        self.click_element(By.XPATH, self.CAREERS_LINK_XPATH)
+        self.click_element(self.COMPANY_MENU)
+        self.click_element(self.CAREERS_LINK)
@@ -0,0 +1,310 @@
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+
+class Locator:
+    """
+    A named element locator with ordered strategies: the preferred fast one (id/CSS)
+    first, then fallbacks (usually the original XPath).
+
+    :param str name: Unique name, namespaced by page (e.g. "HomePage.company_menu")
+    :param strategies: (By, value) pairs in order of preference
+
+    """
+
+    def __init__(self, name, *strategies):
+        if not strategies:
+            raise ValueError(f"Locator '{name}' needs at least one strategy")
+        self.name = name
+        self.strategies = tuple(strategies)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"Locator({self.name!r}, {', '.join(map(repr, self.strategies))})"
+
+
+class LocatorRegistry:
+    """
+    Central registry of page locators.
+
+    Resolves a Locator through EventWaiter.until_any (all strategies in one round-trip),
+    measures resolution time and in-page query time per strategy, and caches which
+    strategy matched so later lookups try it first and never reach the slow fallbacks.
+
+    """
+
+    def __init__(self):
+        self._locators = {}
+        self._preferred = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, *strategies):
+        """
+        Declares a locator once.
+
+        :param str name: Unique locator name
+        :param strategies: (By, value) pairs in order of preference
+        :return: The registered Locator
+        :rtype: Locator
+        :raises ValueError: If the name is already registered
+
+        """
+        if name in self._locators:
+            raise ValueError(f"Locator '{name}' is already registered")
+        locator = Locator(name, *strategies)
+        self._locators[name] = locator
+        return locator
+
+    def get(self, name):
+        """
+        :param str name: Locator name
+        :return: The registered Locator
+        :rtype: Locator
+
+        """
+        return self._locators[name]
+
+    def ordered(self, locator):
+        """
+        Returns the strategy indexes of a locator, cached winner first.
+
+        :param Locator locator: Registered locator
+        :rtype: list
+
+        """
+        order = list(range(len(locator.strategies)))
+        preferred = self._preferred.get(locator.name)
+        if preferred:  # index 0 is already first
+            order.remove(preferred)
+            order.insert(0, preferred)
+        return order
+
+    def resolve(self, waiter, condition, locator, expected=None, timeout=15):
+        """
+        Waits for `condition` on the first matching strategy of `locator`.
+
+        :param waiter: EventWaiter bound to the driver
+        :param str condition: "present", "clickable", "invisible", "text", "more" or "unseen"
+        :param Locator locator: Registered locator
+        :param expected: See EventWaiter.until
+        :param float timeout: Max wait time in seconds
+        :return: WebElement for "present"/"clickable", True otherwise
+        :raises TimeoutException: If no strategy satisfies the condition in time
+
+        """
+        order = self.ordered(locator)
+        strategies = [locator.strategies[i] for i in order]
+        started = time.perf_counter()
+        try:
+            position, value, costs = waiter.until_any(condition, strategies, expected=expected, timeout=timeout)
+        except TimeoutException:
+            self._record(locator.name, order[0], time.perf_counter() - started, found=False)
+            raise
+
+        index = order[position]
+        self._record(locator.name, index, time.perf_counter() - started, found=True)
+        self._record_costs(locator.name, order, costs)
+        if condition != "invisible":
+            self._preferred[locator.name] = index
+        return value
+
+    async def resolve_async(self, waiter, condition, locator, expected=None, timeout=15):
+        """
+        Awaitable `resolve` for async page objects.
+
+        :param waiter: AsyncEventWaiter bound to the driver
+
+        """
+        order = self.ordered(locator)
+        strategies = [locator.strategies[i] for i in order]
+        started = time.perf_counter()
+        try:
+            position, value, costs = await waiter.until_any(condition, strategies, expected=expected, timeout=timeout)
+        except TimeoutException:
+            self._record(locator.name, order[0], time.perf_counter() - started, found=False)
+            raise
+
+        index = order[position]
+        self._record(locator.name, index, time.perf_counter() - started, found=True)
+        self._record_costs(locator.name, order, costs)
+        if condition != "invisible":
+            self._preferred[locator.name] = index
+        return value
+
+    async def find_async(self, driver, locator, multiple=False):
+        """
+        Awaitable `find` for async page objects.
+
+        :param driver: AsyncWebDriver instance
+
+        """
+        for index in self.ordered(locator):
+            by, value = locator.strategies[index]
+            started = time.perf_counter()
+            elements = await driver.find_elements(by, value)
+            self._record(locator.name, index, time.perf_counter() - started, found=bool(elements))
+            if elements:
+                self._preferred[locator.name] = index
+                return elements if multiple else elements[0]
+        return [] if multiple else None
+
+    def find(self, driver, locator, multiple=False):
+        """
+        Finds element(s) without waiting, trying strategies in cached order.
+
+        :param driver: Selenium WebDriver instance
+        :param Locator locator: Registered locator
+        :param bool multiple: Return every match of the first strategy that matches
+        :return: WebElement / list of WebElements, or None / [] if nothing matches
+
+        """
+        for index in self.ordered(locator):
+            by, value = locator.strategies[index]
+            started = time.perf_counter()
+            elements = driver.find_elements(by, value)
+            self._record(locator.name, index, time.perf_counter() - started, found=bool(elements))
+            if elements:
+                self._preferred[locator.name] = index
+                return elements if multiple else elements[0]
+        return [] if multiple else None
+
+    def report(self):
+        """
+        Returns resolution statistics per locator strategy, slowest first.
+
+        :return: Rows with name, strategy, lookups, misses, avg_ms and query_ms
+        :rtype: list
+
+        """
+        rows = []
+        with self._lock:
+            for (name, index), stats in self._stats.items():
+                by, value = self._locators[name].strategies[index] if name in self._locators else (None, None)
+                rows.append({
+                    "name": name,
+                    "strategy": f"{by}={value}",
+                    "preferred": self._preferred.get(name) == index,
+                    "lookups": stats["lookups"],
+                    "misses": stats["misses"],
+                    "avg_ms": 1000 * stats["seconds"] / stats["lookups"] if stats["lookups"] else 0.0,
+                    "query_ms": stats["query_ms"],
+                })
+        return sorted(rows, key=lambda row: row["avg_ms"], reverse=True)
+
+    def _entry(self, name, index):
+        return self._stats.setdefault((name, index), {"lookups": 0, "misses": 0, "seconds": 0.0, "query_ms": 0.0})
+
+    def _record(self, name, index, seconds, found):
+        with self._lock:
+            entry = self._entry(name, index)
+            entry["lookups"] += 1
+            entry["seconds"] += seconds
+            if not found:
+                entry["misses"] += 1
+
+    def _record_costs(self, name, order, costs):
+        with self._lock:
+            for position, cost in enumerate(costs or []):
+                self._entry(name, order[position])["query_ms"] += cost
+
+
+LOCATORS = LocatorRegistry()
+
+# HomePage
+HOME_COMPANY_MENU = LOCATORS.register(
+    "HomePage.company_menu",
+    (By.CSS_SELECTOR, "#navbarNavDropdown > ul:nth-of-type(1) > li:nth-of-type(6) > a#navbarDropdownMenuLink"),
+    (By.XPATH, "(//*[@id='navbarDropdownMenuLink'])[5]"),
+)
+HOME_CAREERS_LINK = LOCATORS.register(
+    "HomePage.careers_link",
+    (By.CSS_SELECTOR, "#navbarNavDropdown > ul:nth-of-type(1) > li:nth-of-type(6) > div > div:nth-of-type(2) > a:nth-of-type(2)"),
+    (By.XPATH, "//*[@id='navbarNavDropdown']/ul[1]/li[6]/div/div[2]/a[2]"),
+)
+COOKIE_ACCEPT_BUTTON = LOCATORS.register(
+    "HomePage.cookie_accept_button",
+    (By.ID, "wt-cli-accept-all-btn"),
+)
+
+# CareersPage
+CAREERS_LOCATIONS = LOCATORS.register(
+    "CareersPage.locations",
+    (By.CSS_SELECTOR, "#career-our-location > div > div > div > div:nth-of-type(1)"),
+    (By.XPATH, "//*[@id='career-our-location']/div/div/div/div[1]"),
+)
+CAREERS_TEAMS = LOCATORS.register(
+    "CareersPage.teams",
+    (By.CSS_SELECTOR, "#career-find-our-calling > div > div > a"),
+    (By.XPATH, "//*[@id='career-find-our-calling']/div/div/a"),
+)
+CAREERS_LIFE_AT_INSIDER = LOCATORS.register(
+    "CareersPage.life_at_insider",
+    (By.XPATH, "//h2[contains(text(), 'Life at Insider')]"),
+)
+CAREERS_SEE_ALL_TEAMS = LOCATORS.register(
+    "CareersPage.see_all_teams",
+    (By.XPATH, "//a[contains(text(), 'See all teams')]"),
+)
+CAREERS_QA_SECTION = LOCATORS.register(
+    "CareersPage.qa_section",
+    (By.XPATH, "//h3[contains(text(), 'Quality Assurance')]"),
+)
+CAREERS_QA_OPEN_POSITIONS = LOCATORS.register(
+    "CareersPage.qa_open_positions",
+    (By.XPATH, "//h3[contains(text(), 'Quality Assurance')]/following-sibling::a[contains(text(), 'Open Positions')]"),
+)
+
+# QACareersPage
+QA_SEE_ALL_QA_JOBS = LOCATORS.register(
+    "QACareersPage.see_all_qa_jobs",
+    (By.CSS_SELECTOR, "a[href*='department=qualityassurance']"),
+    (By.XPATH, "//a[contains(text(), 'See all QA jobs')]"),
+)
+QA_DEPARTMENT_CONTAINER = LOCATORS.register(
+    "QACareersPage.department_container",
+    (By.ID, "select2-filter-by-department-container"),
+)
+QA_LOCATION_CONTAINER = LOCATORS.register(
+    "QACareersPage.location_container",
+    (By.ID, "select2-filter-by-location-container"),
+)
+QA_LOCATION_ISTANBUL = LOCATORS.register(
+    "QACareersPage.location_istanbul",
+    (By.XPATH, "//li[contains(@class, 'select2-results__option') and normalize-space(text())='Istanbul, Turkiye']"),
+)
+QA_LOCATION_DROPDOWN = LOCATORS.register(
+    "QACareersPage.location_dropdown",
+    (By.ID, "location"),
+    (By.XPATH, "//select[@id='location']"),
+)
+QA_DEPARTMENT_DROPDOWN = LOCATORS.register(
+    "QACareersPage.department_dropdown",
+    (By.ID, "department"),
+    (By.XPATH, "//select[@id='department']"),
+)
+QA_VIEW_ROLE_BUTTON = LOCATORS.register(
+    "QACareersPage.view_role_button",
+    (By.CSS_SELECTOR, "#jobs-list .position-list-item a[href*='lever.co']"),
+    (By.XPATH, "//a[contains(text(), 'View Role')]"),
+)
+QA_JOB_CARD = LOCATORS.register(
+    "QACareersPage.job_card",
+    (By.CSS_SELECTOR, ".position-list-item"),
+    (By.XPATH, "//div[contains(@class, 'position-list-item')]"),
+)
+QA_JOB_LIST_CARD = LOCATORS.register(
+    "QACareersPage.job_list_card",
+    (By.CSS_SELECTOR, "#jobs-list .position-list-item"),
+    (By.XPATH, "//div[@id='jobs-list']//div[contains(@class, 'position-list-item')]"),
+)
+QA_LOAD_MORE_JOBS = LOCATORS.register(
+    "QACareersPage.load_more_jobs",
+    (By.CSS_SELECTOR, "#career-position-list .load-more"),
+    (By.XPATH, "//button[contains(text(), 'Load more')]"),
+)
@@ -1,45 +1,775 @@
 import pytest
+import logging
 import os
-from datetime import datetime, timezone
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from webdriver_manager.firefox import GeckoDriverManager
-from database_controller import insert_test_result_to_influxdb
+import time
+import warnings
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from database_controller import InfluxDBBatchWriter, build_point
+from utils.artifacts import IMAGE_FORMATS, ArtifactStore
+from utils.browser_profiles import BROWSER_PROFILES, DEFAULT_SITE_URL, get_browser_profile
+from utils.checkpoints import CheckpointStore
+from utils.driver_factory import SUPPORTED_BROWSERS, create_driver
+from utils.driver_resolver import DEFAULT_CACHE_PATH, configure_driver_resolver
+from utils.driver_pool import DriverPool
+from utils.http_archive import ArchiveProxy, HttpArchive
+from utils.logger import configure_logging, get_logger, log_context, shutdown_logging
+from utils.multi_context import ISOLATION_MODES, FlowScheduler
+from utils.resource_policy import RESOURCE_POLICIES, ResourceMonitor, get_resource_policy
+from utils.stand_in_site import MAX_JOBS, MIN_JOBS, StandInSite
+from utils.retry import FileFlakeStore, FlakeQuarantine, InfluxFlakeStore, StepRetryLog, configure_retries
+from utils.command_profiler import CommandProfile, CommandProfiler
+from utils.page_metrics import PageMetricsCollector
+from utils.perf_budget import (FileBaselineStore, InfluxBaselineStore, PerfBudget, PerfBudgetWarning,
+                               slowest_step_durations)
+from utils.telemetry import TelemetryWorker, write_bytes
+from utils.tracing import Tracer, add_command_listener, remove_command_listener
+from pages.base_page import BasePage
+from pages.locators import LOCATORS
 
-@pytest.fixture(params=["chrome", "firefox"])
-def driver(request):
+influxdb_writer_key = pytest.StashKey[InfluxDBBatchWriter]()
+telemetry_worker_key = pytest.StashKey[TelemetryWorker]()
+command_profiler_key = pytest.StashKey[CommandProfiler]()
+command_budget_key = pytest.StashKey[tuple]()
+artifact_store_key = pytest.StashKey[ArtifactStore]()
+perf_budget_key = pytest.StashKey[PerfBudget]()
+baseline_file_key = pytest.StashKey[FileBaselineStore]()
+tracer_key = pytest.StashKey[Tracer]()
+session_summary_key = pytest.StashKey[list]()
+flake_quarantine_key = pytest.StashKey[FlakeQuarantine]()
+flake_file_key = pytest.StashKey[FileFlakeStore]()
+step_retry_log_key = pytest.StashKey[StepRetryLog]()
+
+logger = get_logger("conftest")
+
+
+def get_worker_id():
+    """
+    Returns the pytest-xdist worker id ("gw0", "gw1", ...) or "main" for serial runs.
+
+    """
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def get_browser(item):
+    """
+    Returns the browser a test item is parametrized with, or None if it does not use a driver.
+
+    """
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("driver") if callspec else None
+
+
+def pytest_addoption(parser):
+    """
+    Registers command line options for result reporting.
+
+    """
+    group = parser.getgroup("influxdb", "InfluxDB test result reporting")
+    group.addoption("--influxdb-host", default=os.getenv("INFLUXDB_HOST", "localhost"),
+                    help="InfluxDB host (default: localhost or $INFLUXDB_HOST)")
+    group.addoption("--influxdb-port", type=int, default=int(os.getenv("INFLUXDB_PORT", "8086")),
+                    help="InfluxDB HTTP port (default: 8086 or $INFLUXDB_PORT)")
+    group.addoption("--influxdb-database", default=os.getenv("INFLUXDB_DATABASE", "test_results"),
+                    help="InfluxDB database name (default: test_results)")
+    group.addoption("--influxdb-batch-size", type=int, default=100,
+                    help="Number of buffered points that triggers a batch write")
+    group.addoption("--influxdb-flush-interval", type=float, default=10.0,
+                    help="Max seconds between batch writes while points are buffered")
+
+    group = parser.getgroup("drivers", "WebDriver sessions")
+    group.addoption("--no-driver-reuse", action="store_true", default=False,
+                    help="Quit the browser after every test instead of reusing pooled sessions")
+    group.addoption("--resource-policy", default="full", choices=sorted(RESOURCE_POLICIES),
+                    help="Requests to block in the browser (default: full, nothing blocked); "
+                         "overridden per test with @pytest.mark.resource_policy(name)")
+    group.addoption("--browser-profile", default=os.getenv("BROWSER_PROFILE", "default"),
+                    choices=sorted(BROWSER_PROFILES),
+                    help="Browser configuration: default, headless, lean (headless, eager, no background work) "
+                         "or fast (lean + cookie consent preset) (default: default or $BROWSER_PROFILE)")
+    group.addoption("--driver-cache", default=os.getenv("DRIVER_CACHE", DEFAULT_CACHE_PATH),
+                    help="File caching resolved driver binaries (default: ~/.cache/insider-ui-tests/drivers.json)")
+    group.addoption("--driver-cache-ttl", type=float, default=168.0,
+                    help="Hours a cached driver resolution stays valid (default: 168)")
+    group.addoption("--offline-drivers", action="store_true", default=bool(os.getenv("OFFLINE_DRIVERS")),
+                    help="Only use driver binaries already on this machine, never download")
+    group.addoption("--http-archive", default=os.getenv("HTTP_ARCHIVE"),
+                    help="Directory of an HTTP archive to route browser traffic through (default: $HTTP_ARCHIVE)")
+    group.addoption("--http-archive-mode", default="replay", choices=ArchiveProxy.MODES,
+                    help="record: fetch live and store responses; replay: serve stored responses offline")
+
+    group.addoption("--no-checkpoints", action="store_true", default=False,
+                    help="Walk the full navigation path in every test instead of resuming from flow checkpoints")
+    group.addoption("--checkpoint-max-age", type=float, default=30.0,
+                    help="Minutes a flow checkpoint stays usable (default: 30)")
+    group.addoption("--flow-isolation", default=os.getenv("FLOW_ISOLATION", "auto"), choices=ISOLATION_MODES,
+                    help="Windows of flows sharing one browser (browser_flows fixture): contexts (own cookies, "
+                         "Chromium only), tabs (shared cookies) or auto (default: auto or $FLOW_ISOLATION)")
+
+    group = parser.getgroup("site", "Site under test")
+    group.addoption("--site-url", default=DEFAULT_SITE_URL,
+                    help="Base URL the page objects open (default: https://useinsider.com or $SITE_URL)")
+    group.addoption("--stand-in-site", action="store_true", default=bool(os.getenv("STAND_IN_SITE")),
+                    help="Run against a local stand-in of the careers pages and Lever (no network), "
+                         "see utils/stand_in_site.py")
+    group.addoption("--stand-in-jobs", type=int, default=200,
+                    help=f"Job postings generated by the stand-in site ({MIN_JOBS}-{MAX_JOBS}, default: 200)")
+    group.addoption("--stand-in-filter-latency", type=float, default=0.3,
+                    help="Seconds the stand-in site takes to answer a job filter (default: 0.3)")
+    group.addoption("--stand-in-page-size", type=int, default=0,
+                    help="Job cards the stand-in site renders per scroll (default: 0, all at once)")
+    group.addoption("--stand-in-virtual", action="store_true", default=False,
+                    help="Stand-in listing recycles --stand-in-page-size card nodes while scrolling (virtual scroll)")
+
+    group = parser.getgroup("tracing", "Page-object step spans")
+    group.addoption("--trace-dir", default="traces",
+                    help="Directory for per-test Chrome trace-event files (default: traces; empty to disable)")
+
+    group = parser.getgroup("profiling", "WebDriver command profiling")
+    group.addoption("--profile-commands", action="store_true", default=False,
+                    help="Record every WebDriver command and print top endpoints/steps and latency histograms")
+    group.addoption("--profile-top", type=int, default=10,
+                    help="Number of rows in the command profile report (default: 10)")
+    group.addoption("--roundtrip-budget", type=int, default=None,
+                    help="Fail tests sending more WebDriver commands than this; "
+                         "overridden per test with @pytest.mark.roundtrip_budget(n)")
+
+    group = parser.getgroup("page_metrics", "Browser performance metrics")
+    group.addoption("--page-metrics", action="store_true", default=False,
+                    help="Collect Navigation Timing, paint, CLS, long tasks and transfer sizes of each "
+                         "navigation step into the 'ui_page_performance' measurement")
+
+    group = parser.getgroup("perf_budget", "Performance budgets")
+    group.addoption("--perf-budget-mode", default="warn", choices=("off", "warn", "fail"),
+                    help="What a @pytest.mark.perf_budget violation does (default: warn)")
+    group.addoption("--perf-baseline-source", default="auto", choices=("auto", "influxdb", "file"),
+                    help="Where baselines come from; auto tries InfluxDB, then the local file")
+    group.addoption("--perf-baseline-file", default=".perf-baseline.json",
+                    help="Local duration history used without InfluxDB (default: .perf-baseline.json)")
+    group.addoption("--perf-baseline-runs", type=int, default=20,
+                    help="Number of recent passed runs forming the baseline (default: 20)")
+    group.addoption("--perf-regression-threshold", type=float, default=0.2,
+                    help="Allowed slowdown over the baseline p95, as a fraction (default: 0.2)")
+
+    group = parser.getgroup("retries", "Step retries and flake quarantine")
+    group.addoption("--step-retries", type=int, default=None,
+                    help="Override the attempts of every @retry_step page-object step (1 disables retries)")
+    group.addoption("--step-retry-backoff", type=float, default=None,
+                    help="Override the seconds before the first retry of a step")
+    group.addoption("--flake-stats-file", default=".flake-stats.json",
+                    help="Local step outcome history used without InfluxDB (default: .flake-stats.json)")
+    group.addoption("--flake-quarantine-threshold", type=float, default=0.2,
+                    help="Flake rate over the last 50 calls (at least 10) from which a step is quarantined: "
+                         "its failures mark the test xfailed instead of failed (default: 0.2)")
+    group.addoption("--no-flake-quarantine", action="store_true", default=False,
+                    help="Never quarantine steps; failures always fail the test")
+
+    group = parser.getgroup("artifacts", "Failure artifacts")
+    group.addoption("--artifacts-dir", default="artifacts",
+                    help="Directory for failure screenshots, DOM snapshots and console logs (default: artifacts)")
+    group.addoption("--screenshot-format", default="auto", choices=IMAGE_FORMATS,
+                    help="auto: WebP when Pillow is installed, optimized PNG otherwise")
+
+    group = parser.getgroup("ui_logging", "Structured logging")
+    group.addoption("--ui-log-level", default=os.getenv("UI_LOG_LEVEL", "INFO"),
+                    choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                    help="Level of page-object and reporting logs; DEBUG adds per-element and per-job-card lines "
+                         "(default: INFO or $UI_LOG_LEVEL)")
+    group.addoption("--log-json", default=os.getenv("LOG_JSON"),
+                    help="Also write logs as JSON lines to this file, one file per pytest-xdist worker "
+                         "(default: $LOG_JSON)")
+
+    group = parser.getgroup("telemetry", "Background telemetry pipeline")
+    group.addoption("--telemetry-queue-size", type=int, default=1000,
+                    help="Max number of reporting jobs queued for the background worker")
+    group.addoption("--telemetry-drop-policy", default="block", choices=TelemetryWorker.POLICIES,
+                    help="What to do with new jobs when the queue is full (default: block)")
+    group.addoption("--telemetry-put-timeout", type=float, default=1.0,
+                    help="Max seconds a test blocks on a full queue under the 'block' policy")
+    group.addoption("--telemetry-drain-timeout", type=float, default=30.0,
+                    help="Max seconds to wait for queued jobs at session end")
+
+
+def pytest_configure(config):
     """
-    Pytest fixture to initialize and return a Selenium WebDriver instance.
+    Creates the session-scoped InfluxDB writer and the background worker that feeds it.
+
+    """
+    configure_logging(level=config.getoption("ui_log_level"), json_path=_log_json_path(config))
+    config.stash[session_summary_key] = []
+    config.addinivalue_line(
+        "markers", "resource_policy(name): block requests in the browser with the named resource policy")
+    config.addinivalue_line(
+        "markers", "roundtrip_budget(n): fail the test if it sends more than n WebDriver commands")
+    config.addinivalue_line(
+        "markers", "perf_budget(seconds=None, steps=None): check the test duration and {step: seconds} "
+                   "against budgets; None derives the budget from the rolling baseline")
+    configure_driver_resolver(
+        cache_path=config.getoption("driver_cache"),
+        ttl=config.getoption("driver_cache_ttl") * 3600,
+        offline=config.getoption("offline_drivers"),
+    )
+    if config.getoption("profile_commands"):
+        config.stash[command_profiler_key] = CommandProfiler()
+
+    writer = InfluxDBBatchWriter(
+        host=config.getoption("influxdb_host"),
+        port=config.getoption("influxdb_port"),
+        database=config.getoption("influxdb_database"),
+        batch_size=config.getoption("influxdb_batch_size"),
+        flush_interval=config.getoption("influxdb_flush_interval"),
+    )
+    config.stash[influxdb_writer_key] = writer
+    config.stash[artifact_store_key] = ArtifactStore(
+        root=config.getoption("artifacts_dir"),
+        image_format=config.getoption("screenshot_format"),
+    )
+
+    mode = config.getoption("perf_budget_mode")
+    if mode != "off":
+        source = config.getoption("perf_baseline_source")
+        file_store = FileBaselineStore(config.getoption("perf_baseline_file"))
+        stores = []
+        if source in ("auto", "influxdb"):
+            stores.append(InfluxBaselineStore(writer.client, writer.database))
+        if source in ("auto", "file"):
+            stores.append(file_store)
+        config.stash[baseline_file_key] = file_store
+        config.stash[perf_budget_key] = PerfBudget(
+            stores, mode=mode, runs=config.getoption("perf_baseline_runs"),
+            threshold=config.getoption("perf_regression_threshold"))
+    configure_retries(attempts=config.getoption("step_retries"), backoff=config.getoption("step_retry_backoff"))
+    flake_file = FileFlakeStore(config.getoption("flake_stats_file"))
+    config.stash[flake_file_key] = flake_file
+    if not config.getoption("no_flake_quarantine"):
+        config.stash[flake_quarantine_key] = FlakeQuarantine(
+            [InfluxFlakeStore(writer.client, writer.database), flake_file],
+            threshold=config.getoption("flake_quarantine_threshold"))
+
+    config.stash[telemetry_worker_key] = TelemetryWorker(
+        maxsize=config.getoption("telemetry_queue_size"),
+        policy=config.getoption("telemetry_drop_policy"),
+        put_timeout=config.getoption("telemetry_put_timeout"),
+        on_idle=writer.flush_if_due,
+    ).start()
+
+
+def _log_json_path(config):
+    """
+    Returns the --log-json path, suffixed with the worker id under pytest-xdist
+    (logs/ui.jsonl -> logs/ui.gw0.jsonl) so workers never share a file.
+
+    """
+    path = config.getoption("log_json")
+    if not path or get_worker_id() == "main":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{get_worker_id()}{ext}"
+
+
+def add_session_summary(config, *lines):
+    """
+    Logs session-level counters and keeps them for the terminal summary, which pytest
+    prints once at the end instead of interleaving them with test output.
+
+    """
+    for line in lines:
+        logger.info(line)
+    config.stash[session_summary_key].extend(lines)
+
+
+def pytest_sessionfinish(session):
+    """
+    Drains the telemetry queue, flushes buffered results and summarizes counters at session end.
+
+    """
+    config = session.config
+    worker = config.stash.get(telemetry_worker_key, None)
+    if worker is not None:
+        drained = worker.drain(timeout=config.getoption("telemetry_drain_timeout"))
+        stats = worker.summary()
+        add_session_summary(config, f"📬 Telemetry worker: {stats['completed']} done, {stats['failed']} failed, "
+                                    f"{stats['dropped']} dropped, max queue depth {stats['max_depth']}"
+                                    f"{'' if drained else ', drain timed out'}")
+
+    profiler = config.stash.get(command_profiler_key, None)
+    if profiler is not None and profiler.tests:
+        add_session_summary(config, *profiler.format_report(config.getoption("profile_top")))
+
+    file_store = config.stash.get(baseline_file_key, None)
+    if file_store is not None:
+        file_store.save()
+    flake_file = config.stash.get(flake_file_key, None)
+    if flake_file is not None:
+        flake_file.save()
+    quarantine = config.stash.get(flake_quarantine_key, None)
+    if quarantine is not None and quarantine.quarantined():
+        add_session_summary(config, f"🧯 Quarantined flaky steps: {', '.join(quarantine.quarantined())}")
+
+    store = config.stash.get(artifact_store_key, None)
+    if store is not None and store.stats["failures"]:
+        stats = store.stats
+        add_session_summary(config, f"🗃 Failure artifacts: {stats['failures']} failures, {stats['objects']} new objects, "
+                                    f"{stats['deduplicated']} deduplicated, {stats['raw_bytes'] / 1024:.0f} KB raw -> "
+                                    f"{stats['stored_bytes'] / 1024:.0f} KB stored in {store.root}/")
+
+    slowest = [row for row in LOCATORS.report() if row["lookups"]][:5]
+    if slowest:
+        add_session_summary(config, "🔎 Slowest locator strategies:", *(
+            f"   {row['avg_ms']:8.1f} ms avg | {row['lookups']:3d} lookups | {row['misses']:2d} misses | "
+            f"{'*' if row['preferred'] else ' '} {row['name']} ({row['strategy']})" for row in slowest))
+
+    writer = config.stash.get(influxdb_writer_key, None)
+    if writer is not None:
+        writer.close()
+        summary = writer.summary()
+        add_session_summary(config, f"📊 InfluxDB writer: {summary['points_written']} written, "
+                                    f"{summary['points_failed']} failed, {summary['flushes']} flushes, "
+                                    f"{summary['points_per_flush_second']:.0f} points/s")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Prints the session counters collected by add_session_summary.
+
+    """
+    lines = config.stash.get(session_summary_key, None)
+    if lines:
+        terminalreporter.section("ui test session")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+def pytest_unconfigure(config):
+    # Flushes the JSON log file
+    shutdown_logging()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    """
+    Binds the test id, browser and worker id to every log record of the test.
+
+    """
+    with log_context(test_id=item.nodeid, browser=get_browser(item), worker_id=get_worker_id()):
+        yield
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Groups browser tests by browser so `-n <workers> --dist loadgroup` shards per browser.
+    With the default `--dist load` every parametrized test is sharded on its own.
+
+    """
+    for item in items:
+        browser = get_browser(item)
+        if browser:
+            item.add_marker(pytest.mark.xdist_group(browser))
+
+
+@pytest.fixture(scope="session")
+def http_archive_proxy(request):
+    """
+    Session-scoped record/replay proxy, started when --http-archive is given.
+
+    Under pytest-xdist every worker process runs its own proxy on a free port.
+    Record serially: parallel recorders would race on the archive index.
+
+    """
+    path = request.config.getoption("http_archive")
+    if not path:
+        yield None
+        return
+    proxy = ArchiveProxy(HttpArchive(path), mode=request.config.getoption("http_archive_mode")).start()
+    logger.info("📼 HTTP archive %s: %s via %s", proxy.mode, path, proxy.address)
+    yield proxy
+    proxy.stop()
+    stats = proxy.stats
+    add_session_summary(request.config, f"📼 HTTP archive: {stats['requests']} served, {stats['misses']} not in archive, "
+                                        f"{stats['errors']} upstream errors")
+
+
+@pytest.fixture(autouse=True)
+def http_archive_occurrences(http_archive_proxy):
+    """
+    Counts archive requests per test, so the n-th request of a test for a URL always gets
+    the n-th recorded response, whatever ran earlier on the worker (-k, -n auto).
+
+    """
+    if http_archive_proxy is not None:
+        http_archive_proxy.reset_occurrences()
+
+
+@pytest.fixture(scope="session")
+def site_url(request):
+    """
+    Base URL of the site under test. With --stand-in-site a local stand-in is started
+    (one per pytest-xdist worker) and the page objects are pointed at it.
+
+    """
+    config = request.config
+    if not config.getoption("stand_in_site"):
+        BasePage.site_url = config.getoption("site_url").rstrip("/")
+        yield BasePage.site_url
+        return
+    site = StandInSite(jobs=config.getoption("stand_in_jobs"),
+                       filter_latency=config.getoption("stand_in_filter_latency"),
+                       page_size=config.getoption("stand_in_page_size"),
+                       virtual=config.getoption("stand_in_virtual")).start()
+    BasePage.site_url = site.url
+    logger.info("🏗 Stand-in site with %d jobs on %s", len(site.jobs), site.url)
+    yield site.url
+    site.stop()
+    BasePage.site_url = DEFAULT_SITE_URL
+    stats = site.stats
+    add_session_summary(config, f"🏗 Stand-in site: {stats['requests']} requests, {stats['listings']} job listings")
+
+
+@pytest.fixture(scope="session")
+def checkpoint_store(request):
+    """
+    Session-scoped flow checkpoints (see utils.checkpoints), or None with --no-checkpoints.
+
+    """
+    if request.config.getoption("no_checkpoints"):
+        yield None
+        return
+    store = CheckpointStore(max_age=request.config.getoption("checkpoint_max_age") * 60)
+    yield store
+    stats = store.stats
+    if stats["saved"]:
+        add_session_summary(request.config, f"⏩ Flow checkpoints: {stats['saved']} saved, {stats['restored']} resumed, "
+                                            f"{stats['missed']} missed, {stats['failed']} failed to restore")
+
+
+@pytest.fixture
+def flow_checkpoints(request, checkpoint_store, driver):
+    """
+    Flow checkpoints of the test's browser and --browser-profile, or None with --no-checkpoints.
+
+    The test walking the full navigation path saves them; later tests on the same browser
+    and profile resume from them and fall back to the full path when none exists yet in
+    this worker process.
+
+    """
+    if checkpoint_store is None:
+        return None
+    return checkpoint_store.scope(request.node.callspec.params["driver"], request.config.getoption("browser_profile"))
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """
+    Session-scoped pool of warm browser sessions shared by every test.
+
+    Browsers are launched on first use per (browser, options) key and quit at session end.
+    Under pytest-xdist every worker process owns its own pool.
+
+    """
+    pool = DriverPool(create_driver)
+    yield pool
+    stats = pool.summary()
+    add_session_summary(request.config, f"🧰 Driver pool: {stats['created']} launched, {stats['reused']} reused, "
+                                        f"{stats['rebuilt']} rebuilt")
+    pool.close()
+
+
+@pytest.fixture(params=SUPPORTED_BROWSERS)
+def driver(request, driver_pool, http_archive_proxy, site_url):
+    """
+    Pytest fixture to lease a Selenium WebDriver instance from the session pool.
 
     This fixture supports both Chrome and Firefox browsers. It:
-    - Configures browser-specific options
-    - Launches the driver
-    - Maximizes the window for consistency
-    - Tears down the driver after test execution
-
-    """
-    if request.param == "chrome":
-        chrome_options = ChromeOptions()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-
-        # ✅ Using local chromedriver path
-        service = ChromeService(
-            executable_path="/Users/ferit.tongemen/Documents/Drivers/chromedriver-mac-arm64/chromedriver"
-        )
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+    - Reuses a warm session for the browser, launching one only if none is idle or healthy
+    - Launches it with the --browser-profile configuration and applies its session state
+    - Points the page objects at --site-url or the local stand-in site (--stand-in-site)
+    - Resets the session after the test (extra tabs, cookies, storage, about:blank)
+    - Quits the session instead when --no-driver-reuse is given
+    - Applies the resource policy (--resource-policy or @pytest.mark.resource_policy)
+      and reports requests/bytes loaded and saved by it
+    - Routes traffic through the HTTP archive proxy when --http-archive is given
+    - Traces page-object steps and WebDriver commands of the test (see utils.tracing)
+    - Profiles WebDriver commands with --profile-commands and enforces the round-trip budget
+    - Collects browser performance metrics of navigation steps with --page-metrics
+    - Records the attempts of @retry_step steps as flake statistics (see utils.retry)
 
-    elif request.param == "firefox":
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service)
+    """
+    policy = _resource_policy_name(request)
 
-    driver.maximize_window()
+    profile = request.config.getoption("browser_profile")
+    options = {"resource_policy": policy, "profile": profile}
+    if http_archive_proxy:
+        options["proxy"] = http_archive_proxy.address
+    driver = driver_pool.acquire(request.param, **options)
+    get_browser_profile(profile).prepare_session(driver, site_url)
+    monitor = ResourceMonitor(driver).start()
+    tracer = Tracer(request.node.name)
+    request.node.stash[tracer_key] = tracer
+    add_command_listener(driver, tracer.on_command)
+    tracer.activate()
+    retry_log = StepRetryLog().activate()
+    request.node.stash[step_retry_log_key] = retry_log
+    profile = _start_command_profile(request, driver)
+    page_metrics = PageMetricsCollector(driver).activate() if request.config.getoption("page_metrics") else None
     yield driver
-    driver.quit()
+
+    if page_metrics is not None:
+        page_metrics.deactivate()
+        _report_page_metrics(request, page_metrics.records)
+    tracer.deactivate()
+    retry_log.deactivate()
+    _report_step_retries(request, retry_log)
+    remove_command_listener(driver, tracer.on_command)
+    if profile is not None:
+        remove_command_listener(driver, profile.on_command)
+        profiler = request.config.stash.get(command_profiler_key, None)
+        if profiler is not None:
+            profiler.add(profile)
+    _report_spans(request, tracer)
+    try:
+        usage = monitor.stop()
+    except Exception as e:
+        logger.warning("⚠️ Resource usage not available: %s", e)
+    else:
+        _report_resource_usage(request, policy, usage)
+    driver_pool.release(driver, reuse=not request.config.getoption("no_driver_reuse"))
+
+
+def _resource_policy_name(request):
+    marker = request.node.get_closest_marker("resource_policy")
+    return marker.args[0] if marker else request.config.getoption("resource_policy")
+
+
+@pytest.fixture
+def browser_flows(request, driver, site_url):
+    """
+    Runs several independent flows concurrently in the test's browser session instead of
+    one browser per flow (see utils.multi_context.FlowScheduler). Every flow gets its own
+    window, in its own browser context with --flow-isolation contexts/auto on Chrome,
+    prepared like the test's window (resource policy, --browser-profile session state).
+
+    """
+    policy = get_resource_policy(_resource_policy_name(request))
+    profile = get_browser_profile(request.config.getoption("browser_profile"))
+
+    def prepare(flow_driver):
+        policy.apply(flow_driver)
+        profile.prepare_session(flow_driver, site_url)
+
+    scheduler = FlowScheduler(driver, isolation=request.config.getoption("flow_isolation"), prepare=prepare)
+    yield scheduler
+    logger.debug("🗂 Flow windows: %d contexts, %d tabs, %d switches",
+                 scheduler.stats["contexts"], scheduler.stats["tabs"], scheduler.switches)
+    try:
+        scheduler.close()
+    except Exception as e:
+        logger.warning("⚠️ Flow windows not closed: %s", e)
+
+
+def _report_resource_usage(request, policy, usage):
+    """
+    Logs and queues the per-test resource usage as a 'ui_resource_usage' point.
+
+    """
+    saved = "n/a" if usage["bytes_saved"] is None else f"{usage['blocked_requests']} requests / {usage['bytes_saved'] / 1024:.0f} KB"
+    logger.info("🌐 Resources [%s]: %d requests, %.0f KB loaded, saved %s",
+                policy, usage["requests"], usage["bytes"] / 1024, saved)
+
+    fields = {key: value for key, value in usage.items() if value is not None}
+    point = build_point(
+        "ui_resource_usage",
+        {"test_name": request.node.name, "browser": request.param, "resource_policy": policy,
+         "worker_id": get_worker_id()},
+        fields,
+        datetime.now(timezone.utc),
+    )
+    config = request.config
+    config.stash[telemetry_worker_key].submit(config.stash[influxdb_writer_key].write, point)
+
+
+def _report_step_retries(request, retry_log):
+    """
+    Queues one 'ui_step_retries' point per call of a retried step and adds its outcome
+    to the local flake history.
+
+    """
+    config = request.config
+    worker = config.stash[telemetry_worker_key]
+    flake_file = config.stash[flake_file_key]
+    for record in retry_log.records:
+        flake_file.record(record.step, record.outcome)
+        point = build_point(
+            "ui_step_retries",
+            {"test_name": request.node.name, "browser": request.param, "worker_id": get_worker_id(),
+             "step": record.step, "outcome": record.outcome},
+            {"attempts": record.attempts, "retry_seconds": record.retry_seconds,
+             "flaky": record.outcome == "flaky", "failed": record.outcome == "failed"},
+            datetime.now(timezone.utc),
+        )
+        worker.submit(config.stash[influxdb_writer_key].write, point)
+
+
+def _quarantine_reason(item):
+    """
+    Returns why a failed test is quarantined: it failed in a retried step whose
+    flake rate crossed the threshold. None if it is not quarantined.
+
+    """
+    quarantine = item.config.stash.get(flake_quarantine_key, None)
+    retry_log = item.stash.get(step_retry_log_key, None)
+    if quarantine is None or retry_log is None:
+        return None
+    steps = [step for step in retry_log.failed_steps() if quarantine.is_quarantined(step)]
+    return f"quarantined flaky step: {', '.join(steps)}" if steps else None
+
+
+def _start_command_profile(request, driver):
+    """
+    Starts recording WebDriver commands when profiling is on or a round-trip budget applies.
+
+    """
+    marker = request.node.get_closest_marker("roundtrip_budget")
+    budget = marker.args[0] if marker else request.config.getoption("roundtrip_budget")
+    profiling = command_profiler_key in request.config.stash
+    if budget is None and not profiling:
+        return None
+    # A budget alone only needs the number of round trips, not their sizes and latencies
+    profile = CommandProfile(request.node.name, detailed=profiling)
+    add_command_listener(driver, profile.on_command)
+    request.node.stash[command_budget_key] = (profile, budget)
+    return profile
+
+
+def _report_page_metrics(request, records):
+    """
+    Logs and queues one 'ui_page_performance' point per navigation step.
+
+    """
+    config = request.config
+    worker = config.stash[telemetry_worker_key]
+    for metrics in records:
+        metrics = dict(metrics)
+        tags = {"test_name": request.node.name, "browser": request.param, "worker_id": get_worker_id(),
+                "step": metrics.pop("step"), "host": urlsplit(metrics.pop("url")).netloc,
+                "navigation_type": metrics.pop("navigation_type")}
+        fields = {key: float(value) for key, value in metrics.items() if value is not None}
+        lcp = fields.get("lcp_ms")
+        logger.info("🚦 %s (%s): load %.0f ms, FCP %.0f ms, LCP %s, CLS %.3f, %d long tasks",
+                    tags["step"], tags["host"], fields.get("load_ms", 0), fields.get("fcp_ms", 0),
+                    "n/a" if lcp is None else f"{lcp:.0f} ms", fields.get("cls", 0), fields.get("long_tasks", 0),
+                    extra={"fields": {"page_metrics": fields}})
+        point = build_point("ui_page_performance", tags, fields, datetime.now(timezone.utc))
+        worker.submit(config.stash[influxdb_writer_key].write, point)
+
+
+def _report_spans(request, tracer):
+    """
+    Queues one 'ui_test_spans' point per traced step and the test's Chrome trace file
+    (traces/<worker_id>/<test_name>.json, open it in chrome://tracing or ui.perfetto.dev).
+
+    """
+    config = request.config
+    worker = config.stash[telemetry_worker_key]
+    writer = config.stash[influxdb_writer_key]
+    started = datetime.fromtimestamp(tracer.started_wall, timezone.utc)
+    for span in tracer.spans:
+        details = span.as_dict()
+        tags = {"test_name": request.node.name, "browser": request.param, "worker_id": get_worker_id(),
+                "span": details.pop("name"), "kind": details.pop("kind"), "parent": details.pop("parent")}
+        point = build_point("ui_test_spans", tags, details, started + timedelta(seconds=span.started))
+        worker.submit(writer.write, point)
+
+    trace_dir = config.getoption("trace_dir")
+    if trace_dir and tracer.spans:
+        path = os.path.join(trace_dir, get_worker_id(), f"{request.node.name}.json")
+        worker.submit(write_bytes, path, tracer.trace_json())
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Fails a test that passed but sent more WebDriver commands than its round-trip budget
+    or regressed beyond its @pytest.mark.perf_budget (warns instead in --perf-budget-mode warn).
+
+    """
+    started = time.perf_counter()
+    result = yield
+    duration = time.perf_counter() - started
+    profile, budget = item.stash.get(command_budget_key, (None, None))
+    if budget is not None and profile.round_trips > budget:
+        steps = sorted(profile.by_step().items(), key=lambda step: step[1], reverse=True)[:5]
+        pytest.fail(f"WebDriver round-trip budget exceeded: {profile.round_trips} > {budget} "
+                    f"(top steps: {', '.join(f'{name}={count}' for name, count in steps)})")
+    _check_perf_budget(item, duration)
+    return result
+
+
+def _check_perf_budget(item, duration):
+    """
+    Compares the test duration and the slowest call of each declared step with their
+    budgets or baselines (a step's baseline is its slowest call in earlier runs of the
+    same test). Runs within budget are recorded in the local baseline file and as
+    'ui_step_durations' points; regressed runs are not, so they do not raise the baseline.
+
+    """
+    marker = item.get_closest_marker("perf_budget")
+    perf_budget = item.config.stash.get(perf_budget_key, None)
+    if marker is None or perf_budget is None:
+        return
+
+    browser = get_browser(item)
+    checks = [(item.name, duration, marker.kwargs.get("seconds"), "test")]
+    tracer = item.stash.get(tracer_key, None)
+    if tracer is not None:
+        durations = slowest_step_durations(tracer.spans)
+        for step, budget in (marker.kwargs.get("steps") or {}).items():
+            if step in durations:
+                checks.append((step, durations[step], budget, "step"))
+
+    violations = []
+    for name, seconds, budget, kind in checks:
+        test = item.name if kind == "step" else None
+        result = perf_budget.check(name, seconds, budget=budget, browser=browser, kind=kind, test=test)
+        if result is None:
+            logger.info("📏 %s: %.2fs (no baseline yet)", name, seconds)
+            continue
+        logger.log(logging.WARNING if result["exceeded"] else logging.INFO, "📏 %s: %.2fs / limit %.2fs [%s]%s",
+                   name, seconds, result["limit"], result["source"], " ❌ REGRESSION" if result["exceeded"] else "")
+        if result["exceeded"]:
+            violations.append(f"{name} took {seconds:.2f}s > {result['limit']:.2f}s ({result['source']})")
+
+    if not violations:
+        _record_perf_baseline(item, browser, checks)
+        return
+    if not violations:
+        return
+    message = "Performance budget exceeded: " + "; ".join(violations)
+    if perf_budget.mode == "fail":
+        pytest.fail(message)
+    warnings.warn(PerfBudgetWarning(message))
+
+
+def _record_perf_baseline(item, browser, checks):
+    """
+    Adds the durations of a run within budget to the baselines: the local file, and one
+    'ui_step_durations' point per step (the test durations already are in 'ui_test_results').
+
+    """
+    config = item.config
+    file_store = config.stash[baseline_file_key]
+    worker = config.stash[telemetry_worker_key]
+    now = datetime.now(timezone.utc)
+    for name, seconds, _, kind in checks:
+        if kind == "test":
+            file_store.record(name, browser, seconds)
+            continue
+        file_store.record(name, browser, seconds, test=item.name)
+        point = build_point("ui_step_durations",
+                            {"test_name": item.name, "browser": browser, "worker_id": get_worker_id(),
+                             "step": name},
+                            {"duration": float(seconds)}, now)
+        worker.submit(config.stash[influxdb_writer_key].write, point)
+
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item):
@@ -47,13 +777,15 @@ def pytest_runtest_makereport(item):
     Pytest hook that runs after each test case.
 
     Responsibilities:
-    - Logs test results to InfluxDB (name, status, duration, UTC timestamp)
-    - Captures and saves a screenshot when a test fails
-    - Outputs the result clearly in console for visibility
+    - Reports a failure in a quarantined flaky step as xfailed (status 'quarantined')
+    - Queues test results for InfluxDB (name, status, duration, UTC timestamp, worker id, browser)
+    - Captures a screenshot, the DOM and the console log when a test fails and queues their
+      compression and content-addressed storage under artifacts/ (see utils.artifacts)
+    - Logs where the failure artifacts went
 
     This hook helps with:
     - Monitoring test stability in Grafana
-    - Debugging UI failures with screenshots
+    - Debugging UI failures with screenshots, DOM snapshots and console logs
 
     Trigger: Runs after the 'call' phase of every test function.
 
@@ -63,26 +795,61 @@ def pytest_runtest_makereport(item):
 
     if report.when == "call":
         test_name = item.name
+        failed = report.failed
         status = "passed" if report.passed else "failed"
+        reason = _quarantine_reason(item) if failed else None
+        if reason:
+            logger.warning("🧯 %s xfailed, %s", item.nodeid, reason)
+            report.outcome = "skipped"
+            report.wasxfail = reason
+            status = "quarantined"
         duration = getattr(report, 'duration', 0)
         timestamp = datetime.now(timezone.utc)
+        worker_id = get_worker_id()
+        tags = {"worker_id": worker_id}
+        if get_browser(item):
+            tags["browser"] = get_browser(item)
 
-        try:
-            insert_test_result_to_influxdb(
-                test_name=test_name,
-                status=status,
-                duration=duration,
-                timestamp=timestamp
-            )
-            print(f"✅ InfluxDB write: {test_name} | {status} | {duration}s")
-        except Exception as e:
-            print(f"❌ InfluxDB error: {e}")
+        worker = item.config.stash[telemetry_worker_key]
+        worker.submit(
+            item.config.stash[influxdb_writer_key].write_test_result,
+            test_name=test_name,
+            status=status,
+            duration=duration,
+            timestamp=timestamp,
+            tags=tags
+        )
 
-        if status == "failed":
+        if failed:
             driver = item.funcargs.get("driver", None)
             if driver:
-                screenshot_dir = "screenshots"
-                os.makedirs(screenshot_dir, exist_ok=True)
-                screenshot_path = os.path.join(screenshot_dir, f"{test_name}.png")
-                driver.save_screenshot(screenshot_path)
-                print(f"🖼 Screenshot saved: {screenshot_path}")
+                # WebDriver is not thread-safe: grab raw data here, compress and write in the background
+                artifacts = _capture_failure_artifacts(driver)
+                worker.submit(item.config.stash[artifact_store_key].store_failure, test_name, worker_id,
+                              timestamp, browser=get_browser(item), **artifacts)
+                logger.info("🖼 Failure artifacts queued: %s", ", ".join(sorted(artifacts)))
+
+
+def _capture_failure_artifacts(driver):
+    """
+    Reads the screenshot, page source, console log and URL of a failed test's session.
+    Every item is optional: a dead session still yields whatever could be read.
+
+    """
+    readers = {
+        "screenshot": driver.get_screenshot_as_png,
+        "dom": lambda: driver.page_source,
+        "url": lambda: driver.current_url,
+        # Only Chromium exposes the console through the logging API
+        "console": lambda: driver.get_log("browser") if hasattr(driver, "execute_cdp_cmd") else None,
+    }
+    artifacts = {}
+    for name, read in readers.items():
+        try:
+            value = read()
+        except Exception as e:
+            logger.error("❌ Could not capture %s: %s", name, e)
+            continue
+        if value:
+            artifacts[name] = value
+    return artifacts
@@ -0,0 +1,87 @@
+import gzip
+import json
+import struct
+import zlib
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import artifacts
+from utils.artifacts import ArtifactStore, optimize_png
+
+
+def _png(width=64, height=64, level=1):
+    """
+    Builds a gray-gradient RGB PNG compressed at a low zlib level, with a text chunk.
+
+    """
+    def chunk(chunk_type, body):
+        return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+    rows = b"".join(b"\x00" + bytes((x * 4) % 256 for x in range(width) for _ in range(3)) for _ in range(height))
+    return (artifacts.PNG_SIGNATURE
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"tEXt", b"Software\x00chromedriver")
+            + chunk(b"IDAT", zlib.compress(rows, level))
+            + chunk(b"IEND", b""))
+
+
+def _pixels(png):
+    pos, idat = 8, b""
+    while pos < len(png):
+        length, = struct.unpack(">I", png[pos:pos + 4])
+        if png[pos + 4:pos + 8] == b"IDAT":
+            idat += png[pos + 8:pos + 8 + length]
+        pos += 12 + length
+    return zlib.decompress(idat)
+
+
+class TestOptimizePng:
+
+    def test_smaller_with_identical_pixels(self):
+        original = _png()
+        optimized = optimize_png(original)
+
+        assert len(optimized) < len(original)
+        assert _pixels(optimized) == _pixels(original)
+        assert b"tEXt" not in optimized
+
+    def test_non_png_is_returned_unchanged(self):
+        assert optimize_png(b"not a png") == b"not a png"
+
+
+class TestArtifactStore:
+
+    def test_identical_failures_share_objects(self, tmp_path):
+        store = ArtifactStore(str(tmp_path), image_format="png")
+        now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+        first = store.store_failure("test_a[chrome]", "gw0", now, screenshot=_png(), dom="<html></html>",
+                                    console=[{"level": "SEVERE", "message": "boom"}], url="https://useinsider.com")
+        second = store.store_failure("test_a[chrome]", "gw0", now.replace(second=5), screenshot=_png(),
+                                     dom="<html></html>")
+
+        assert first != second
+        manifests = [json.load(open(path)) for path in (first, second)]
+        assert manifests[0]["artifacts"]["screenshot"] == manifests[1]["artifacts"]["screenshot"]
+        assert manifests[0]["artifacts"]["screenshot"].endswith(".png")
+        assert manifests[0]["url"] == "https://useinsider.com"
+        assert "console" not in manifests[1]["artifacts"]
+        assert store.stats["objects"] == 3
+        assert store.stats["deduplicated"] == 2
+
+        with gzip.open(tmp_path / manifests[0]["artifacts"]["dom"]) as f:
+            assert f.read() == b"<html></html>"
+
+    def test_webp_needs_pillow(self, monkeypatch):
+        monkeypatch.setattr(artifacts, "Image", None)
+
+        with pytest.raises(ValueError):
+            ArtifactStore(image_format="webp")
+
+    def test_webp_when_pillow_is_installed(self, tmp_path):
+        pytest.importorskip("PIL")
+        store = ArtifactStore(str(tmp_path))
+        path = store.store_failure("test_a", "main", datetime.now(timezone.utc), screenshot=_png())
+
+        assert json.load(open(path))["artifacts"]["screenshot"].endswith(".webp")
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from pages.async_qa_careers_page import AsyncQACareersPage
+from utils.async_webdriver import ELEMENT_KEY, AsyncWebDriver, AsyncWebElement, run_flows
+from utils.tracing import Tracer
+
+
+class _WebDriverHandler(BaseHTTPRequestHandler):
+    """
+    Minimal W3C WebDriver server: navigations take `server.latency` seconds, unknown
+    elements raise "no such element" and scripts echo their arguments.
+
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        server.commands.append((method, self.path, body))
+        status, value = 200, None
+        parts = self.path.strip("/").split("/")
+        command = "/".join(parts[2:])
+
+        if self.path == "/session":
+            with server.lock:
+                server.sessions += 1
+                value = {"sessionId": f"s{server.sessions}", "capabilities": {"browserName": "fake"}}
+        elif command == "url" and method == "POST":
+            with server.lock:
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+            time.sleep(server.latency)
+            with server.lock:
+                server.active -= 1
+            server.urls[parts[1]] = body["url"]
+        elif command == "url":
+            value = server.urls.get(parts[1], "about:blank")
+        elif command == "timeouts" and method == "GET":
+            value = {"implicit": 0, "pageLoad": 300000, "script": 30000}
+        elif command == "title":
+            value = "Insider Careers"
+        elif command == "element":
+            if body["value"] == "#missing":
+                status, value = 404, {"error": "no such element", "message": "#missing", "stacktrace": ""}
+            else:
+                value = {ELEMENT_KEY: "e1"}
+        elif command == "execute/sync":
+            value = body["args"]
+        elif command == "execute/async":
+            value = {"index": 0, "value": {ELEMENT_KEY: "card"}, "costs": [0.1]}
+
+        payload = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webdriver_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WebDriverHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.commands, server.urls = [], {}
+    server.sessions = server.active = server.peak = 0
+    server.latency = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncWebDriver:
+
+    def test_session_commands_round_trip(self, webdriver_server):
+        async def scenario():
+            driver = await AsyncWebDriver.start(webdriver_server.url, {"browserName": "fake"})
+            await driver.get("https://useinsider.com/careers/")
+            element = await driver.find_element(By.ID, "careers")
+            echoed = await driver.execute_script("return arguments;", element, [element], 3)
+            with pytest.raises(NoSuchElementException):
+                await driver.find_element(By.CSS_SELECTOR, "#missing")
+            result = (driver.session_id, await driver.title(), await driver.current_url(), echoed)
+            await driver.quit()
+            return result
+
+        session_id, title, url, echoed = asyncio.run(scenario())
+
+        assert (session_id, title, url) == ("s1", "Insider Careers", "https://useinsider.com/careers/")
+        assert echoed == [AsyncWebElement(None, "e1"), [AsyncWebElement(None, "e1")], 3]
+        commands = webdriver_server.commands
+        assert ("POST", "/session/s1/element", {"using": "css selector", "value": '[id="careers"]'}) in commands
+        assert commands[-1] == ("DELETE", "/session/s1", None)
+
+    def test_async_page_waits_in_page(self, webdriver_server):
+        async def scenario():
+            driver = await AsyncWebDriver.start(webdriver_server.url, {})
+            page = AsyncQACareersPage(driver)
+            card = await page.wait_for_element(page.JOB_CARD)
+            await driver.quit()
+            return card, page.waiter.stats
+
+        card, stats = asyncio.run(scenario())
+
+        assert card == AsyncWebElement(None, "card")
+        assert stats["async_waits"] == 1 and stats["polls"] == 0
+
+    def test_flows_run_concurrently_in_their_own_sessions(self, webdriver_server):
+        webdriver_server.latency = 0.2
+
+        async def flow(driver):
+            page = AsyncQACareersPage(driver)
+            await driver.get("https://useinsider.com/careers/quality-assurance/")
+            return await page.is_accessible()
+
+        async def broken(driver):
+            raise AssertionError("listing is empty")
+
+        async def scenario():
+            flows = {f"flow{i}": flow for i in range(6)}
+            flows["broken"] = broken
+            return await run_flows(flows, webdriver_server.url, {}, concurrency=4)
+
+        tracer = Tracer("test").activate()
+        started = time.perf_counter()
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            tracer.deactivate()
+
+        assert time.perf_counter() - started < 6 * 0.2
+        assert webdriver_server.peak > 1 and webdriver_server.sessions == 7
+        assert all(results[f"flow{i}"].ok for i in range(6))
+        assert isinstance(results["broken"].error, AssertionError)
+        assert len([span for span in tracer.spans if span.name == "AsyncQACareersPage.is_accessible"]) == 6
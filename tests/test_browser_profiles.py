@@ -0,0 +1,103 @@
+import pytest
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from pages.home_page import HomePage
+from utils.browser_profiles import (CONSENT_COOKIE_NAME, CONSENT_COOKIES, LEAN_FIREFOX_PREFS,
+                                    get_browser_profile, seed_consent_cookies)
+
+
+class _CdpDriver:
+
+    def __init__(self):
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+
+class _PlainDriver:
+    """
+    Stand-in for a non-Chromium session: cookies only for the current document.
+
+    """
+
+    def __init__(self, cookies=None):
+        self.url = None
+        self.cookies = dict(cookies or {})
+
+    def get(self, url):
+        self.url = url
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie["name"]] = cookie
+
+    def get_cookie(self, name):
+        return self.cookies.get(name)
+
+
+class TestBrowserProfiles:
+
+    def test_fast_chrome_profile(self):
+        options = ChromeOptions()
+        get_browser_profile("fast").configure_chrome(options)
+
+        assert options.page_load_strategy == "eager"
+        assert "--headless=new" in options.arguments
+        assert "--disable-background-networking" in options.arguments
+        assert "--disable-component-update" in options.arguments
+
+    def test_default_profile_keeps_browser_defaults(self):
+        options = FirefoxOptions()
+        get_browser_profile("default").configure_firefox(options)
+
+        assert options.page_load_strategy == "normal"
+        assert options.arguments == []
+        assert not set(LEAN_FIREFOX_PREFS) & set(options.preferences)
+
+    def test_lean_firefox_profile(self):
+        options = FirefoxOptions()
+        get_browser_profile("lean").configure_firefox(options)
+
+        assert "-headless" in options.arguments
+        assert options.preferences["extensions.update.enabled"] is False
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_browser_profile("turbo")
+
+
+class TestConsentPreset:
+
+    def test_chrome_sets_cookies_through_cdp(self):
+        driver = _CdpDriver()
+        seed_consent_cookies(driver)
+
+        (command, params), = driver.cdp
+        assert command == "Network.setCookies"
+        assert [c["name"] for c in params["cookies"]] == [c["name"] for c in CONSENT_COOKIES]
+        assert params["cookies"][0]["domain"] == ".useinsider.com"
+
+    def test_consent_follows_a_plain_http_site_url(self):
+        driver = _CdpDriver()
+        seed_consent_cookies(driver, "http://127.0.0.1:8000")
+
+        (command, params), = driver.cdp
+        assert params["cookies"][0]["url"] == "http://127.0.0.1:8000/"
+        assert "domain" not in params["cookies"][0]
+
+        driver = _PlainDriver()
+        seed_consent_cookies(driver, "http://127.0.0.1:8000")
+        assert driver.url == "http://127.0.0.1:8000/robots.txt"
+
+    def test_other_browsers_load_a_same_site_page_first(self):
+        driver = _PlainDriver()
+        seed_consent_cookies(driver)
+
+        assert driver.url == "https://useinsider.com/robots.txt"
+        assert CONSENT_COOKIE_NAME in driver.cookies
+
+    def test_accept_cookies_is_skipped_when_consent_is_preset(self):
+        driver = _PlainDriver({CONSENT_COOKIE_NAME: {"name": CONSENT_COOKIE_NAME, "value": "yes"}})
+
+        HomePage(driver).accept_cookies()  # would wait for the banner if it had to click it
@@ -0,0 +1,128 @@
+from selenium.common.exceptions import WebDriverException
+
+from utils.checkpoints import CheckpointStore, READ_STORAGE_JS, capture_checkpoint, restore_checkpoint, resume
+
+
+class _PlainDriver:
+    """
+    Stand-in for a non-Chromium session: cookies only for the current document.
+
+    """
+
+    def __init__(self, url="about:blank", cookies=(), storage=None):
+        self.current_url = url
+        self.visited = []
+        self.cookies = list(cookies)
+        self.storage = dict(storage or {})
+
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if script == READ_STORAGE_JS:
+            return dict(self.storage)
+        self.storage.update(args[0])
+
+
+class _CdpDriver(_PlainDriver):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+
+class _Page:
+
+    def __init__(self, driver, usable=True):
+        self.driver = driver
+        self.usable = usable
+        self.states = []
+
+    def apply_checkpoint_state(self, state):
+        self.states.append(state)
+        if isinstance(self.usable, Exception):
+            raise self.usable
+        return self.usable
+
+
+URL = "https://useinsider.com/careers/open-positions/?department=qualityassurance"
+COOKIES = [
+    {"name": "viewed_cookie_policy", "value": "yes", "domain": ".useinsider.com", "path": "/", "expiry": 2000000000},
+    {"name": "lever", "value": "x", "domain": "jobs.lever.co", "path": "/"},
+]
+
+
+class TestRestoreCheckpoint:
+
+    def test_chrome_sets_cookies_through_cdp_before_loading_the_page(self):
+        checkpoint = capture_checkpoint(_PlainDriver(URL, COOKIES, {"filters": "qa"}), "jobs", {"location": "Istanbul"})
+        driver = _CdpDriver()
+        restore_checkpoint(driver, checkpoint)
+
+        [(command, params)] = driver.cdp
+        assert command == "Network.setCookies"
+        assert params["cookies"][0]["expires"] == 2000000000
+        assert "expiry" not in params["cookies"][0]
+        assert driver.visited == ["https://useinsider.com/robots.txt", URL]
+        assert driver.storage == {"filters": "qa"}
+        assert checkpoint.state == {"location": "Istanbul"}
+
+    def test_other_browsers_only_get_cookies_of_the_site(self):
+        driver = _PlainDriver()
+        restore_checkpoint(driver, capture_checkpoint(_PlainDriver(URL, COOKIES), "jobs"))
+
+        assert [cookie["name"] for cookie in driver.cookies] == ["viewed_cookie_policy"]
+        assert "domain" not in driver.cookies[0]
+        assert driver.visited == ["https://useinsider.com/robots.txt", URL]
+
+
+class TestResume:
+
+    def test_resumes_saved_checkpoint(self):
+        store = CheckpointStore()
+        store.save(capture_checkpoint(_PlainDriver(URL), "jobs", {"location": "Istanbul"}))
+        page = _Page(_CdpDriver())
+
+        assert resume(page, store, "jobs")
+        assert page.states == [{"location": "Istanbul"}]
+        assert page.driver.current_url == URL
+        assert store.stats == {"saved": 1, "restored": 1, "missed": 0, "failed": 0}
+
+    def test_unusable_checkpoint_is_discarded(self):
+        store = CheckpointStore()
+        store.save(capture_checkpoint(_PlainDriver(URL), "jobs"))
+
+        assert not resume(_Page(_CdpDriver(), usable=WebDriverException("gone")), store, "jobs")
+        assert store.get("jobs") is None
+        assert not resume(_Page(_CdpDriver()), store, "jobs")
+        assert (store.stats["failed"], store.stats["missed"]) == (1, 1)
+
+    def test_expired_or_disabled_checkpoints_are_not_used(self):
+        store = CheckpointStore(max_age=60)
+        checkpoint = capture_checkpoint(_PlainDriver(URL), "jobs")
+        checkpoint.created -= 120
+        store.save(checkpoint)
+
+        assert store.get("jobs") is None
+        assert not resume(_Page(_CdpDriver()), None, "jobs")
+
+    def test_checkpoints_are_only_resumed_by_the_browser_and_profile_that_saved_them(self):
+        store = CheckpointStore()
+        chrome = store.scope("chrome", "default")
+        chrome.save(capture_checkpoint(_PlainDriver(URL), "jobs"))
+
+        assert not resume(_Page(_PlainDriver()), store.scope("firefox", "default"), "jobs")
+        assert not resume(_Page(_CdpDriver()), store.scope("chrome", "lean"), "jobs")
+        assert chrome.get("jobs") is not None
+        assert resume(_Page(_CdpDriver()), store.scope("chrome", "default"), "jobs")
+        assert store.stats == {"saved": 1, "restored": 1, "missed": 2, "failed": 0}
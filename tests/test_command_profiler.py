@@ -0,0 +1,61 @@
+from utils.command_profiler import CommandProfile, CommandProfiler, bucket_index
+from utils.tracing import Tracer
+
+
+class TestCommandProfile:
+
+    def test_attributes_commands_to_the_open_step(self):
+        profile = CommandProfile("test_demo")
+        tracer = Tracer("test_demo").activate()
+        try:
+            profile.on_command("get", 0.2, {"url": "https://useinsider.com"}, {"value": None})
+            span = tracer.start_span("HomePage.open")
+            profile.on_command("findElements", 0.01, {"using": "css selector", "value": "a"}, {"value": []})
+            profile.on_command("findElements", 0.01)
+            tracer.end_span(span)
+        finally:
+            tracer.deactivate()
+
+        assert profile.round_trips == 3
+        assert profile.by_step() == {"(no step)": 1, "HomePage.open": 2}
+        assert profile.commands[0]["request_bytes"] == len('{"url": "https://useinsider.com"}')
+        assert profile.commands[2]["response_bytes"] == 0
+
+    def test_counts_round_trips_without_measuring_payloads_unless_detailed(self, monkeypatch):
+        def payload_size(payload):
+            raise AssertionError("payload serialized")
+
+        monkeypatch.setattr("utils.command_profiler._payload_size", payload_size)
+        profile = CommandProfile("test_demo", detailed=False)
+        profile.on_command("executeScript", 0.01, {"script": "return 1;", "args": []}, {"value": 1})
+        profile.on_command("findElements", 0.01)
+
+        assert profile.round_trips == 2
+        assert profile.by_step() == {"(no step)": 2}
+        assert profile.commands == []
+
+
+class TestCommandProfiler:
+
+    def test_bucket_index(self):
+        assert [bucket_index(ms) for ms in (0.5, 5, 99, 2499, 10000)] == [0, 1, 4, 8, 9]
+
+    def test_aggregates_tests_into_top_rows_and_histograms(self):
+        profiler = CommandProfiler()
+        for ms in ((3, 40), (4, 300)):
+            profile = CommandProfile("test")
+            profile.on_command("findElements", ms[0] / 1000)
+            profile.on_command("executeScript", ms[1] / 1000)
+            profiler.add(profile)
+
+        endpoints = profiler.top_endpoints()
+        assert [row["command"] for row in endpoints] == ["executeScript", "findElements"]
+        assert endpoints[0]["calls"] == 2
+        assert endpoints[0]["max_ms"] == 300
+        assert endpoints[0]["histogram"][bucket_index(40)] == endpoints[0]["histogram"][bucket_index(300)] == 1
+        assert profiler.top_steps(1)[0]["step"] == "(no step)"
+
+        report = profiler.format_report(n=1)
+        assert report[0].startswith("📡 WebDriver commands (2 tests)")
+        assert any("executeScript latency" in line for line in report)
+        assert not any("findElements latency" in line for line in report)
@@ -0,0 +1,117 @@
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from database_controller import InfluxDBBatchWriter
+
+
+class _InfluxStandIn(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the InfluxDB 1.x HTTP write endpoint.
+    Records every /write request body as a list of line-protocol lines.
+
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        url = urlparse(self.path)
+        self.server.connections.add(self.client_address)
+        if self.server.fail_writes:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if url.path == "/write":
+            self.server.writes.append({
+                "db": parse_qs(url.query).get("db", [None])[0],
+                "lines": body.strip().splitlines(),
+            })
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def influx_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _InfluxStandIn)
+    server.writes = []
+    server.connections = set()
+    server.fail_writes = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _writer(server, **kwargs):
+    return InfluxDBBatchWriter(host="127.0.0.1", port=server.server_address[1], **kwargs)
+
+
+class TestInfluxDBBatchWriter:
+
+    def test_flushes_when_batch_size_is_reached(self, influx_server):
+        writer = _writer(influx_server, batch_size=3, flush_interval=3600)
+        now = datetime.now(timezone.utc)
+
+        for i in range(7):
+            writer.write_test_result(f"test_{i}", "passed", 1.5, now)
+
+        assert [len(w["lines"]) for w in influx_server.writes] == [3, 3]
+        assert writer.summary()["pending"] == 1
+
+        writer.close()
+        assert [len(w["lines"]) for w in influx_server.writes] == [3, 3, 1]
+        assert influx_server.writes[0]["db"] == "test_results"
+        assert influx_server.writes[0]["lines"][0].startswith("ui_test_results,status=passed,test_name=test_0")
+
+    def test_reuses_a_single_connection(self, influx_server):
+        writer = _writer(influx_server, batch_size=1, flush_interval=3600)
+        now = datetime.now(timezone.utc)
+
+        for i in range(5):
+            writer.write_test_result(f"test_{i}", "passed", 0.1, now)
+        writer.close()
+
+        assert len(influx_server.writes) == 5
+        assert len(influx_server.connections) == 1
+
+    def test_flushes_after_interval(self, influx_server):
+        writer = _writer(influx_server, batch_size=1000, flush_interval=0)
+        writer.write_test_result("test_a", "failed", 2.0, datetime.now(timezone.utc))
+
+        assert len(influx_server.writes) == 1
+        writer.close()
+
+    def test_counts_failed_flushes_without_raising(self, influx_server):
+        influx_server.fail_writes = True
+        writer = _writer(influx_server, batch_size=2, flush_interval=3600)
+        now = datetime.now(timezone.utc)
+
+        writer.write_test_result("test_a", "passed", 1.0, now)
+        writer.write_test_result("test_b", "passed", 1.0, now)
+        writer.close()
+
+        summary = writer.summary()
+        assert summary["failed_flushes"] == 1
+        assert summary["points_failed"] == 2
+        assert summary["points_written"] == 0
+
+    def test_reports_throughput(self, influx_server):
+        writer = _writer(influx_server, batch_size=10, flush_interval=3600)
+        now = datetime.now(timezone.utc)
+        for i in range(20):
+            writer.write_test_result(f"test_{i}", "passed", 0.5, now)
+        writer.close()
+
+        summary = writer.summary()
+        assert summary["flushes"] == 2
+        assert summary["points_written"] == 20
+        assert summary["points_per_flush_second"] > 0
@@ -0,0 +1,195 @@
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from utils.driver_pool import DriverPool
+
+
+class _FakeSwitchTo:
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current = handle
+
+
+class _FakeDriver:
+    """
+    Stand-in for a WebDriver session that records the reset commands it receives.
+    Every window has its own URL; storage and cookies are kept per origin.
+
+    """
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.switch_to = _FakeSwitchTo(self)
+        self.cookies_cleared = 0
+        self.urls = {"main": "https://useinsider.com"}
+        self.storage = {}
+        self.visited = []
+        self.dead = False
+        self.quit_called = False
+
+    @property
+    def current_window_handle(self):
+        if self.dead:
+            raise WebDriverException("session deleted")
+        return self.current
+
+    @property
+    def current_url(self):
+        return self.urls[self.current]
+
+    @property
+    def url(self):
+        return self.current_url
+
+    def _origin(self):
+        parts = urlsplit(self.current_url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def execute(self, command, params=None):
+        if command == Command.GET:
+            self.urls[self.current] = params["url"]
+            self.visited.append(params["url"])
+
+    def execute_script(self, script):
+        self.storage.pop(self._origin(), None)
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _FakeChromeDriver(_FakeDriver):
+
+    def __init__(self):
+        super().__init__()
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+
+class TestDriverPool:
+
+    def test_reuses_released_session(self):
+        created = []
+        pool = DriverPool(lambda browser: created.append(_FakeDriver()) or created[-1])
+
+        first = pool.acquire("chrome")
+        pool.release(first)
+        second = pool.acquire("chrome")
+
+        assert first is second
+        assert len(created) == 1
+        assert pool.summary()["reused"] == 1
+
+    def test_keys_sessions_by_browser_and_options(self):
+        pool = DriverPool(lambda browser, **options: _FakeDriver())
+
+        chrome = pool.acquire("chrome")
+        pool.release(chrome)
+
+        assert pool.acquire("firefox") is not chrome
+        assert pool.acquire("chrome", headless=True) is not chrome
+        assert pool.acquire("chrome") is chrome
+
+    def test_release_resets_tabs_cookies_and_url(self):
+        pool = DriverPool(lambda browser: _FakeDriver())
+        driver = pool.acquire("firefox")
+        driver.window_handles.append("lever")
+        driver.current = "lever"
+        driver.urls["lever"] = "https://jobs.lever.co/useinsider/1"
+
+        pool.release(driver)
+
+        assert driver.window_handles == ["main"]
+        assert driver.current == "main"
+        assert driver.cookies_cleared == 2
+        assert driver.url == "about:blank"
+
+    def test_release_clears_storage_of_every_origin_the_test_visited(self):
+        pool = DriverPool(lambda browser: _FakeDriver())
+        driver = pool.acquire("firefox")
+        driver.get("https://consent.example.com/accept")
+        driver.storage = {"https://consent.example.com": {"consent": "yes"}, "https://useinsider.com": {"f": "qa"}}
+        driver.get("https://useinsider.com/careers/")
+        driver.window_handles.append("lever")
+        driver.urls["lever"] = "https://jobs.lever.co/useinsider/1"
+        driver.storage["https://jobs.lever.co"] = {"lever": "x"}
+
+        pool.release(driver)
+
+        assert driver.storage == {}
+        assert driver.cookies_cleared == 3
+        assert driver.visited[-3:] == ["https://consent.example.com/robots.txt", "https://jobs.lever.co/robots.txt",
+                                       "about:blank"]
+
+    def test_chrome_clears_each_origin_through_cdp_without_navigating(self):
+        pool = DriverPool(lambda browser: _FakeChromeDriver())
+        driver = pool.acquire("chrome")
+        driver.get("https://useinsider.com/careers/")
+        driver.window_handles.append("lever")
+        driver.urls["lever"] = "https://jobs.lever.co/useinsider/1"
+
+        pool.release(driver)
+
+        cleared = [params["origin"] for command, params in driver.cdp if command == "Storage.clearDataForOrigin"]
+        assert cleared == ["https://useinsider.com", "https://jobs.lever.co"]
+        assert driver.cdp[-1] == ("Network.clearBrowserCookies", {})
+        assert driver.visited == ["https://useinsider.com/careers/", "about:blank"]
+
+    def test_origins_visited_before_the_lease_are_not_cleared_again(self):
+        pool = DriverPool(lambda browser: _FakeChromeDriver())
+        driver = pool.acquire("chrome")
+        driver.get("https://consent.example.com/")
+        pool.release(driver)
+        driver.cdp.clear()
+
+        assert pool.acquire("chrome") is driver
+        pool.release(driver)
+
+        assert [command for command, _ in driver.cdp] == ["Network.clearBrowserCookies"]
+
+    def test_rebuilds_session_that_fails_health_check(self):
+        pool = DriverPool(lambda browser: _FakeDriver())
+        first = pool.acquire("chrome")
+        pool.release(first)
+        first.dead = True
+
+        second = pool.acquire("chrome")
+
+        assert second is not first
+        assert first.quit_called
+        assert pool.summary()["rebuilt"] == 1
+
+    def test_release_without_reuse_quits_session(self):
+        pool = DriverPool(lambda browser: _FakeDriver())
+        driver = pool.acquire("chrome")
+
+        pool.release(driver, reuse=False)
+
+        assert driver.quit_called
+        assert pool.acquire("chrome") is not driver
+
+    def test_close_quits_idle_and_leased_sessions(self):
+        pool = DriverPool(lambda browser: _FakeDriver())
+        idle = pool.acquire("chrome")
+        leased = pool.acquire("chrome")
+        pool.release(idle)
+
+        pool.close()
+
+        assert idle.quit_called and leased.quit_called
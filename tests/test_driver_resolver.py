@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from utils.driver_resolver import DriverResolver, is_compatible, parse_version
+
+
+def _executable(path, version_output, log):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"#!/bin/sh\necho {path} >> {log}\necho '{version_output}'\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+@pytest.fixture
+def machine(tmp_path, monkeypatch):
+    """
+    Fake machine: Chrome 124 on PATH, a 123 chromedriver on PATH and a 124 one in the webdriver-manager cache.
+
+    """
+    home, bin_dir, log = tmp_path / "home", tmp_path / "bin", tmp_path / "calls.log"
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("PATH", f"{bin_dir}:/bin:/usr/bin")
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    paths = {
+        "chrome": _executable(str(bin_dir / "google-chrome"), "Google Chrome 124.0.6367.91", log),
+        "old_driver": _executable(str(bin_dir / "chromedriver"), "ChromeDriver 123.0.6312.86 (abc)", log),
+        "driver": _executable(str(home / ".wdm/drivers/chromedriver/linux64/124.0.6367.91/chromedriver"),
+                              "ChromeDriver 124.0.6367.91 (def)", log),
+    }
+    paths["cache"] = str(tmp_path / "drivers.json")
+    paths["log"] = log
+    return paths
+
+
+def _no_download(browser):
+    raise AssertionError("must not download")
+
+
+class TestDriverResolver:
+
+    def test_picks_the_driver_matching_the_browser_major(self, machine):
+        resolver = DriverResolver(cache_path=machine["cache"], offline=True)
+
+        assert resolver.resolve("chrome") == machine["driver"]
+
+    def test_later_sessions_use_the_disk_cache_without_running_binaries(self, machine, monkeypatch):
+        DriverResolver(cache_path=machine["cache"], offline=True).resolve("chrome")
+        machine["log"].write_text("")
+
+        resolver = DriverResolver(cache_path=machine["cache"])
+        monkeypatch.setattr(resolver, "_download", _no_download)
+        assert resolver.resolve("chrome") == machine["driver"]
+        assert resolver.resolve("chrome") == machine["driver"]
+        assert machine["log"].read_text() == ""
+
+    def test_browser_update_invalidates_the_cache(self, machine):
+        DriverResolver(cache_path=machine["cache"], offline=True).resolve("chrome")
+        _executable(machine["chrome"], "Google Chrome 123.0.6312.58", machine["log"])
+        os.utime(machine["chrome"], (1, 1))
+
+        assert DriverResolver(cache_path=machine["cache"], offline=True).resolve("chrome") == machine["old_driver"]
+
+    def test_expired_entries_are_resolved_again(self, machine):
+        DriverResolver(cache_path=machine["cache"], offline=True).resolve("chrome")
+        machine["log"].write_text("")
+
+        DriverResolver(cache_path=machine["cache"], ttl=0, offline=True).resolve("chrome")
+        assert machine["log"].read_text()
+
+    def test_offline_without_a_local_driver_leaves_lookup_to_selenium(self, machine, monkeypatch):
+        resolver = DriverResolver(cache_path=machine["cache"], offline=True)
+        monkeypatch.setattr(resolver, "_download", _no_download)
+
+        assert resolver.resolve("firefox") is None
+
+    def test_environment_pin_wins(self, machine, monkeypatch):
+        monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/chromedriver")
+
+        assert DriverResolver(cache_path=machine["cache"]).resolve("chrome") == "/opt/chromedriver"
+
+
+class TestCompatibility:
+
+    def test_versions(self):
+        assert parse_version("geckodriver 0.34.0 (c44f0d09630a 2024-01-02)") == (0, 34, 0)
+        assert is_compatible("firefox", (0, 34, 0), (125, 0))
+        assert not is_compatible("firefox", (0, 34, 0), (102, 0))
+        assert not is_compatible("chrome", (123, 0), (124, 0))
+        assert is_compatible("chrome", None, (124, 0))
@@ -0,0 +1,125 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import urllib3
+
+from utils.http_archive import ArchiveProxy, HttpArchive, archive_key
+
+
+class _Origin(BaseHTTPRequestHandler):
+    """
+    Stand-in origin server that counts hits and answers with the hit number.
+
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.hits += 1
+        body = f"{self.path} #{self.server.hits}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+    server.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(proxy, url, **kwargs):
+    address = f"http://{proxy.address}"
+    return requests.get(url, proxies={"http": address, "https": address}, timeout=5, **kwargs)
+
+
+class TestArchiveKey:
+
+    def test_ignores_volatile_params_and_param_order(self):
+        assert archive_key("get", "https://Example.com/a?b=2&a=1&_=123") == "GET https://example.com/a?a=1&b=2"
+
+    def test_request_body_is_part_of_the_key(self):
+        assert archive_key("POST", "http://x/", b"one") != archive_key("POST", "http://x/", b"two")
+
+
+class TestArchiveProxy:
+
+    def test_records_then_replays_without_the_origin(self, origin, tmp_path):
+        url = f"http://127.0.0.1:{origin.server_address[1]}/jobs?cb=1"
+        recorder = ArchiveProxy(HttpArchive(str(tmp_path)), mode="record").start()
+        assert _get(recorder, url).text == "/jobs?cb=1 #1"
+        assert _get(recorder, url).text == "/jobs?cb=1 #2"
+        recorder.stop()
+
+        origin.shutdown()
+        replayer = ArchiveProxy(HttpArchive(str(tmp_path)), mode="replay").start()
+        try:
+            responses = [_get(replayer, url.replace("cb=1", "cb=2")).text for _ in range(3)]
+        finally:
+            replayer.stop()
+
+        assert responses == ["/jobs?cb=1 #1", "/jobs?cb=1 #2", "/jobs?cb=1 #2"]
+        assert replayer.stats == {"requests": 3, "misses": 0, "errors": 0}
+
+    def test_recording_again_replaces_the_responses_of_a_url(self, origin, tmp_path):
+        url = f"http://127.0.0.1:{origin.server_address[1]}/jobs"
+        for _ in range(2):
+            recorder = ArchiveProxy(HttpArchive(str(tmp_path)), mode="record").start()
+            _get(recorder, url)
+            recorder.reset_occurrences()
+            _get(recorder, url)
+            recorder.stop()
+
+        archive = HttpArchive(str(tmp_path))
+        assert len(archive.entries[archive_key("GET", url)]) == 1
+        assert archive.get(archive_key("GET", url))[3] == b"/jobs #4"
+
+    def test_occurrences_are_counted_per_test(self, tmp_path):
+        archive = HttpArchive(str(tmp_path))
+        key = archive_key("GET", "http://127.0.0.1:9/jobs")
+        for body in (b"first", b"second"):
+            archive.add(key, 200, "OK", [], body)
+        proxy = ArchiveProxy(archive, mode="replay").start()
+        try:
+            earlier_test = [_get(proxy, "http://127.0.0.1:9/jobs").text for _ in range(2)]
+            proxy.reset_occurrences()
+            next_test = _get(proxy, "http://127.0.0.1:9/jobs").text
+        finally:
+            proxy.stop()
+
+        assert earlier_test == ["first", "second"]
+        assert next_test == "first"
+
+    def test_unknown_request_is_a_504_in_replay(self, tmp_path):
+        proxy = ArchiveProxy(HttpArchive(str(tmp_path)), mode="replay").start()
+        try:
+            response = _get(proxy, "http://127.0.0.1:9/missing")
+        finally:
+            proxy.stop()
+
+        assert response.status_code == 504
+        assert proxy.stats["misses"] == 1
+
+    def test_replays_https_through_connect(self, tmp_path):
+        archive = HttpArchive(str(tmp_path))
+        archive.add(archive_key("GET", "https://useinsider.com/careers/"), 200, "OK",
+                    [("Content-Type", "text/html")], b"<h1>Careers</h1>")
+        proxy = ArchiveProxy(archive, mode="replay").start()
+        try:
+            with pytest.warns(urllib3.exceptions.InsecureRequestWarning):
+                response = _get(proxy, "https://useinsider.com/careers/", verify=False)
+        finally:
+            proxy.stop()
+
+        assert response.status_code == 200
+        assert response.text == "<h1>Careers</h1>"
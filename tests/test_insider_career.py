@@ -6,6 +6,9 @@ import pytest
 from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.qa_careers_page import QACareersPage
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 """ Test case is:
 
@@ -29,39 +32,94 @@ class TestInsiderCareer:
         self.careers_page = CareersPage(driver)
         self.qa_careers_page = QACareersPage(driver)
 
-    def test_insider_career_page(self):
+    @pytest.mark.perf_budget(steps={
+        "QACareersPage.select_location_if_department_is_qa": None,
+        "QACareersPage.wait_for_job_cards_to_be_replaced": None,
+        "QACareersPage.verify_view_role_redirects": None,
+    })
+    def test_insider_career_page(self, flow_checkpoints):
         """
         E2E test to verify QA jobs in Istanbul are visible and accessible.
+        Walks the full navigation path and, once the listing and the redirection are verified,
+        saves the filtered listing as a checkpoint.
 
         """
-        print("🚀 Opening homepage...")
-        self.home_page.open()
-        assert self.home_page.is_accessible()
+        self.open_filtered_qa_jobs()
 
-        print("✅ Accepting cookies...")
-        self.home_page.accept_cookies()
+        logger.info("✅ Verifying listings...")
+        assert self.qa_careers_page.verify_job_listings()
 
-        print("✅ Navigating to careers...")
-        self.home_page.navigate_to_careers()
-        assert self.careers_page.is_accessible()
-        assert self.careers_page.verify_sections()
+        logger.info("✅ Verifying 'View Role' redirection...")
+        assert self.qa_careers_page.verify_view_role_redirects()
 
-        print("✅ Navigating to QA Careers...")
-        self.careers_page.go_to_qa_careers()
-        assert self.qa_careers_page.is_accessible()
+        # Back from the Lever tab to the verified listing
+        self.qa_careers_page.close_other_windows()
+        self.qa_careers_page.save_checkpoint(flow_checkpoints, QACareersPage.FILTERED_JOBS_CHECKPOINT,
+                                             location="Istanbul, Turkiye")
 
-        print("✅ Clicking 'See all QA jobs'...")
-        self.qa_careers_page.click_see_all_qa_jobs()
+        logger.info("🎉 Test completed! ✅")
 
-        print("✅ Filtering jobs...")
-        self.qa_careers_page.select_location_if_department_is_qa()
-        self.qa_careers_page.wait_for_job_cards_to_be_replaced()
-        self.qa_careers_page.wait_for_job_cards_to_load()
+    def test_view_role_links_point_to_lever(self, flow_checkpoints):
+        """
+        Resumes at the filtered QA listing (steps 1-6 are covered by test_insider_career_page)
+        and checks every 'View Role' link targets a Lever posting that resolves, in bulk over HTTP.
 
-        print("✅ Verifying listings...")
-        assert self.qa_careers_page.verify_job_listings()
+        """
+        if not self.qa_careers_page.resume_from_checkpoint(flow_checkpoints, QACareersPage.FILTERED_JOBS_CHECKPOINT):
+            self.open_filtered_qa_jobs()
 
-        print("✅ Verifying 'View Role' redirection...")
-        assert self.qa_careers_page.verify_view_role_redirects()
+        links = self.qa_careers_page.get_view_role_links()
+        assert links
+        assert all("lever.co" in link["href"] for link in links)
+        assert self.qa_careers_page.verify_view_role_links()
 
-        print("🎉 Test completed! ✅")
+    def test_independent_flows_share_one_browser(self, browser_flows):
+        """
+        Walks steps 1-6 twice at once in separate windows of one browser (own browser
+        contexts on Chrome): one flow verifies the listing, the other every 'View Role' link.
+
+        """
+        results = browser_flows.run({
+            "listing": lambda driver: self.open_filtered_qa_jobs(driver).verify_job_listings(),
+            "view_role_links": lambda driver: self.open_filtered_qa_jobs(driver).verify_view_role_links(),
+        })
+        assert all(result.ok for result in results.values()), results
+
+    def open_filtered_qa_jobs(self, driver=None):
+        """
+        Steps 1-6: home page to the QA job listing filtered by Istanbul.
+
+        :param driver: Optional driver of another flow (see browser_flows); defaults to the test's pages
+        :return: The QA careers page showing the filtered listing
+        :rtype: QACareersPage
+
+        """
+        if driver is None:
+            home_page, careers_page, qa_careers_page = self.home_page, self.careers_page, self.qa_careers_page
+        else:
+            home_page, careers_page, qa_careers_page = HomePage(driver), CareersPage(driver), QACareersPage(driver)
+
+        logger.info("🚀 Opening homepage...")
+        home_page.open()
+        assert home_page.is_accessible()
+
+        logger.info("✅ Accepting cookies...")
+        home_page.accept_cookies()
+
+        logger.info("✅ Navigating to careers...")
+        home_page.navigate_to_careers()
+        assert careers_page.is_accessible()
+        assert careers_page.verify_sections()
+
+        logger.info("✅ Navigating to QA Careers...")
+        careers_page.go_to_qa_careers()
+        assert qa_careers_page.is_accessible()
+
+        logger.info("✅ Clicking 'See all QA jobs'...")
+        qa_careers_page.click_see_all_qa_jobs()
+
+        logger.info("✅ Filtering jobs...")
+        assert qa_careers_page.select_location_if_department_is_qa()
+        qa_careers_page.wait_for_job_cards_to_be_replaced()
+        qa_careers_page.wait_for_job_cards_to_load()
+        return qa_careers_page
@@ -0,0 +1,163 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pages.qa_careers_page import QACareersPage
+from utils.dom_extract import VERIFY_JS
+from utils.link_check import check_links, resolve_link
+from utils.stand_in_site import StandInSite
+
+
+class _NoHeadHandler(BaseHTTPRequestHandler):
+    """
+    Redirects /moved to /job and rejects HEAD, like servers that only implement GET.
+
+    """
+
+    def do_HEAD(self):
+        self.send_response(405)
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == "/moved":
+            self.send_response(302)
+            self.send_header("Location", "/job")
+        else:
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+        self.end_headers()
+        if self.path != "/moved":
+            self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _RedirectHandler(BaseHTTPRequestHandler):
+    """
+    Redirects /moved to /job for any method and records the requests it receives.
+
+    """
+
+    def do_HEAD(self):
+        self._respond()
+
+    def do_GET(self):
+        self._respond()
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.path))
+        if self.path == "/moved":
+            self.send_response(301)
+            self.send_header("Location", "/job")
+        else:
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        if self.command == "GET" and self.path != "/moved":
+            self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def site():
+    site = StandInSite(jobs=60, filter_latency=0).start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture
+def no_head_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _NoHeadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redirect_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RedirectHandler)
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestCheckLinks:
+
+    def test_resolves_links_concurrently_once_per_url(self, site):
+        urls = [f"{site.url}/jobs.lever.co/useinsider/{job['id']}" for job in site.jobs[:20]]
+        requests_before = site.stats["requests"]
+
+        results = check_links(urls + urls[:5] + [f"{site.url}/jobs.lever.co/useinsider/unknown"], concurrency=8)
+
+        assert [result.url for result in results[:20]] == urls
+        assert all(result.ok and result.status == 200 for result in results[:20])
+        assert (results[-1].status, results[-1].ok) == (404, False)
+        assert site.stats["requests"] - requests_before == 21
+
+    def test_falls_back_to_get_and_follows_redirects(self, no_head_server):
+        result = resolve_link(f"{no_head_server}/moved")
+
+        assert (result.status, result.final_url) == (200, f"{no_head_server}/job")
+
+    def test_redirects_of_a_head_request_are_followed_with_head(self, redirect_server):
+        result = resolve_link(f"{redirect_server.url}/moved")
+
+        assert (result.status, result.final_url) == (200, f"{redirect_server.url}/job")
+        assert redirect_server.requests == [("HEAD", "/moved"), ("HEAD", "/job")]
+
+    def test_connection_errors_are_reported_not_raised(self):
+        result = resolve_link("http://127.0.0.1:9/", timeout=2)
+
+        assert not result.ok
+        assert result.status is None and result.error
+        assert check_links([]) == []
+
+
+class _Driver:
+
+    def __init__(self, report):
+        self.report = report
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.report
+
+
+class TestVerifyJobListings:
+
+    REPORT = {
+        "total": 3,
+        "mismatched": 2,
+        "failures": {"department contains Quality Assurance": 2},
+        "mismatches": [{"index": 1, "position": "Backend Engineer", "department": "Software Development",
+                        "location": "Istanbul, Turkiye", "href": None,
+                        "failed_rules": ["department contains Quality Assurance"]}],
+    }
+
+    def test_rules_are_evaluated_in_page(self):
+        driver = _Driver(self.REPORT)
+        page = QACareersPage(driver)
+
+        assert page.check_job_listings(max_mismatches=1) == self.REPORT
+        [(script, (payload, root))] = driver.calls
+        assert script == VERIFY_JS and root is None
+        assert payload["rules"] == [list(rule) for rule in QACareersPage.QA_ISTANBUL_RULES]
+        assert payload["max_mismatches"] == 1
+        assert set(payload["fields"]) == {"position", "department", "location", "href"}
+
+    def test_strict_mode_fails_on_any_mismatch(self):
+        page = QACareersPage(_Driver(self.REPORT))
+
+        assert page.verify_job_listings()
+        assert not page.verify_job_listings(strict=True)
+        assert QACareersPage(_Driver(dict(self.REPORT, mismatched=0, mismatches=[]))).verify_job_listings(strict=True)
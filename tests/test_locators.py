@@ -0,0 +1,57 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.locators import LocatorRegistry
+
+
+class _FakeWaiter:
+    """
+    Stand-in EventWaiter that matches the first strategy whose value is in `present`
+    and records the strategy order it was asked to evaluate.
+
+    """
+
+    def __init__(self, present):
+        self.present = present
+        self.calls = []
+
+    def until_any(self, condition, strategies, expected=None, timeout=15):
+        self.calls.append([value for _, value in strategies])
+        for position, (_, value) in enumerate(strategies):
+            if value in self.present:
+                return position, f"element:{value}", [1.0] * len(strategies)
+        raise TimeoutException(condition)
+
+
+class TestLocatorRegistry:
+
+    def test_caches_the_strategy_that_matched(self):
+        registry = LocatorRegistry()
+        locator = registry.register("Page.button", (By.CSS_SELECTOR, "#fast"), (By.XPATH, "//slow"))
+        waiter = _FakeWaiter(present={"//slow"})
+
+        assert registry.resolve(waiter, "present", locator) == "element://slow"
+        registry.resolve(waiter, "present", locator)
+
+        assert waiter.calls == [["#fast", "//slow"], ["//slow", "#fast"]]
+        assert registry.ordered(locator) == [1, 0]
+
+    def test_reports_lookups_and_misses_per_strategy(self):
+        registry = LocatorRegistry()
+        locator = registry.register("Page.link", (By.ID, "link"))
+
+        registry.resolve(_FakeWaiter(present={"link"}), "clickable", locator)
+        with pytest.raises(TimeoutException):
+            registry.resolve(_FakeWaiter(present=set()), "clickable", locator, timeout=0)
+
+        [row] = registry.report()
+        assert (row["name"], row["lookups"], row["misses"], row["preferred"]) == ("Page.link", 2, 1, True)
+        assert row["query_ms"] == 1.0
+
+    def test_rejects_duplicate_names(self):
+        registry = LocatorRegistry()
+        registry.register("Page.link", (By.ID, "link"))
+
+        with pytest.raises(ValueError):
+            registry.register("Page.link", (By.ID, "other"))
@@ -0,0 +1,107 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+from utils.logger import (ContextFilter, JsonFormatter, configure_logging, get_logger, log_context,
+                          shutdown_logging)
+from utils.tracing import Tracer
+
+
+class _Expensive:
+
+    def __init__(self):
+        self.rendered = 0
+
+    def __str__(self):
+        self.rendered += 1
+        return "expensive"
+
+
+@pytest.fixture
+def json_log(tmp_path, pytestconfig):
+    path = tmp_path / "ui.jsonl"
+    yield path
+    configure_logging(level=pytestconfig.getoption("ui_log_level"), json_path=pytestconfig.getoption("log_json"))
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestJsonFormatter:
+
+    def test_includes_context_extra_fields_and_exception(self):
+        record = logging.LogRecord("insider_ui.pages", logging.ERROR, __file__, 1, "Job %d: %s", (3, "QA"), None)
+        record.browser = "chrome"
+        record.fields = {"cards": 12}
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["msg"] == "Job 3: QA"
+        assert entry["level"] == "ERROR"
+        assert entry["browser"] == "chrome"
+        assert entry["cards"] == 12
+        assert "ValueError: boom" in entry["exc"]
+        assert "test_id" not in entry
+
+
+class TestContextFilter:
+
+    def test_adds_bound_fields_and_current_step(self):
+        tracer = Tracer("test").activate()
+        record = logging.LogRecord("insider_ui", logging.INFO, __file__, 1, "msg", None, None)
+        try:
+            span = tracer.start_span("QACareersPage.filter_jobs")
+            with log_context(test_id="t::a", browser="firefox"):
+                ContextFilter().filter(record)
+            tracer.end_span(span)
+        finally:
+            tracer.deactivate()
+
+        assert (record.test_id, record.browser, record.step) == ("t::a", "firefox", "QACareersPage.filter_jobs")
+
+
+class TestConfigureLogging:
+
+    def test_writes_json_lines_and_skips_disabled_levels_without_formatting(self, json_log):
+        configure_logging(level="INFO", json_path=str(json_log))
+        logger = get_logger("pages.qa_careers_page")
+        value = _Expensive()
+        with log_context(test_id="t::b", worker_id="gw1"):
+            logger.debug("📋 Job %d: %s", 1, value)
+            logger.info("🎯 Total valid jobs: %d", 4)
+        shutdown_logging()
+
+        assert value.rendered == 0
+        [entry] = _read(json_log)
+        assert entry["msg"] == "🎯 Total valid jobs: 4"
+        assert entry["logger"] == "insider_ui.pages.qa_careers_page"
+        assert (entry["test_id"], entry["worker_id"]) == ("t::b", "gw1")
+
+    def test_full_queue_drops_records_instead_of_blocking(self, json_log, monkeypatch):
+        release = threading.Event()
+        original = JsonFormatter.format
+
+        def slow_format(self, record):
+            release.wait(5)
+            return original(self, record)
+
+        monkeypatch.setattr(JsonFormatter, "format", slow_format)
+        configure_logging(level="INFO", json_path=str(json_log), queue_size=2)
+        logger = get_logger("test")
+        started = time.perf_counter()
+        for i in range(50):
+            logger.info("record %d", i)
+        elapsed = time.perf_counter() - started
+        release.set()
+        shutdown_logging()
+
+        assert elapsed < 1
+        assert 1 <= len(_read(json_log)) < 50
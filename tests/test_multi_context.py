@@ -0,0 +1,265 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from pages.base_page import BasePage
+from utils.multi_context import FlowScheduler
+from utils.page_metrics import PageMetricsCollector, measure_navigation
+from utils.tracing import Tracer, add_command_listener, remove_command_listener, traced
+
+
+class _SwitchTo:
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        assert handle in self._driver.windows, handle
+        self._driver.current_window_handle = handle
+        self._driver.switches += 1
+
+    def new_window(self, type_hint=None):
+        self._driver.current_window_handle = self._driver.open_window()
+
+
+class _SessionDriver:
+    """
+    Stand-in for one browser session with several windows; records the window every
+    navigation ran in.
+
+    """
+
+    def __init__(self):
+        self.windows = {}
+        self._next = 0
+        self.current_window_handle = self.open_window()
+        self.switch_to = _SwitchTo(self)
+        self.switches = 0
+        self.visits = []
+        self.element_commands = []
+        self.scripts = []
+        self._busy = threading.Lock()
+
+    def open_window(self, context=None):
+        handle = f"w{self._next}"
+        self._next += 1
+        self.windows[handle] = {"url": "about:blank", "context": context}
+        return handle
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_url(self):
+        return self.windows[self.current_window_handle]["url"]
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    def find_element(self, by, value):
+        return WebElement(self, f"{self.current_window_handle}/{value}")
+
+    def find_elements(self, by, value):
+        return [self.find_element(by, value)]
+
+    def execute_async_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": script, "args": list(args)})["value"]
+
+    def execute(self, command, params=None):
+        # A session handles one command at a time
+        assert self._busy.acquire(blocking=False), "concurrent WebDriver commands"
+        try:
+            window = self.windows[self.current_window_handle]
+            if command == Command.GET:
+                window["url"] = params["url"]
+                self.visits.append((self.current_window_handle, params["url"]))
+                return {"value": None}
+            if command == Command.W3C_EXECUTE_SCRIPT_ASYNC:
+                # Page metrics of the document the window shows
+                self.scripts.append((self.current_window_handle, window["url"]))
+                return {"value": {"time_origin": len(self.scripts), "load_ms": 1.0}}
+            # Element ids carry the window they were found in
+            self.element_commands.append((self.current_window_handle, command, params["id"]))
+            return {"value": params["id"].split("/", 1)[1] if command == Command.GET_ELEMENT_TEXT else None}
+        finally:
+            self._busy.release()
+
+    def close(self):
+        del self.windows[self.current_window_handle]
+        self.current_window_handle = None
+
+    def execute_script(self, script, *args):
+        return None
+
+
+class _ChromeSessionDriver(_SessionDriver):
+
+    def __init__(self):
+        super().__init__()
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+        if command == "Target.createBrowserContext":
+            return {"browserContextId": f"ctx{len(self.cdp)}"}
+        if command == "Target.createTarget":
+            return {"targetId": self.open_window(params["browserContextId"])}
+        if command == "Target.disposeBrowserContext":
+            for handle in [h for h, w in self.windows.items() if w["context"] == params["browserContextId"]]:
+                del self.windows[handle]
+        return {}
+
+
+class _FlowPage(BasePage):
+
+    @traced("FlowPage.visit")
+    def visit(self, url):
+        self.driver.get(url)
+
+    @traced("FlowPage.open")
+    @measure_navigation("flow_page")
+    def open(self, url):
+        self.driver.get(url)
+
+
+class TestWindowBoundDriver:
+
+    def test_commands_run_in_the_flow_window_switching_only_when_needed(self):
+        driver = _SessionDriver()
+        scheduler = FlowScheduler(driver, isolation="tabs")
+        first, second = scheduler.open_flow("first"), scheduler.open_flow("second")
+
+        first.get("https://a/1")
+        first.get("https://a/2")
+        second.get("https://b/1")
+
+        assert driver.visits == [(first.handle, "https://a/1"), (first.handle, "https://a/2"), (second.handle, "https://b/1")]
+        assert scheduler.switches == 2
+        assert first.current_url == "https://a/2"
+        assert scheduler.switches == 3
+
+    def test_flows_only_see_and_claim_their_own_windows(self):
+        driver = _SessionDriver()
+        scheduler = FlowScheduler(driver, isolation="tabs")
+        first, second = scheduler.open_flow("first"), scheduler.open_flow("second")
+        opened = driver.open_window()
+
+        assert first.window_handles == [first.main_handle, opened]
+        first.switch_to.window(opened)
+        assert second.window_handles == [second.main_handle]
+        with pytest.raises(WebDriverException):
+            second.switch_to.window(opened)
+
+        BasePage(first).close_other_windows()
+        assert opened not in driver.windows
+        assert (first.handle, second.handle) == (first.main_handle, second.main_handle)
+        with pytest.raises(WebDriverException):
+            first.quit()
+
+
+    def test_element_commands_run_in_the_window_the_element_belongs_to(self):
+        driver = _SessionDriver()
+        scheduler = FlowScheduler(driver, isolation="tabs")
+        first, second = scheduler.open_flow("first"), scheduler.open_flow("second")
+
+        button = first.find_element("css selector", "#apply")
+        links = second.find_elements("css selector", "#role")
+        button.click()
+        links[0].click()
+        texts = (button.text, links[0].text)
+
+        assert texts == ("#apply", "#role")
+        assert button.parent is first and links[0].parent is second
+        assert [(window, element) for window, _, element in driver.element_commands] == [
+            (first.handle, f"{first.handle}/#apply"), (second.handle, f"{second.handle}/#role"),
+            (first.handle, f"{first.handle}/#apply"), (second.handle, f"{second.handle}/#role"),
+        ]
+
+
+class TestFlowScheduler:
+
+    def test_uses_browser_contexts_on_chromium_and_disposes_them(self):
+        driver = _ChromeSessionDriver()
+        scheduler = FlowScheduler(driver)
+        flow = scheduler.open_flow("listing")
+
+        assert driver.windows[flow.handle]["context"] == "ctx1"
+        assert scheduler.stats == {"contexts": 1, "tabs": 0}
+        scheduler.close()
+        assert list(driver.windows) == ["w0"]
+        assert driver.cdp[-1] == ("Target.disposeBrowserContext", {"browserContextId": "ctx1"})
+        assert driver.current_window_handle == "w0"
+
+    def test_contexts_need_chromium(self):
+        with pytest.raises(WebDriverException):
+            FlowScheduler(_SessionDriver(), isolation="contexts").open_flow("listing")
+        with pytest.raises(ValueError):
+            FlowScheduler(_SessionDriver(), isolation="incognito")
+
+    def test_runs_flows_concurrently_in_their_own_windows(self):
+        driver = _SessionDriver()
+        prepared = []
+        scheduler = FlowScheduler(driver, prepare=lambda flow_driver: prepared.append(flow_driver.name))
+        started = threading.Barrier(2, timeout=5)
+
+        def flow(name):
+            def run(flow_driver):
+                started.wait()
+                page = _FlowPage(flow_driver)
+                for i in range(20):
+                    page.visit(f"https://{name}/{i}")
+                return flow_driver.current_url
+            return run
+
+        def broken(flow_driver):
+            raise AssertionError("listing is empty")
+
+        tracer = Tracer("test").activate()
+        try:
+            results = scheduler.run({"a": flow("a"), "b": flow("b"), "broken": broken})
+        finally:
+            tracer.deactivate()
+
+        assert prepared == ["a", "b", "broken"]
+        assert (results["a"].value, results["b"].value) == ("https://a/19", "https://b/19")
+        assert results["a"].ok and not results["broken"].ok
+        assert isinstance(results["broken"].error, AssertionError)
+        handles = {name: scheduler.flows[name].main_handle for name in ("a", "b")}
+        assert all(handle == handles[url.split("/")[2]] for handle, url in driver.visits)
+        assert len([span for span in tracer.spans if span.name == "FlowPage.visit"]) == 40
+
+    def test_flows_collect_page_metrics_and_count_commands_in_their_own_windows(self):
+        driver = _SessionDriver()
+        scheduler = FlowScheduler(driver, isolation="tabs")
+        started = threading.Barrier(2, timeout=5)
+
+        def flow(name):
+            def run(flow_driver):
+                started.wait()
+                page = _FlowPage(flow_driver)
+                for i in range(10):
+                    page.open(f"https://{name}/{i}")
+            return run
+
+        tracer = Tracer("test")
+        add_command_listener(driver, tracer.on_command)
+        tracer.activate()
+        collector = PageMetricsCollector(driver).activate()
+        try:
+            results = scheduler.run({"a": flow("a"), "b": flow("b")})
+        finally:
+            collector.deactivate()
+            tracer.deactivate()
+            remove_command_listener(driver, tracer.on_command)
+
+        assert all(result.ok for result in results.values()), results
+        handles = {name: scheduler.flows[name].main_handle for name in ("a", "b")}
+        assert len(driver.scripts) == len(collector.records) == 20
+        assert all(handle == handles[url.split("/")[2]] for handle, url in driver.scripts)
+        opens = [span for span in tracer.spans if span.name == "FlowPage.open"]
+        assert len(opens) == 20 and all(span.driver_calls == 2 for span in opens)
+        assert tracer.commands == []
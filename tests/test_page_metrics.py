@@ -0,0 +1,78 @@
+from selenium.common.exceptions import JavascriptException
+
+from utils.page_metrics import PageMetricsCollector, measure_navigation
+
+
+class _FakeDriver:
+    """
+    Stand-in WebDriver answering the collect script with one scripted result per call.
+
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _metrics(origin, url="https://useinsider.com/"):
+    return {"url": url, "time_origin": origin, "navigation_type": "navigate", "load_ms": 900.0, "lcp_ms": None}
+
+
+class _Page:
+
+    def __init__(self, log):
+        self.log = log
+
+    @measure_navigation("home")
+    def open(self):
+        self.log.append("open")
+
+
+class TestPageMetricsCollector:
+
+    def test_waits_for_a_new_document_between_steps(self):
+        driver = _FakeDriver(_metrics(1000.5), _metrics(2000.5, "https://useinsider.com/careers/"))
+        collector = PageMetricsCollector(driver, timeout=3)
+
+        collector.collect("home")
+        collector.collect("careers")
+
+        assert driver.calls == [(None, 3000), (1000.5, 3000)]
+        assert [(r["step"], r["url"]) for r in collector.records] == [
+            ("home", "https://useinsider.com/"), ("careers", "https://useinsider.com/careers/")]
+        assert "time_origin" not in collector.records[0]
+
+    def test_retries_when_navigation_interrupts_the_script(self):
+        driver = _FakeDriver(JavascriptException("document unloaded while waiting for result"), _metrics(1.0))
+        collector = PageMetricsCollector(driver)
+
+        assert collector.collect("careers")["step"] == "careers"
+        assert len(driver.calls) == 2
+
+    def test_missing_metrics_are_not_recorded(self):
+        collector = PageMetricsCollector(_FakeDriver(None))
+
+        assert collector.collect("lever_job") is None
+        assert collector.records == []
+
+    def test_decorated_steps_collect_only_while_active(self):
+        log = []
+        collector = PageMetricsCollector(_FakeDriver(_metrics(1.0)))
+
+        _Page(log).open()
+        collector.activate()
+        try:
+            _Page(log).open()
+        finally:
+            collector.deactivate()
+        _Page(log).open()
+
+        assert log == ["open"] * 3
+        assert [r["step"] for r in collector.records] == ["home"]
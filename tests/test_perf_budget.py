@@ -0,0 +1,107 @@
+import pytest
+
+from utils.perf_budget import FileBaselineStore, PerfBudget, percentile, slowest_step_durations
+from utils.tracing import Span
+
+
+class _Store:
+
+    def __init__(self, history=None, error=None):
+        self._history = history or []
+        self.error = error
+        self.queries = []
+
+    def history(self, name, browser, runs, kind="test", test=None):
+        self.queries.append((name, kind, test))
+        if self.error:
+            raise self.error
+        return self._history[-runs:]
+
+
+class TestPercentile:
+
+    def test_interpolates_between_samples(self):
+        assert percentile([1, 2, 3, 4, 5], 50) == 3
+        assert percentile([10, 20], 95) == pytest.approx(19.5)
+        assert percentile([], 95) is None
+
+
+class TestFileBaselineStore:
+
+    def test_save_merges_with_other_writers_and_caps_history(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        first, second = FileBaselineStore(path, keep=3), FileBaselineStore(path, keep=3)
+        first.record("step", "chrome", 1.0)
+        first.record("step", "chrome", 2.0)
+        second.record("step", "chrome", 3.0)
+        second.record("step", "firefox", 9.0)
+        first.save()
+        second.save()
+
+        store = FileBaselineStore(path, keep=3)
+        assert store.history("step", "chrome", runs=10) == [1.0, 2.0, 3.0]
+        assert store.history("step", "firefox", runs=10) == [9.0]
+
+        store.record("step", "chrome", 4.0)
+        store.save()
+        assert FileBaselineStore(path).history("step", "chrome", runs=2) == [3.0, 4.0]
+
+    def test_step_history_is_kept_per_test(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        store = FileBaselineStore(path)
+        store.record("A.step", "chrome", 1.0, test="test_once")
+        store.record("A.step", "chrome", 5.0, test="test_twice")
+        store.save()
+
+        store = FileBaselineStore(path)
+        assert store.history("A.step", "chrome", runs=10, kind="step", test="test_once") == [1.0]
+        assert store.history("A.step", "chrome", runs=10, kind="step", test="test_twice") == [5.0]
+
+
+class TestPerfBudget:
+
+    def test_explicit_budget(self):
+        budget = PerfBudget([], mode="fail")
+
+        assert budget.check("test_a", 2.5, budget=2)["exceeded"]
+        assert not budget.check("test_a", 1.5, budget=2)["exceeded"]
+
+    def test_baseline_needs_min_runs(self):
+        budget = PerfBudget([_Store([1.0] * 4)], min_runs=5)
+
+        assert budget.check("test_a", 100) is None
+
+    def test_regression_over_baseline_p95(self):
+        budget = PerfBudget([_Store([1.0] * 19 + [2.0])], runs=20, threshold=0.2)
+
+        result = budget.check("step", 2.0, kind="step")
+        assert result["limit"] == pytest.approx(percentile([1.0] * 19 + [2.0], 95) * 1.2)
+        assert result["exceeded"]
+        assert "p95 of 20 runs (_Store)" in result["source"]
+
+    def test_unavailable_store_falls_back_and_is_skipped_afterwards(self):
+        broken = _Store(error=ConnectionError("influx down"))
+        budget = PerfBudget([broken, _Store([1.0] * 5)])
+
+        assert not budget.check("test_a", 1.0)["exceeded"]
+        assert budget.check("test_a", 5.0)["exceeded"]
+        assert len(broken.queries) == 1
+
+    def test_step_baselines_are_looked_up_for_the_test_the_step_ran_in(self):
+        store = _Store([1.0] * 5)
+
+        PerfBudget([store]).check("A.step", 1.0, browser="chrome", kind="step", test="test_a[chrome]")
+
+        assert store.queries == [("A.step", "step", "test_a[chrome]")]
+
+
+class TestSlowestStepDurations:
+
+    def test_uses_the_slowest_passing_call(self):
+        spans = []
+        for name, duration, failed in (("A.step", 1.0, False), ("A.step", 3.0, False), ("A.other", 9.0, True)):
+            span = Span(name, "action", None, 0, 0.0)
+            span.duration, span.failed = duration, failed
+            spans.append(span)
+
+        assert slowest_step_durations(spans) == {"A.step": 3.0}
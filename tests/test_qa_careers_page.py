@@ -0,0 +1,174 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.timeouts import Timeouts
+
+from pages.qa_careers_page import QACareersPage
+from utils.dom_extract import EXTRACT_JS, SCROLL_PAST_JS, failed_rules
+
+
+def _card(job_id, department="Quality Assurance", location="Istanbul, Turkiye", with_id=True):
+    return {
+        "id": job_id if with_id else None,
+        "position": "QA Automation Engineer" if department == "Quality Assurance" else "Backend Engineer",
+        "department": department,
+        "location": location,
+        "href": f"https://jobs.lever.co/useinsider/{job_id}",
+    }
+
+
+class _LazyListDriver:
+    """
+    Stand-in driver for a lazy-loaded listing: `page_size` cards are rendered, and scrolling
+    past the last card renders the next page. A `virtual` listing keeps only `page_size`
+    card nodes and moves that window instead, like a virtualized list recycling its nodes.
+
+    """
+
+    def __init__(self, cards, page_size, virtual=False):
+        self.cards = cards
+        self.page_size = page_size
+        self.virtual = virtual
+        self.start, self.end = 0, min(page_size, len(cards))
+        self.scrolled_to = None
+        self.extracted = 0
+        self.scrolls = 0
+
+    def _unseen(self, fields, values):
+        return [card for card in self.cards[self.start:self.end]
+                if not any(card[field] is not None and str(card[field]) in values for field in fields)]
+
+    def execute_script(self, script, *args):
+        if script == EXTRACT_JS:
+            name, spec = next(iter(args[0].items()))
+            if "load-more" in spec["strategies"][0][1]:
+                return {name: []}
+            exclude = spec["exclude"] or {"fields": [], "values": []}
+            records = self._unseen(exclude["fields"], set(exclude["values"]))
+            records = records[spec["offset"]:spec["offset"] + spec["limit"]]
+            self.extracted += len(records)
+            return {name: [dict(record) for record in records]}
+        assert script == SCROLL_PAST_JS
+        self.scrolls += 1
+        # The last card only moves to the top if cards were rendered below it since the last scroll
+        moved, self.scrolled_to = self.scrolled_to != self.end, self.end
+        if self.virtual:
+            self.start = self.end - 1
+            self.end = min(self.start + self.page_size, len(self.cards))
+        else:
+            self.end = min(self.end + self.page_size, len(self.cards))
+        return moved
+
+    @property
+    def timeouts(self):
+        return Timeouts(script=30)
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        kind, strategies, expected = args[:3]
+        assert kind == "unseen"
+        fields = ["id" if field == "attr:data-job-id" else "href" for field in expected["fields"]]
+        unseen = len(self._unseen(fields, set(expected["values"])))
+        return {"index": 0, "value": unseen, "costs": [0.1]} if unseen else None
+
+
+class TestIterJobCards:
+
+    def test_reads_rendered_cards_in_chunks_and_loads_more_on_scroll(self):
+        driver = _LazyListDriver([_card(str(i)) for i in range(25)], page_size=10)
+
+        cards = list(QACareersPage(driver).iter_job_cards(chunk_size=4, load_timeout=1))
+
+        assert [card["id"] for card in cards] == [str(i) for i in range(25)]
+        assert driver.extracted == 25
+        # The last scroll finds the listing at its end
+        assert driver.scrolls == 4
+
+    def test_reads_virtualized_listings_that_recycle_their_nodes(self):
+        driver = _LazyListDriver([_card(str(i)) for i in range(120)], page_size=10, virtual=True)
+
+        cards = list(QACareersPage(driver).iter_job_cards(chunk_size=4, load_timeout=1))
+
+        assert [card["id"] for card in cards] == [str(i) for i in range(120)]
+        assert driver.extracted == 120
+        assert (driver.start, driver.end) == (119, 120)
+
+    def test_dedupes_by_job_id_or_href(self):
+        cards = [_card("1"), _card("2", with_id=False), _card("1"), _card("2")]
+        driver = _LazyListDriver(cards, page_size=10)
+
+        assert [card["id"] for card in QACareersPage(driver).iter_job_cards(load_timeout=1)] == ["1", "2"]
+
+    def test_stops_reading_when_closed_early(self):
+        driver = _LazyListDriver([_card(str(i)) for i in range(1000)], page_size=50)
+        cards = QACareersPage(driver).iter_job_cards(chunk_size=20)
+
+        assert next(cards)["id"] == "0"
+        cards.close()
+        assert (driver.extracted, driver.scrolls) == (20, 0)
+
+
+class _EmptyPageDriver:
+
+    def find_element(self, by, value):
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        return []
+
+
+class TestSelectLocation:
+
+    def test_every_attempt_waits_the_attempt_timeout_not_the_page_timeout(self, monkeypatch):
+        monkeypatch.setattr("utils.retry._overrides", {"backoff": 0})
+        page = QACareersPage(_EmptyPageDriver(), timeout=15)
+        timeouts = []
+
+        def never(condition, by, locator=None, expected=None, timeout=None):
+            timeouts.append(timeout)
+            raise TimeoutException(condition)
+
+        monkeypatch.setattr(page, "_wait", never)
+
+        assert page.select_location_if_department_is_qa() is False
+        # The department and its text per attempt; nothing waits for the page timeout
+        assert timeouts == [QACareersPage.FILTER_ATTEMPT_TIMEOUT] * 2 * 3
+
+
+class TestVerifyJobListingsIncrementally:
+
+    def test_lenient_verdict_is_known_at_the_first_valid_card(self):
+        cards = [_card("0", department="Software Development")] + [_card(str(i)) for i in range(1, 500)]
+        driver = _LazyListDriver(cards, page_size=50)
+
+        assert QACareersPage(driver).verify_job_listings_incrementally(chunk_size=10)
+        assert driver.extracted == 10
+
+    def test_strict_verdict_is_known_at_the_first_invalid_card(self):
+        cards = [_card(str(i)) for i in range(120)] + [_card("x", location="Remote")]
+        cards += [_card(f"y{i}") for i in range(500)]
+        driver = _LazyListDriver(cards, page_size=50)
+
+        assert not QACareersPage(driver).verify_job_listings_incrementally(strict=True, chunk_size=50)
+        assert driver.scrolls == 2
+
+    def test_strict_verdict_needs_cards(self):
+        assert not QACareersPage(_LazyListDriver([], page_size=10)).verify_job_listings_incrementally(strict=True)
+
+
+class TestFailedRules:
+
+    @pytest.mark.parametrize("rule, value, passed", [
+        (("department", "contains", "quality assurance"), "Quality Assurance", True),
+        (("department", "equals", "Quality Assurance"), "Quality Assurance Team", False),
+        (("position", "matches", r"quality assurance|\bqa\b"), "Software QA Tester", True),
+        (("position", "matches", r"quality assurance|\bqa\b"), "Aqa Engineer", False),
+        (("location", "not_empty", None), "  ", False),
+    ])
+    def test_mirrors_in_page_rule_check(self, rule, value, passed):
+        assert failed_rules({rule[0]: value}, [rule]) == ([] if passed else [f"{rule[0]} {rule[1]} {rule[2]}"])
+
+    def test_rejects_unknown_operators(self):
+        with pytest.raises(ValueError):
+            failed_rules({"location": "Istanbul"}, [("location", "startswith", "Ist")])
@@ -0,0 +1,60 @@
+import pytest
+
+from utils.resource_policy import RESOURCE_POLICIES, ResourcePolicy, get_resource_policy, summarize_network_events
+
+
+def _event(method, request_id, **params):
+    return {"method": method, "params": dict(requestId=request_id, **params)}
+
+
+class TestResourcePolicy:
+
+    def test_full_policy_blocks_nothing(self):
+        assert not RESOURCE_POLICIES["full"].blocks_anything
+        assert RESOURCE_POLICIES["full"].blocked_url_patterns() == []
+
+    def test_lean_policy_blocks_trackers_and_heavy_resources(self):
+        lean = get_resource_policy("lean")
+
+        patterns = lean.blocked_url_patterns()
+        assert "*googletagmanager.com*" in patterns
+        assert "*.mp4*" in patterns and "*.png*" in patterns and "*.woff2*" in patterns
+        assert lean.chrome_prefs() == {"profile.managed_default_content_settings.images": 2}
+        assert lean.firefox_prefs()["privacy.trackingprotection.enabled"] is True
+
+    def test_rejects_unknown_names(self):
+        with pytest.raises(ValueError):
+            get_resource_policy("offline")
+        with pytest.raises(ValueError):
+            ResourcePolicy("custom", resource_types=("video",))
+
+
+class TestSummarizeNetworkEvents:
+
+    def test_counts_loaded_and_blocked_requests(self):
+        events = [
+            _event("Network.requestWillBeSent", "1", type="Document"),
+            _event("Network.loadingFinished", "1", encodedDataLength=1000),
+            _event("Network.requestWillBeSent", "2", type="Image"),
+            _event("Network.loadingFinished", "2", encodedDataLength=4000),
+            _event("Network.requestWillBeSent", "3", type="Image"),
+            _event("Network.loadingFailed", "3", type="Image", blockedReason="inspector"),
+            _event("Network.requestWillBeSent", "4", type="Script"),
+            _event("Network.loadingFailed", "4", type="Script", errorText="net::ERR_ABORTED"),
+        ]
+
+        assert summarize_network_events(events) == {
+            "requests": 2,
+            "bytes": 5000,
+            "blocked_requests": 1,
+            "bytes_saved": 4000,
+        }
+
+    def test_estimates_unknown_types_from_overall_average(self):
+        events = [
+            _event("Network.requestWillBeSent", "1", type="Document"),
+            _event("Network.loadingFinished", "1", encodedDataLength=3000),
+            _event("Network.loadingFailed", "2", type="Media", blockedReason="inspector"),
+        ]
+
+        assert summarize_network_events(events)["bytes_saved"] == 3000
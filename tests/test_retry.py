@@ -0,0 +1,105 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from utils.retry import (FileFlakeStore, FlakeQuarantine, RetryPolicy, StepRetryLog, configure_retries,
+                         retry_step)
+
+
+class _Page:
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+        self.restored = 0
+
+    @retry_step(attempts=3, backoff=0, on_retry="restore")
+    def step(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def restore(self):
+        self.restored += 1
+
+
+class _Store:
+
+    def __init__(self, history=None, error=None):
+        self._history = history or []
+        self.error = error
+
+    def history(self, step, runs):
+        if self.error:
+            raise self.error
+        return self._history[-runs:]
+
+
+@pytest.fixture
+def retry_log():
+    log = StepRetryLog().activate()
+    yield log
+    log.deactivate()
+    configure_retries()
+
+
+class TestRetryStep:
+
+    def test_retries_exceptions_and_false_until_success(self, retry_log):
+        page = _Page([TimeoutException("slow"), False, "ok"])
+        assert page.step() == "ok"
+        assert (page.calls, page.restored) == (3, 2)
+        [record] = retry_log.records
+        assert (record.step, record.attempts, record.outcome) == ("_Page.step", 3, "flaky")
+
+    def test_reraises_last_error_and_records_failure(self, retry_log):
+        page = _Page([TimeoutException("a"), TimeoutException("b"), TimeoutException("c")])
+        with pytest.raises(TimeoutException, match="c"):
+            page.step()
+        assert retry_log.failed_steps() == ["_Page.step"]
+        assert "TimeoutException" in retry_log.records[0].error
+
+    def test_unlisted_exceptions_propagate_at_once(self, retry_log):
+        page = _Page([KeyError("bug"), "ok"])
+        with pytest.raises(KeyError):
+            page.step()
+        assert page.calls == 1
+
+    def test_session_override_disables_retries(self, retry_log):
+        configure_retries(attempts=1)
+        page = _Page([False, True])
+        assert page.step() is False
+        assert page.calls == 1
+        assert retry_log.records[0].outcome == "failed"
+
+    def test_backoff_grows_and_is_capped(self):
+        policy = RetryPolicy(backoff=1, factor=2, max_delay=3, jitter=0)
+        assert [policy.delay(retry) for retry in (1, 2, 3)] == [1, 2, 3]
+
+
+class TestFlakeQuarantine:
+
+    def test_quarantines_flaky_steps_but_not_broken_ones(self):
+        store = _Store()
+        quarantine = FlakeQuarantine([store], threshold=0.2, min_runs=10)
+        store._history = ["passed"] * 7 + ["flaky", "failed", "passed"]
+        assert quarantine.flake_rate("step") == (0.2, 10)
+        assert quarantine.is_quarantined("flaky_step")
+
+        store._history = ["failed"] * 10
+        assert not quarantine.is_quarantined("broken_step")
+        store._history = ["flaky"] * 3
+        assert not quarantine.is_quarantined("new_step")
+        assert quarantine.quarantined() == ["flaky_step"]
+
+    def test_unavailable_store_falls_back_to_file(self, tmp_path):
+        path = str(tmp_path / "flakes.json")
+        store = FileFlakeStore(path)
+        for outcome in ["passed"] * 5 + ["flaky"] * 5:
+            store.record("step", outcome)
+        store.save()
+
+        quarantine = FlakeQuarantine([_Store(error=ConnectionError("down")), FileFlakeStore(path)], min_runs=10)
+        assert quarantine.is_quarantined("step")
+        assert len(quarantine.stores) == 1
@@ -0,0 +1,221 @@
+import http.client
+import json
+import shutil
+import subprocess
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import pytest
+
+from utils.stand_in_site import LOCATIONS, StandInSite, generate_jobs
+
+VOID_TAGS = {"meta", "link", "br", "img", "input", "hr"}
+
+
+class _Node:
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.parent = parent
+        self.children = []
+        self.text = ""
+
+    def child(self, tag, position):
+        """XPath-like `tag[position]` step among the children with that tag."""
+        return [node for node in self.children if node.tag == tag][position - 1]
+
+    def find(self, predicate):
+        if predicate(self):
+            yield self
+        for node in self.children:
+            yield from node.find(predicate)
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.root = self.current = _Node("#document", {})
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, attrs, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS and self.current.parent is not None:
+            self.current = self.current.parent
+
+    def handle_data(self, data):
+        self.current.text += data
+
+
+# Minimal DOM for running the open-positions script under node: enough for the listing to
+# render, scroll and recycle its card nodes
+_DOM_STUB_JS = r"""
+const listeners = {}, frames = [], elements = {};
+function element() {
+  return {
+    attrs: {}, style: {}, children: [], className: '', _html: '', classList: {toggle() {}, remove() {}},
+    setAttribute(name, value) { this.attrs[name] = String(value); },
+    getAttribute(name) { return name in this.attrs ? this.attrs[name] : null; },
+    appendChild(child) { this.children.push(child); return child; },
+    addEventListener() {},
+    querySelectorAll() { return []; },
+    getBoundingClientRect() { return {top: 100 - window.scrollY}; },
+    get innerHTML() { return this._html; },
+    set innerHTML(html) {
+      this._html = html;
+      if (!html) this.children = [];
+      const match = /^<div class="([^"]*)" data-team="([^"]*)" data-location="([^"]*)" data-job-id="([^"]*)">/.exec(html);
+      if (match) {
+        const card = element();
+        card.className = match[1];
+        card.attrs = {'data-team': match[2], 'data-location': match[3], 'data-job-id': match[4]};
+        this.firstChild = card;
+      }
+    },
+  };
+}
+globalThis.window = {scrollY: 0, location: {search: ''}, addEventListener(type, fn) { listeners[type] = fn; }};
+globalThis.document = {
+  getElementById(id) { return elements[id] || (elements[id] = element()); },
+  createElement: element,
+};
+globalThis.requestAnimationFrame = fn => frames.push(fn);
+globalThis.fetch = () => Promise.resolve({json: () => JOBS});
+"""
+
+_DOM_REPORT_JS = r"""
+setTimeout(() => {
+  const list = document.getElementById('jobs-list'), nodes = list.children.slice();
+  const ids = () => list.children.map(node => node.getAttribute('data-job-id'));
+  const before = ids();
+  window.scrollY = 100 + 5 * 160;
+  listeners.scroll();
+  frames.splice(0).forEach(fn => fn());
+  const recycled = list.children.every((node, i) => node === nodes[i]);
+  console.log(JSON.stringify({before: before, after: ids(), recycled: recycled}));
+}, 10);
+"""
+
+
+@pytest.fixture(scope="module")
+def site():
+    site = StandInSite(jobs=120, filter_latency=0.2, mismatches=1).start()
+    yield site
+    site.stop()
+
+
+def _request(site, path, method="GET"):
+    connection = http.client.HTTPConnection(urlsplit(site.url).netloc, timeout=10)
+    connection.request(method, path)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def _dom(site, path):
+    builder = _TreeBuilder()
+    builder.feed(_request(site, path)[1].decode())
+    return builder.root
+
+
+def _by_id(root, element_id):
+    return next(root.find(lambda node: node.attrs.get("id") == element_id))
+
+
+class TestGenerateJobs:
+
+    def test_is_deterministic_and_always_has_qa_istanbul_jobs(self):
+        jobs = generate_jobs(10, seed=3)
+        assert jobs == generate_jobs(10, seed=3)
+        assert any(job["department"] == "Quality Assurance" and job["location"] == LOCATIONS[0] for job in jobs)
+        assert len({job["id"] for job in generate_jobs(10000)}) == 10000
+
+    def test_rejects_sizes_out_of_range(self):
+        with pytest.raises(ValueError):
+            generate_jobs(9)
+        with pytest.raises(ValueError):
+            generate_jobs(10001)
+
+    def test_mismatches_break_the_card_label_only(self):
+        broken = [job for job in generate_jobs(200, mismatches=2) if "label" in job]
+        assert len(broken) == 2
+        assert all(job["department_slug"] == "qualityassurance" and job["label"] != job["department"]
+                   for job in broken)
+
+
+class TestStandInSite:
+
+    def test_markup_matches_page_object_locators(self, site):
+        home = _dom(site, "/")
+        menu = _by_id(home, "navbarNavDropdown").child("ul", 1)
+        # HomePage.company_menu / careers_link: li[6]/a#navbarDropdownMenuLink, li[6]/div/div[2]/a[2]
+        assert menu.child("li", 6).child("a", 1).attrs["id"] == "navbarDropdownMenuLink"
+        assert len(list(home.find(lambda node: node.attrs.get("id") == "navbarDropdownMenuLink"))) == 5
+        careers_link = menu.child("li", 6).child("div", 1).child("div", 2).child("a", 2)
+        assert careers_link.attrs["href"] == "/careers/"
+        assert _by_id(home, "wt-cli-accept-all-btn")
+
+        careers = _dom(site, "/careers/")
+        location = _by_id(careers, "career-our-location").child("div", 1).child("div", 1).child("div", 1).child("div", 1)
+        assert location.text == LOCATIONS[0]
+        assert _by_id(careers, "career-find-our-calling").child("div", 1).child("div", 1).child("a", 1).text == "See all teams"
+        qa_team = next(careers.find(lambda node: node.tag == "h3" and node.text == "Quality Assurance")).parent
+        assert qa_team.child("a", 1).text == "Open Positions"
+
+        positions = _dom(site, "/careers/open-positions/?department=qualityassurance")
+        for element_id in ("select2-filter-by-department-container", "select2-filter-by-location-container", "jobs-list"):
+            assert _by_id(positions, element_id)
+        options = [node.text for node in positions.find(lambda node: "select2-results__option" in node.attrs.get("class", ""))]
+        assert "Istanbul, Turkiye" in options
+
+    def test_job_listing_is_filtered_after_the_configured_latency(self, site):
+        started = time.perf_counter()
+        response, body = _request(site, "/api/jobs?department=qualityassurance&location=istanbul-turkiye")
+        assert time.perf_counter() - started >= 0.2
+        jobs = json.loads(body)
+        assert jobs and all(job["department_slug"] == "qualityassurance" for job in jobs)
+        assert {job["location"] for job in jobs} == {"Istanbul, Turkiye"}
+        assert sum("label" in job for job in jobs) == 1
+
+    def test_lever_pages_head_requests_and_missing_paths(self, site):
+        job = site.jobs[0]
+        response, body = _request(site, f"/jobs.lever.co/useinsider/{job['id']}")
+        assert response.status == 200
+        assert job["title"] in body.decode()
+
+        response, body = _request(site, f"/jobs.lever.co/useinsider/{job['id']}", method="HEAD")
+        assert (response.status, body) == (200, b"")
+        assert int(response.getheader("Content-Length")) > 0
+
+        assert _request(site, "/jobs.lever.co/useinsider/unknown", method="HEAD")[0].status == 404
+        assert _request(site, "/nowhere")[0].status == 404
+        assert site.stats["requests"] >= 4
+
+    def test_virtual_listing_recycles_a_fixed_window_of_card_nodes(self):
+        if shutil.which("node") is None:
+            pytest.skip("node is not installed")
+        with pytest.raises(ValueError):
+            StandInSite(virtual=True)
+        site = StandInSite(jobs=60, filter_latency=0, page_size=10, virtual=True).start()
+        try:
+            page = _request(site, "/careers/open-positions/")[1].decode()
+            jobs = json.loads(_request(site, "/api/jobs?department=all&location=all")[1])
+        finally:
+            site.stop()
+        script = page[page.rindex("<script>") + len("<script>"):page.rindex("</script>")]
+        program = f"const JOBS = {json.dumps(jobs)};" + _DOM_STUB_JS + script + _DOM_REPORT_JS
+
+        report = json.loads(subprocess.run(["node", "-e", program], capture_output=True, text=True,
+                                           timeout=30, check=True).stdout)
+
+        ids = [job["id"] for job in jobs]
+        assert report["before"] == ids[:10]
+        assert report["after"] == ids[5:15]
+        assert report["recycled"]
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from utils.telemetry import TelemetryWorker, write_bytes
+
+
+def _blocked_worker(**kwargs):
+    """
+    Returns a started worker whose first job blocks until the returned event is set,
+    so the queue can be filled deterministically.
+
+    """
+    release = threading.Event()
+    started = threading.Event()
+    worker = TelemetryWorker(**kwargs).start()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    worker.submit(blocker)
+    started.wait(5)
+    return worker, release
+
+
+class TestTelemetryWorker:
+
+    def test_runs_jobs_off_the_calling_thread(self):
+        worker = TelemetryWorker().start()
+        threads = []
+
+        worker.submit(lambda: threads.append(threading.current_thread()))
+
+        assert worker.drain(timeout=5)
+        assert threads and threads[0] is not threading.current_thread()
+        assert worker.summary()["completed"] == 1
+
+    def test_drop_newest_rejects_jobs_when_full(self):
+        worker, release = _blocked_worker(maxsize=2, policy="drop_newest")
+        results = []
+
+        accepted = [worker.submit(results.append, i) for i in range(4)]
+        release.set()
+        worker.drain(timeout=5)
+
+        assert accepted == [True, True, False, False]
+        assert results == [0, 1]
+        assert worker.summary()["dropped"] == 2
+
+    def test_drop_oldest_keeps_latest_jobs(self):
+        worker, release = _blocked_worker(maxsize=2, policy="drop_oldest")
+        results = []
+
+        for i in range(4):
+            worker.submit(results.append, i)
+        release.set()
+        worker.drain(timeout=5)
+
+        assert results == [2, 3]
+        assert worker.summary()["dropped"] == 2
+
+    def test_block_policy_applies_bounded_backpressure(self):
+        worker, release = _blocked_worker(maxsize=1, policy="block", put_timeout=0.1)
+
+        assert worker.submit(lambda: None)
+        assert not worker.submit(lambda: None)
+        release.set()
+        worker.drain(timeout=5)
+
+        stats = worker.summary()
+        assert stats["dropped"] == 1
+        assert stats["blocked_seconds"] >= 0.1
+
+    def test_failing_job_does_not_stop_the_worker(self):
+        worker = TelemetryWorker().start()
+        results = []
+
+        worker.submit(lambda: 1 / 0)
+        worker.submit(results.append, "after")
+
+        assert worker.drain(timeout=5)
+        assert results == ["after"]
+        assert worker.summary()["failed"] == 1
+
+    def test_drain_runs_idle_callback_and_rejects_new_jobs(self):
+        flushed = []
+        worker = TelemetryWorker(on_idle=lambda: flushed.append(True)).start()
+
+        assert worker.drain(timeout=5)
+        assert flushed
+        assert not worker.submit(lambda: None)
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            TelemetryWorker(policy="ignore")
+
+    def test_write_bytes_creates_parent_directories(self, tmp_path):
+        path = tmp_path / "screenshots" / "test_a.png"
+
+        write_bytes(str(path), b"png")
+
+        assert path.read_bytes() == b"png"
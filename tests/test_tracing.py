@@ -0,0 +1,96 @@
+import json
+
+from pages.base_page import BasePage
+from utils.tracing import Tracer, add_command_listener, remove_command_listener
+
+
+class _FakeDriver:
+    """
+    Stand-in WebDriver whose `execute` only records the command names.
+
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, command, params=None):
+        self.sent.append(command)
+        return {"value": None}
+
+
+class _DemoPage(BasePage):
+
+    def open(self):
+        self.driver.execute("get")
+        self.wait_for_banner()
+        self.driver.execute("clickElement")
+
+    def wait_for_banner(self):
+        self.driver.execute("executeAsyncScript")
+
+    def iter_banners(self):
+        for _ in range(2):
+            self.wait_for_banner()
+            yield "banner"
+
+    def _helper(self):
+        pass
+
+
+class TestTracer:
+
+    def _run(self, driver):
+        tracer = Tracer("test_demo")
+        add_command_listener(driver, tracer.on_command)
+        tracer.activate()
+        try:
+            _DemoPage(driver).open()
+        finally:
+            tracer.deactivate()
+            remove_command_listener(driver, tracer.on_command)
+        return tracer
+
+    def test_page_methods_are_traced_with_nesting_and_driver_calls(self):
+        tracer = self._run(_FakeDriver())
+        spans = {span.name: span for span in tracer.spans}
+
+        assert set(spans) == {"_DemoPage.open", "_DemoPage.wait_for_banner"}
+        wait, open_ = spans["_DemoPage.wait_for_banner"], spans["_DemoPage.open"]
+        assert (wait.kind, wait.depth, wait.parent) == ("wait", 1, open_)
+        assert (wait.driver_calls, open_.driver_calls) == (1, 3)
+        assert open_.wait_seconds == wait.duration
+        assert open_.action_seconds == open_.duration - wait.duration
+
+    def test_untraced_calls_record_nothing(self):
+        driver = _FakeDriver()
+        tracer = self._run(driver)
+        _DemoPage(driver).open()
+
+        assert len(tracer.spans) == 2
+        assert driver.sent == ["get", "executeAsyncScript", "clickElement"] * 2
+
+    def test_generator_steps_count_toward_the_iterating_step(self):
+        tracer = Tracer("test_demo").activate()
+        try:
+            page = _DemoPage(_FakeDriver())
+            assert list(page.iter_banners()) == ["banner", "banner"]
+        finally:
+            tracer.deactivate()
+
+        assert [(span.name, span.depth) for span in tracer.spans] == [("_DemoPage.wait_for_banner", 0)] * 2
+
+    def test_steps_called_by_the_test_log_their_duration(self, caplog):
+        with caplog.at_level("INFO", logger="utils.tracing"):
+            self._run(_FakeDriver())
+
+        assert [record.getMessage().split(":")[0] for record in caplog.records] == ["⏱ _DemoPage.open"]
+
+    def test_trace_events_are_chrome_trace_format(self):
+        events = json.loads(self._run(_FakeDriver()).trace_json())["traceEvents"]
+
+        spans = [e for e in events if e.get("cat") in ("action", "wait")]
+        commands = [e["name"] for e in events if e.get("cat") == "webdriver"]
+        assert [e["name"] for e in spans] == ["_DemoPage.open", "_DemoPage.wait_for_banner"]
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in spans)
+        assert spans[1]["args"]["parent"] == "_DemoPage.open"
+        assert commands == ["get", "executeAsyncScript", "clickElement"]
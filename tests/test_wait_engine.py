@@ -0,0 +1,174 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.timeouts import Timeouts
+
+from pages.base_page import BasePage
+from utils.wait_engine import _SYNC_CHECK_JS, EventWaiter, _script_timeouts, forget_script_timeout
+
+
+def _hit(value, index=0):
+    return {"index": index, "value": value, "costs": [0.1]}
+
+
+class _ScriptedDriver:
+    """
+    Stand-in driver whose execute_async_script / execute_script results are scripted.
+    Each scripted entry is either a return value or an exception instance to raise.
+
+    """
+
+    def __init__(self, async_results=(), sync_results=(), capabilities=None, script_timeout=30):
+        self.async_results = list(async_results)
+        self.sync_results = list(sync_results)
+        self.capabilities = dict(capabilities or {})
+        self.script_timeout = script_timeout
+        self.script_timeouts = []
+        self.async_args = []
+
+    @property
+    def timeouts(self):
+        return Timeouts(script=self.script_timeout)
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.async_args.append(args)
+        return self._next(self.async_results)
+
+    def execute_script(self, script, *args):
+        return self._next(self.sync_results)
+
+    @staticmethod
+    def _next(results):
+        result = results.pop(0) if results else None
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestEventWaiter:
+
+    def test_returns_result_of_single_async_round_trip(self):
+        driver = _ScriptedDriver(async_results=[_hit("element")])
+        waiter = EventWaiter(driver)
+
+        assert waiter.until("present", "id", "jobs-list", timeout=5) == "element"
+        assert waiter.stats == {"async_waits": 1, "rearms": 0, "polls": 0}
+
+    def test_sets_script_timeout_only_when_needed(self):
+        driver = _ScriptedDriver(async_results=[_hit(True), _hit(True)], script_timeout=5)
+        waiter = EventWaiter(driver)
+
+        waiter.until("ready", timeout=10)
+        waiter.until("ready", timeout=5)
+
+        assert len(driver.script_timeouts) == 1
+
+    def test_script_timeout_is_shared_by_the_waiters_of_a_session(self):
+        driver = _ScriptedDriver(async_results=[_hit(True), _hit(True), _hit(True)])
+
+        EventWaiter(driver).until("ready", timeout=30)
+        EventWaiter(driver).until("ready", timeout=2)
+        EventWaiter(driver).until("ready", timeout=30)
+
+        assert len(driver.script_timeouts) == 1 and driver.script_timeouts[0] > 30
+
+    def test_script_timeouts_are_not_counted_as_navigations(self):
+        driver = _ScriptedDriver(async_results=[_hit(True), TimeoutException("script timeout"), _hit(True)],
+                                 script_timeout=3)
+        waiter = EventWaiter(driver)
+        waiter.until("ready", timeout=5)
+        # Lowered elsewhere, behind the waiter's back
+        driver.script_timeout = 3
+
+        assert waiter.until("ready", timeout=5) is True
+        assert waiter.stats == {"async_waits": 3, "rearms": 0, "polls": 0}
+        assert len(driver.script_timeouts) == 2
+
+    def test_never_lowers_the_script_timeout_of_the_session(self):
+        driver = _ScriptedDriver(async_results=[None, None, _hit(True)])
+        waiter = EventWaiter(driver, wait_slice=0.25)
+
+        assert waiter.until("ready", timeout=5) is True
+        assert driver.script_timeouts == [] and driver.script_timeout == 30
+
+    def test_forgets_the_script_timeout_of_a_quit_session(self):
+        driver = _ScriptedDriver(async_results=[_hit(True)], script_timeout=3)
+        EventWaiter(driver).until("ready", timeout=5)
+
+        forget_script_timeout(driver)
+
+        assert driver not in _script_timeouts
+
+    def test_rearms_after_navigation(self):
+        driver = _ScriptedDriver(async_results=[WebDriverException("document unloaded"), _hit(True)])
+        waiter = EventWaiter(driver)
+
+        assert waiter.until("ready", timeout=5) is True
+        assert waiter.stats["rearms"] == 1
+
+    def test_falls_back_to_adaptive_polling(self):
+        unloaded = WebDriverException("document unloaded")
+        driver = _ScriptedDriver(async_results=[unloaded] * 4, sync_results=[None, _hit(None), _hit("element")])
+        waiter = EventWaiter(driver, poll_min=0.001, poll_max=0.002)
+
+        assert waiter.until("clickable", "xpath", "//a", timeout=5) == "element"
+        assert waiter.stats["polls"] == 3
+
+    def test_sliced_waits_are_reissued_until_the_condition_holds(self):
+        driver = _ScriptedDriver(async_results=[None, None, _hit("element")])
+        waiter = EventWaiter(driver, wait_slice=0.01)
+
+        assert waiter.until("present", "id", "jobs-list", timeout=5) == "element"
+        assert waiter.stats == {"async_waits": 3, "rearms": 0, "polls": 0}
+
+    def test_returns_matching_strategy_index(self):
+        driver = _ScriptedDriver(async_results=[_hit("element", index=1)])
+        waiter = EventWaiter(driver)
+
+        index, value, costs = waiter.until_any("present", [("css selector", "#a"), ("xpath", "//a")], timeout=5)
+
+        assert (index, value, costs) == (1, "element", [0.1])
+
+    def test_raises_timeout_when_condition_never_holds(self):
+        driver = _ScriptedDriver(async_results=[_hit(None, index=-1)])
+        waiter = EventWaiter(driver)
+
+        with pytest.raises(TimeoutException):
+            waiter.until("text", "id", "select2-filter-by-department-container",
+                         expected="Quality Assurance", timeout=1)
+
+
+def _ready_in_page(ready_state, expected):
+    program = (f"var document = {{readyState: {json.dumps(ready_state)}}};"
+               f"console.log(JSON.stringify((function () {{ {_SYNC_CHECK_JS} }})('ready', [], {json.dumps(expected)})));")
+    return json.loads(subprocess.run(["node", "-e", program], capture_output=True, text=True,
+                                     timeout=30, check=True).stdout)["value"]
+
+
+class TestWaitForPageToLoad:
+
+    @pytest.mark.parametrize("strategy, expected", [("eager", "interactive"), ("normal", "complete"), (None, "complete")])
+    def test_waits_for_the_ready_state_the_page_load_strategy_stops_at(self, strategy, expected):
+        driver = _ScriptedDriver(async_results=[_hit(True)],
+                                 capabilities={"pageLoadStrategy": strategy} if strategy else None)
+
+        BasePage(driver).wait_for_page_to_load()
+
+        [(condition, _, ready_state, _)] = driver.async_args
+        assert (condition, ready_state) == ("ready", expected)
+
+    def test_interactive_documents_are_only_ready_when_asked_for(self):
+        if shutil.which("node") is None:
+            pytest.skip("node is not installed")
+
+        assert _ready_in_page("interactive", "interactive") is True
+        assert _ready_in_page("complete", "interactive") is True
+        assert _ready_in_page("interactive", None) is None
+        assert _ready_in_page("loading", "interactive") is None
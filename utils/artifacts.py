@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import struct
+import threading
+import zlib
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional: screenshots are stored as optimized PNG without it
+    Image = None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Chunks needed to render the image; text/time/color-profile chunks are dropped
+PNG_KEPT_CHUNKS = (b"IHDR", b"PLTE", b"tRNS")
+IMAGE_FORMATS = ("auto", "webp", "png")
+
+
+def _png_chunk(chunk_type, body):
+    return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+
+def optimize_png(data, level=9):
+    """
+    Re-deflates the image data of a PNG at the highest zlib level and drops ancillary chunks.
+    Pixels are unchanged; the original is returned if it is not a PNG or nothing was saved.
+
+    :param bytes data: PNG file content
+    :param int level: zlib compression level
+    :return: PNG file content
+    :rtype: bytes
+
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    kept, idat, pos = [], [], len(PNG_SIGNATURE)
+    try:
+        while pos < len(data):
+            length, = struct.unpack(">I", data[pos:pos + 4])
+            chunk_type, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+            pos += 12 + length
+            if chunk_type == b"IDAT":
+                idat.append(body)
+            elif chunk_type in PNG_KEPT_CHUNKS:
+                kept.append(_png_chunk(chunk_type, body))
+            elif chunk_type == b"IEND":
+                break
+        pixels = zlib.decompress(b"".join(idat))
+    except (struct.error, zlib.error):
+        return data
+    optimized = PNG_SIGNATURE + b"".join(kept) + _png_chunk(b"IDAT", zlib.compress(pixels, level)) + _png_chunk(b"IEND", b"")
+    return optimized if len(optimized) < len(data) else data
+
+
+def compress_screenshot(png, image_format="auto", webp_quality=80):
+    """
+    :param bytes png: Screenshot as returned by driver.get_screenshot_as_png()
+    :param str image_format: "webp" (needs Pillow), "png" or "auto" (WebP when Pillow is installed)
+    :param int webp_quality: WebP quality (0-100)
+    :return: (content, extension)
+    :rtype: tuple
+
+    """
+    if image_format in ("auto", "webp") and Image is not None:
+        output = io.BytesIO()
+        Image.open(io.BytesIO(png)).save(output, format="WEBP", quality=webp_quality, method=4)
+        return output.getvalue(), "webp"
+    return optimize_png(png), "png"
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for failure artifacts (screenshot, DOM snapshot, console log).
+
+    Objects are named after the hash of their raw content under `<root>/objects/`, so an
+    identical screenshot or DOM from repeated failures is compressed and stored once. Every
+    failure gets a small JSON manifest under `<root>/failures/<worker_id>/` pointing at its
+    objects; manifests are timestamped and never overwrite earlier runs.
+
+    Meant to run on the telemetry worker: the test thread only grabs raw bytes.
+
+    :param str root: Artifact directory
+    :param str image_format: Screenshot format, see compress_screenshot
+    :param int webp_quality: WebP quality (0-100)
+
+    """
+
+    def __init__(self, root="artifacts", image_format="auto", webp_quality=80):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format '{image_format}', expected one of {IMAGE_FORMATS}")
+        if image_format == "webp" and Image is None:
+            raise ValueError("WebP screenshots need Pillow (pip install Pillow)")
+        self.root = root
+        self.image_format = image_format
+        self.webp_quality = webp_quality
+        self._lock = threading.Lock()
+        self.stats = {"failures": 0, "objects": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    def store_failure(self, test_name, worker_id, timestamp, screenshot=None, dom=None, console=None,
+                      url=None, browser=None):
+        """
+        Stores the artifacts of one failed test and writes its manifest.
+
+        :param str test_name: Failed test
+        :param str worker_id: pytest-xdist worker id ("main" for serial runs)
+        :param datetime.datetime timestamp: Failure time (UTC)
+        :param bytes screenshot: Raw PNG screenshot
+        :param str dom: Page source
+        :param list console: Browser console log entries
+        :param str url: URL of the page under test
+        :param str browser: Browser name
+        :return: Manifest path
+        :rtype: str
+
+        """
+        objects = {}
+        if screenshot:
+            objects["screenshot"] = self._put(screenshot, self._compress_screenshot)
+        if dom:
+            objects["dom"] = self._put(dom.encode(), lambda raw: (gzip.compress(raw, mtime=0), "html.gz"))
+        if console:
+            objects["console"] = self._put(json.dumps(console, indent=1).encode(), lambda raw: (raw, "json"))
+
+        manifest = {
+            "test_name": test_name,
+            "worker_id": worker_id,
+            "browser": browser,
+            "timestamp": timestamp.isoformat(),
+            "url": url,
+            "artifacts": objects,
+        }
+        path = os.path.join(self.root, "failures", worker_id,
+                            f"{test_name}-{timestamp.strftime('%Y%m%dT%H%M%S%f')}.json")
+        _atomic_write(path, json.dumps(manifest, indent=1).encode())
+        with self._lock:
+            self.stats["failures"] += 1
+        return path
+
+    def _compress_screenshot(self, raw):
+        return compress_screenshot(raw, self.image_format, self.webp_quality)
+
+    def _put(self, raw, encode):
+        digest = hashlib.sha256(raw).hexdigest()
+        directory = os.path.join(self.root, "objects", digest[:2])
+        existing = [name for name in _listdir(directory) if name.startswith(digest + ".")]
+        with self._lock:
+            self.stats["raw_bytes"] += len(raw)
+        if existing:
+            with self._lock:
+                self.stats["deduplicated"] += 1
+            return os.path.relpath(os.path.join(directory, existing[0]), self.root)
+
+        content, extension = encode(raw)
+        path = os.path.join(directory, f"{digest}.{extension}")
+        _atomic_write(path, content)
+        with self._lock:
+            self.stats["objects"] += 1
+            self.stats["stored_bytes"] += len(content)
+        return os.path.relpath(path, self.root)
+
+
+def _listdir(directory):
+    try:
+        return os.listdir(directory)
+    except OSError:
+        return []
+
+
+def _atomic_write(path, data):
+    # Several pytest-xdist workers share the object directory
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
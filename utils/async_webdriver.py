@@ -0,0 +1,405 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidSessionIdException, JavascriptException, NoSuchElementException,
+                                        NoSuchWindowException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+from utils.logger import get_logger, log_context
+from utils.multi_context import FlowResult
+from utils.tracing import Tracer, current_tracer
+from utils.wait_engine import forget_script_timeout
+
+logger = get_logger(__name__)
+
+# W3C web element reference key
+ELEMENT_KEY = "element-6066-11e4-a52f-4a8bda5d9a29"
+
+# W3C error codes mapped to the exceptions the sync page objects already handle
+ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "no such window": NoSuchWindowException,
+    "element click intercepted": ElementClickInterceptedException,
+    "element not interactable": ElementNotInteractableException,
+    "javascript error": JavascriptException,
+    "invalid session id": InvalidSessionIdException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException,
+}
+
+
+def _w3c_locator(by, value):
+    """
+    Rewrites the locator strategies W3C WebDriver dropped into CSS selectors, like Selenium does.
+
+    """
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    return by, value
+
+
+class _HttpConnection:
+    """
+    Keep-alive HTTP/1.1 connection to a WebDriver server on asyncio streams.
+
+    """
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method, path, body=None):
+        """
+        :return: (status, decoded JSON body)
+        :rtype: tuple
+        :raises WebDriverException: If the server cannot be reached
+
+        """
+        payload = b"" if body is None else json.dumps(body).encode()
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Accept: application/json\r\nContent-Type: application/json;charset=UTF-8\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n").encode()
+        reused = self._writer is not None
+        try:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            self._writer.write(head + payload)
+            await self._writer.drain()
+            status, raw = await asyncio.wait_for(self._read_response(), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            await self.close()
+            if reused and not getattr(e, "partial", b""):
+                # The server closed the idle keep-alive connection: send again on a fresh one
+                return await self.request(method, path, body)
+            raise WebDriverException(f"WebDriver server {self.host}:{self.port} unreachable: {e}") from e
+        except (asyncio.TimeoutError, OSError) as e:
+            await self.close()
+            raise WebDriverException(f"WebDriver server {self.host}:{self.port} unreachable: {e!r}") from e
+        return status, json.loads(raw) if raw else {}
+
+    async def _read_response(self):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while await self._reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            raw = b"".join(chunks)
+        else:
+            raw = await self._reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, raw
+
+    async def close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class AsyncWebElement:
+    """
+    Element reference of an AsyncWebDriver session.
+
+    """
+
+    __slots__ = ("driver", "id")
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"AsyncWebElement({self.id!r})"
+
+    async def _execute(self, method, path, body=None):
+        return await self.driver.execute(method, f"/element/{self.id}{path}", body)
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def send_keys(self, text):
+        await self._execute("POST", "/value", {"text": str(text)})
+
+    async def text(self):
+        return await self._execute("GET", "/text")
+
+    async def get_attribute(self, name):
+        return await self._execute("GET", f"/attribute/{name}")
+
+    async def get_property(self, name):
+        return await self._execute("GET", f"/property/{name}")
+
+    async def is_displayed(self):
+        return await self._execute("GET", "/displayed")
+
+
+class AsyncWebDriver:
+    """
+    asyncio WebDriver session speaking the W3C WebDriver HTTP protocol to a driver server
+    (chromedriver/geckodriver started with utils.driver_factory.start_driver_service, or a
+    Selenium Grid). Commands of a session go over one keep-alive connection and are
+    serialized; different sessions run concurrently under one event loop.
+
+    Return values of WebDriver commands are awaited instead of read from properties
+    (`await driver.title()` for `driver.title`).
+
+    :param _HttpConnection connection: Connection to the driver server
+    :param str session_id: WebDriver session id
+    :param dict capabilities: Capabilities returned by the server
+
+    """
+
+    def __init__(self, connection, session_id, capabilities):
+        self._connection = connection
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def start(cls, server_url, capabilities, timeout=120):
+        """
+        Opens a new session on the driver server.
+
+        :param str server_url: e.g. "http://127.0.0.1:9515"
+        :param dict capabilities: W3C capabilities, e.g. build_options(...).to_capabilities()
+        :param float timeout: Seconds a single command may take (browser startup included)
+        :return: The session
+        :rtype: AsyncWebDriver
+        :raises WebDriverException: If the session cannot be created
+
+        """
+        parts = urlsplit(server_url)
+        connection = _HttpConnection(parts.hostname, parts.port or 80, timeout)
+        status, response = await connection.request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities, "firstMatch": [{}]}})
+        value = cls._check(status, response)
+        return cls(connection, value["sessionId"], value.get("capabilities", {}))
+
+    @staticmethod
+    def _check(status, response):
+        value = response.get("value") if isinstance(response, dict) else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            value = value if isinstance(value, dict) else {}
+            error = ERRORS.get(value.get("error"), WebDriverException)
+            raise error(value.get("message") or f"HTTP {status}")
+        return value
+
+    async def execute(self, method, path, body=None):
+        """
+        Sends a command of this session (`path` relative to /session/{id}).
+
+        :return: The command's value, with element references as AsyncWebElement
+        :raises WebDriverException: The W3C error mapped to Selenium's exception classes
+
+        """
+        async with self._lock:
+            status, response = await self._connection.request(
+                method, f"/session/{self.session_id}{path}", self._wrap(body))
+        return self._unwrap(self._check(status, response))
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def title(self):
+        return await self.execute("GET", "/title")
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def find_element(self, by, value):
+        by, value = _w3c_locator(by, value)
+        return await self.execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by, value):
+        by, value = _w3c_locator(by, value)
+        return await self.execute("POST", "/elements", {"using": by, "value": value})
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": list(args)})
+
+    async def script_timeout(self):
+        """
+        :return: Script timeout of the session in seconds, None if scripts never time out
+        :rtype: float
+
+        """
+        script = (await self.execute("GET", "/timeouts"))["script"]
+        return None if script is None else script / 1000
+
+    async def set_script_timeout(self, seconds):
+        await self.execute("POST", "/timeouts", {"script": int(seconds * 1000)})
+
+    async def window_handles(self):
+        return await self.execute("GET", "/window/handles")
+
+    async def current_window_handle(self):
+        return await self.execute("GET", "/window")
+
+    async def switch_to_window(self, handle):
+        await self.execute("POST", "/window", {"handle": handle})
+
+    async def maximize_window(self):
+        await self.execute("POST", "/window/maximize", {})
+
+    async def set_window_size(self, width, height):
+        await self.execute("POST", "/window/rect", {"width": width, "height": height})
+
+    async def get_cookies(self):
+        return await self.execute("GET", "/cookie")
+
+    async def get_cookie(self, name):
+        try:
+            return await self.execute("GET", f"/cookie/{name}")
+        except WebDriverException:
+            return None
+
+    async def add_cookie(self, cookie):
+        await self.execute("POST", "/cookie", {"cookie": cookie})
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def close(self):
+        return await self.execute("DELETE", "/window")
+
+    async def quit(self):
+        """
+        Ends the session (the browser exits) and closes the connection. Never raises.
+
+        """
+        forget_script_timeout(self)
+        try:
+            await self.execute("DELETE", "")
+        except WebDriverException as e:
+            logger.warning("⚠️ Session %s not ended cleanly: %s", self.session_id, e)
+        finally:
+            await self._connection.close()
+
+
+@asynccontextmanager
+async def async_session(server_url, capabilities, window_size=None):
+    """
+    Session for the duration of an `async with` block.
+
+    :param str server_url: Driver server URL
+    :param dict capabilities: W3C capabilities
+    :param tuple window_size: (width, height) for headless sessions; maximized otherwise
+    :return: The session
+    :rtype: AsyncWebDriver
+
+    """
+    driver = await AsyncWebDriver.start(server_url, capabilities)
+    try:
+        if window_size:
+            await driver.set_window_size(*window_size)
+        else:
+            await driver.maximize_window()
+        yield driver
+    finally:
+        await driver.quit()
+
+
+async def run_flows(flows, server_url, capabilities, concurrency=10, window_size=None):
+    """
+    Runs async page-object flows concurrently under the running event loop, each in its
+    own session. At most `concurrency` sessions (browsers) are open at once; a flow's
+    exception is captured in its result. Every flow gets its own tracer and logs with
+    its name; step spans are added to the caller's tracer, like FlowScheduler flows
+    (utils.multi_context).
+
+    :param dict flows: {name: async callable(driver)}
+    :param str server_url: Driver server URL
+    :param dict capabilities: W3C capabilities shared by every session
+    :param int concurrency: Max sessions open at once
+    :param tuple window_size: (width, height) for headless sessions
+    :return: {name: FlowResult}
+    :rtype: dict
+
+    """
+    slots = asyncio.Semaphore(concurrency)
+    parent = current_tracer()
+
+    async def run(name, flow):
+        async with slots:
+            tracer = Tracer(f"{parent.name}[{name}]" if parent else name).activate()
+            started = time.perf_counter()
+            value = error = None
+            with log_context(flow=name):
+                try:
+                    async with async_session(server_url, capabilities, window_size) as driver:
+                        value = await flow(driver)
+                except Exception as e:
+                    logger.error("❌ Flow '%s' failed: %s", name, e)
+                    error = e
+            tracer.deactivate()
+            if parent is not None:
+                parent.merge(tracer)
+            return FlowResult(name, value, error, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run(name, flow) for name, flow in flows.items()))
+    logger.info("🗂 %d async flows: %.2fs, %d failed", len(results), time.perf_counter() - started,
+                sum(not result.ok for result in results))
+    return {result.name: result for result in results}
@@ -0,0 +1,186 @@
+import os
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Cookies the WebToffee consent banner on useinsider.com sets when "Accept All" is clicked
+CONSENT_COOKIE_NAME = "viewed_cookie_policy"
+CONSENT_COOKIES = (
+    {"name": CONSENT_COOKIE_NAME, "value": "yes"},
+    {"name": "cookielawinfo-checkbox-necessary", "value": "yes"},
+    {"name": "cookielawinfo-checkbox-functional", "value": "yes"},
+    {"name": "cookielawinfo-checkbox-performance", "value": "yes"},
+    {"name": "cookielawinfo-checkbox-analytics", "value": "yes"},
+    {"name": "cookielawinfo-checkbox-advertisement", "value": "yes"},
+)
+# Site under test; point it at a stand-in (utils.stand_in_site) with $SITE_URL or --site-url
+DEFAULT_SITE_URL = os.getenv("SITE_URL", "https://useinsider.com")
+
+# Chrome switches that cut startup work the tests never need
+LEAN_CHROME_ARGUMENTS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--mute-audio",
+    # The Lever tab is opened in the background; keep its timers and renderer at full speed
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+)
+
+# Firefox equivalents: no update checks, telemetry, safe browsing lists or first-run pages
+LEAN_FIREFOX_PREFS = {
+    "app.update.auto": False,
+    "app.update.enabled": False,
+    "app.normandy.enabled": False,
+    "extensions.update.enabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "media.gmp-manager.updateEnabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.page": 0,
+    "browser.newtabpage.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+}
+
+
+class BrowserProfile:
+    """
+    Named browser configuration tuned for startup and page-load speed.
+
+    :param str name: Profile name used on the command line and in pool keys
+    :param bool headless: Run without a visible window
+    :param str page_load_strategy: "normal" (wait for load) or "eager" (DOMContentLoaded)
+    :param bool lean: Disable extensions, background networking, component updates and first-run work
+    :param bool consent_preset: Seed the cookie-consent cookies so the banner never shows
+    :param tuple window_size: Window size used instead of maximizing in headless mode
+
+    """
+
+    def __init__(self, name, headless=False, page_load_strategy="normal", lean=False,
+                 consent_preset=False, window_size=(1920, 1080)):
+        if page_load_strategy not in ("normal", "eager", "none"):
+            raise ValueError(f"Unknown page load strategy '{page_load_strategy}'")
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.lean = lean
+        self.consent_preset = consent_preset
+        self.window_size = window_size
+
+    def configure_chrome(self, options):
+        """
+        :param options: selenium ChromeOptions to update
+
+        """
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.lean:
+            for argument in LEAN_CHROME_ARGUMENTS:
+                options.add_argument(argument)
+
+    def configure_firefox(self, options):
+        """
+        :param options: selenium FirefoxOptions to update
+
+        """
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            width, height = self.window_size
+            options.add_argument("-headless")
+            options.add_argument(f"--width={width}")
+            options.add_argument(f"--height={height}")
+        if self.lean:
+            for name, value in LEAN_FIREFOX_PREFS.items():
+                options.set_preference(name, value)
+
+    def size_window(self, driver):
+        """
+        Maximizes the window, or sets the fixed size in headless mode where there is no screen.
+
+        """
+        if self.headless:
+            driver.set_window_size(*self.window_size)
+        else:
+            driver.maximize_window()
+
+    def prepare_session(self, driver, site_url=DEFAULT_SITE_URL):
+        """
+        Applies per-test session state; called on every lease because the pool
+        clears cookies between tests.
+
+        :param driver: Selenium WebDriver instance
+        :param str site_url: Site under test
+
+        """
+        if self.consent_preset:
+            seed_consent_cookies(driver, site_url)
+
+
+def seed_consent_cookies(driver, site_url=DEFAULT_SITE_URL):
+    """
+    Stores the cookie-consent cookies so HomePage.accept_cookies has nothing to do.
+
+    Chrome sets them through CDP without loading a page. Other browsers can only set cookies
+    for the current document, so a tiny same-site resource (robots.txt) is loaded first.
+
+    :param driver: Selenium WebDriver instance
+    :param str site_url: Site the cookies belong to
+
+    """
+    parts = urlsplit(site_url)
+    if hasattr(driver, "execute_cdp_cmd"):
+        if parts.scheme == "https":
+            scope = {"domain": f".{parts.hostname}", "secure": True}
+        else:
+            # Plain-HTTP stand-ins (often an IP address) get host-only cookies
+            scope = {"url": f"{parts.scheme}://{parts.netloc}/"}
+        cookies = [dict(cookie, path="/", **scope) for cookie in CONSENT_COOKIES]
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        return
+    try:
+        driver.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+        for cookie in CONSENT_COOKIES:
+            driver.add_cookie(dict(cookie, path="/"))
+    except WebDriverException as e:
+        logger.warning("⚠️ Consent cookies not preset: %s", e)
+
+
+BROWSER_PROFILES = {
+    "default": BrowserProfile("default"),
+    "headless": BrowserProfile("headless", headless=True),
+    "lean": BrowserProfile("lean", headless=True, page_load_strategy="eager", lean=True),
+    "fast": BrowserProfile("fast", headless=True, page_load_strategy="eager", lean=True, consent_preset=True),
+}
+
+
+def get_browser_profile(name):
+    """
+    :param str name: Profile name
+    :return: The named BrowserProfile
+    :rtype: BrowserProfile
+    :raises ValueError: If the name is unknown
+
+    """
+    try:
+        return BROWSER_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of {sorted(BROWSER_PROFILES)}")
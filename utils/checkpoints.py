@@ -0,0 +1,224 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+READ_STORAGE_JS = """
+var storage = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    storage[key] = window.localStorage.getItem(key);
+}
+return storage;
+"""
+
+WRITE_STORAGE_JS = """
+var storage = arguments[0];
+Object.keys(storage).forEach(function (key) { window.localStorage.setItem(key, storage[key]); });
+"""
+
+
+class Checkpoint:
+    """
+    Resumable browser state reached by a navigation prefix: the URL, cookies and
+    localStorage, plus the page-object state (e.g. applied filters) that cannot be
+    restored from the URL and is re-applied by the page object.
+
+    :param str name: Checkpoint name
+    :param str url: URL of the page the prefix ends on
+    :param list cookies: Cookies as returned by driver.get_cookies()
+    :param dict local_storage: localStorage items of the page's origin
+    :param dict state: Page-object state, see BasePage.apply_checkpoint_state
+
+    """
+
+    __slots__ = ("name", "url", "cookies", "local_storage", "state", "created")
+
+    def __init__(self, name, url, cookies=(), local_storage=None, state=None):
+        self.name = name
+        self.url = url
+        self.cookies = list(cookies)
+        self.local_storage = dict(local_storage or {})
+        self.state = dict(state or {})
+        self.created = time.time()
+
+
+def capture_checkpoint(driver, name, state=None):
+    """
+    :param driver: Selenium WebDriver instance on the page to resume at
+    :param str name: Checkpoint name
+    :param dict state: Page-object state to re-apply on restore
+    :return: The captured checkpoint
+    :rtype: Checkpoint
+
+    """
+    return Checkpoint(name, driver.current_url, driver.get_cookies(),
+                      driver.execute_script(READ_STORAGE_JS), state)
+
+
+def restore_checkpoint(driver, checkpoint):
+    """
+    Loads a checkpoint into a clean session: cookies and localStorage are set on the
+    site's origin first, so the page sees them on its first load.
+
+    Chrome sets every cookie (any domain, httpOnly included) through CDP. Other browsers
+    can only set cookies for the current document, so a tiny same-origin resource
+    (robots.txt) is loaded first, as for the consent preset (utils.browser_profiles).
+
+    :param driver: Selenium WebDriver instance
+    :param Checkpoint checkpoint: State to restore
+    :raises WebDriverException: If the state cannot be applied
+
+    """
+    parts = urlsplit(checkpoint.url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(c) for c in checkpoint.cookies]})
+    if checkpoint.local_storage or not hasattr(driver, "execute_cdp_cmd"):
+        driver.get(f"{origin}/robots.txt")
+    if not hasattr(driver, "execute_cdp_cmd"):
+        for cookie in checkpoint.cookies:
+            if _matches_host(cookie.get("domain"), parts.hostname):
+                driver.add_cookie({key: value for key, value in cookie.items() if key != "domain"})
+    if checkpoint.local_storage:
+        driver.execute_script(WRITE_STORAGE_JS, checkpoint.local_storage)
+    driver.get(checkpoint.url)
+
+
+def _cdp_cookie(cookie):
+    param = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+             if cookie.get(key) is not None}
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    return param
+
+
+def _matches_host(domain, host):
+    if not domain or not host:
+        return True
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+class CheckpointStore:
+    """
+    Checkpoints reached during the session, shared by every test of a worker process.
+
+    A checkpoint is saved by the test that walks the full navigation path, so the prefix
+    is still verified once per session; later tests resume from it. Checkpoints older
+    than `max_age` seconds are ignored, as cookies and listings may have changed.
+    Tests use a scope() of the store, so a checkpoint is only resumed by the browser and
+    profile that reached it.
+
+    :param float max_age: Seconds a checkpoint stays usable
+
+    """
+
+    def __init__(self, max_age=1800):
+        self.max_age = max_age
+        self._checkpoints = {}
+        self._lock = threading.Lock()
+        self.stats = {"saved": 0, "restored": 0, "missed": 0, "failed": 0}
+
+    def scope(self, *key):
+        """
+        :param key: What the checkpoints depend on, e.g. the browser name and profile
+        :return: View of the store whose checkpoints are kept apart from other scopes
+        :rtype: CheckpointScope
+
+        """
+        return CheckpointScope(self, key)
+
+    def save(self, checkpoint, name=None):
+        with self._lock:
+            self._checkpoints[checkpoint.name if name is None else name] = checkpoint
+            self.stats["saved"] += 1
+
+    def get(self, name):
+        """
+        :return: The checkpoint, or None if it was not reached yet or is too old
+        :rtype: Checkpoint
+
+        """
+        with self._lock:
+            checkpoint = self._checkpoints.get(name)
+            if checkpoint is not None and time.time() - checkpoint.created > self.max_age:
+                del self._checkpoints[name]
+                checkpoint = None
+            return checkpoint
+
+    def discard(self, name):
+        with self._lock:
+            self._checkpoints.pop(name, None)
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+
+class CheckpointScope:
+    """
+    Checkpoints of one scope of a CheckpointStore; the stats are shared with the store.
+
+    :param CheckpointStore store: Session checkpoints
+    :param tuple key: Scope the checkpoint names are prefixed with
+
+    """
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = tuple(key)
+
+    @property
+    def stats(self):
+        return self.store.stats
+
+    def save(self, checkpoint):
+        self.store.save(checkpoint, self.key + (checkpoint.name,))
+
+    def get(self, name):
+        return self.store.get(self.key + (name,))
+
+    def discard(self, name):
+        self.store.discard(self.key + (name,))
+
+    def count(self, key):
+        self.store.count(key)
+
+
+def resume(page, store, name):
+    """
+    Restores a checkpoint into the page's session and lets the page object re-apply and
+    verify its state. A checkpoint that cannot be resumed is discarded, so the next test
+    walks the full path again.
+
+    :param page: Page object (see BasePage.apply_checkpoint_state)
+    :param store: Session checkpoints (CheckpointStore or one of its scopes)
+    :param str name: Checkpoint name
+    :return: True if the page is at the checkpoint, False if the full path must be walked
+    :rtype: bool
+
+    """
+    if store is None:
+        return False
+    checkpoint = store.get(name)
+    if checkpoint is None:
+        store.count("missed")
+        return False
+    try:
+        restore_checkpoint(page.driver, checkpoint)
+        resumed = page.apply_checkpoint_state(checkpoint.state)
+    except WebDriverException as e:
+        logger.warning("⚠️ Checkpoint '%s' could not be restored: %s", name, e)
+        resumed = False
+    if not resumed:
+        store.discard(name)
+        store.count("failed")
+        return False
+    store.count("restored")
+    logger.info("⏩ Resumed at checkpoint '%s': %s", name, checkpoint.url)
+    return True
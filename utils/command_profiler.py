@@ -0,0 +1,180 @@
+import json
+import threading
+
+from utils.tracing import current_tracer
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def _payload_size(payload):
+    if payload is None:
+        return 0
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def bucket_index(ms):
+    """
+    :param float ms: Latency in milliseconds
+    :return: Index of the HISTOGRAM_BUCKETS_MS bucket the latency falls in
+    :rtype: int
+
+    """
+    for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+        if ms < bound:
+            return index
+    return len(HISTOGRAM_BUCKETS_MS)
+
+
+class CommandProfile:
+    """
+    Records every WebDriver command of one test: endpoint, latency, payload sizes and the
+    page-object step (see utils.tracing) that sent it. Register `on_command` with
+    utils.tracing.add_command_listener.
+
+    Without `detailed` only the round trips per step are counted (enough for a round-trip
+    budget), so no payload is serialized to measure its size.
+
+    :param str test_name: Test the commands belong to
+    :param bool detailed: Keep a record per command for CommandProfiler
+
+    """
+
+    def __init__(self, test_name, detailed=True):
+        self.test_name = test_name
+        self.detailed = detailed
+        self.commands = []
+        self._steps = {}
+        self._lock = threading.Lock()
+
+    @property
+    def round_trips(self):
+        with self._lock:
+            return sum(self._steps.values())
+
+    def on_command(self, command, seconds, params=None, response=None):
+        tracer = current_tracer()
+        span = tracer.current_span() if tracer else None
+        step = span.name if span else None
+        record = None
+        if self.detailed:
+            record = {
+                "command": command,
+                "step": step,
+                "ms": seconds * 1000,
+                "request_bytes": _payload_size(params),
+                "response_bytes": _payload_size(response),
+            }
+        with self._lock:
+            self._steps[step or "(no step)"] = self._steps.get(step or "(no step)", 0) + 1
+            if record is not None:
+                self.commands.append(record)
+
+    def by_step(self):
+        """
+        :return: {step: round trips} for the test, "(no step)" for commands outside page objects
+        :rtype: dict
+
+        """
+        with self._lock:
+            return dict(self._steps)
+
+
+class CommandProfiler:
+    """
+    Session-wide aggregate of CommandProfiles: per-endpoint and per-step totals and
+    latency histograms for the end-of-session report.
+
+    """
+
+    def __init__(self):
+        self.tests = 0
+        self._endpoints = {}
+        self._steps = {}
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        """
+        Merges a finished test profile into the session totals.
+
+        :param CommandProfile profile: Profile of one test
+
+        """
+        with self._lock:
+            self.tests += 1
+            for record in profile.commands:
+                endpoint = self._entry(self._endpoints, record["command"])
+                endpoint["histogram"][bucket_index(record["ms"])] += 1
+                endpoint["bytes"] += record["request_bytes"] + record["response_bytes"]
+                self._count(endpoint, record["ms"])
+                self._count(self._entry(self._steps, (record["step"] or "(no step)", record["command"])), record["ms"])
+
+    def top_endpoints(self, n=10):
+        """
+        :param int n: Number of rows
+        :return: Rows with command, calls, total_ms, avg_ms, max_ms, bytes and histogram, by total time
+        :rtype: list
+
+        """
+        with self._lock:
+            rows = [dict(stats, command=command, histogram=list(stats["histogram"]))
+                    for command, stats in self._endpoints.items()]
+        return self._top(rows, n)
+
+    def top_steps(self, n=10):
+        """
+        :param int n: Number of rows
+        :return: Rows with step, command, calls, total_ms, avg_ms and max_ms, by total time
+        :rtype: list
+
+        """
+        with self._lock:
+            rows = [dict(stats, step=step, command=command) for (step, command), stats in self._steps.items()]
+        return self._top(rows, n)
+
+    def format_report(self, n=10, width=30):
+        """
+        Renders the top-N endpoints and steps plus a latency histogram per endpoint.
+
+        :param int n: Number of rows per table
+        :param int width: Width of the longest histogram bar
+        :return: Report lines
+        :rtype: list
+
+        """
+        lines = [f"📡 WebDriver commands ({self.tests} tests), top {n} endpoints by total time:"]
+        endpoints = self.top_endpoints(n)
+        for row in endpoints:
+            lines.append(f"   {row['total_ms']:9.0f} ms | {row['calls']:5d} calls | {row['avg_ms']:7.1f} ms avg | "
+                         f"{row['max_ms']:7.1f} ms max | {row['bytes'] / 1024:7.1f} KB | {row['command']}")
+        lines.append(f"📡 Top {n} page-object steps by WebDriver time:")
+        for row in self.top_steps(n):
+            lines.append(f"   {row['total_ms']:9.0f} ms | {row['calls']:5d} calls | {row['step']} -> {row['command']}")
+        for row in endpoints:
+            lines.append(f"📊 {row['command']} latency:")
+            peak = max(row["histogram"]) or 1
+            labels = [f"< {bound} ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">= {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+            for label, count in zip(labels, row["histogram"]):
+                if count:
+                    lines.append(f"   {label:>10} | {'#' * max(1, round(width * count / peak)):<{width}} {count}")
+        return lines
+
+    @staticmethod
+    def _entry(table, key):
+        return table.setdefault(key, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0,
+                                      "histogram": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)})
+
+    @staticmethod
+    def _count(entry, ms):
+        entry["calls"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+
+    @staticmethod
+    def _top(rows, n):
+        for row in rows:
+            row["avg_ms"] = row["total_ms"] / row["calls"] if row["calls"] else 0.0
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)[:n]
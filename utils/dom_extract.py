@@ -0,0 +1,160 @@
+import re
+
+# In-page extractor for BasePage.extract / extract_many. Takes a dict of named specs and
+# returns {name: [record, ...]} in a single execute_script round-trip.
+#
+# Spec:    {"strategies": [[by, value], ...], "fields": {name: field}, "offset": int, "limit": int or null,
+#           "exclude": {"fields": [name, ...], "values": [...]} or null}
+# Field:   "text" | "html" | "visible" | "rect" | "element" | "attr:<name>" | "prop:<name>"
+#          or {"selector": css, "value": <field>} to read from a descendant element.
+_HELPERS_JS = """
+function __findAll(root, by, value) {
+    switch (by) {
+        case 'css selector': return Array.from(root.querySelectorAll(value));
+        case 'id': var el = document.getElementById(value); return el ? [el] : [];
+        case 'class name': return Array.from(root.getElementsByClassName(value));
+        case 'tag name': return Array.from(root.getElementsByTagName(value));
+        case 'name': return Array.from(document.getElementsByName(value));
+        case 'xpath':
+            var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function __visible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function __field(el, field) {
+    if (field !== null && typeof field === 'object') {
+        var child = el.querySelector(field.selector);
+        return child ? __field(child, field.value || 'text') : null;
+    }
+    if (field === 'text') return (el.innerText || el.textContent || '').trim();
+    if (field === 'html') return el.outerHTML;
+    if (field === 'visible') return __visible(el);
+    if (field === 'element') return el;
+    if (field === 'rect') {
+        var r = el.getBoundingClientRect();
+        return {x: r.x, y: r.y, width: r.width, height: r.height};
+    }
+    if (field.indexOf('attr:') === 0) return el.getAttribute(field.slice(5));
+    if (field.indexOf('prop:') === 0) return el[field.slice(5)];
+    throw new Error('Unsupported field: ' + field);
+}
+function __elements(root, spec) {
+    var elements = [];
+    for (var i = 0; i < spec.strategies.length && !elements.length; i++) {
+        elements = __findAll(root, spec.strategies[i][0], spec.strategies[i][1]);
+    }
+    if (spec.exclude) {
+        // Skip elements already read (e.g. recycled nodes of a virtualized list) before offset/limit
+        var seen = {};
+        spec.exclude.values.forEach(function (value) { seen[value] = true; });
+        elements = elements.filter(function (el) {
+            return !spec.exclude.fields.some(function (name) {
+                var value = __field(el, spec.fields[name]);
+                return value !== null && value !== undefined && seen.hasOwnProperty(String(value));
+            });
+        });
+    }
+    var offset = spec.offset || 0;
+    return elements.slice(offset, spec.limit ? offset + spec.limit : undefined);
+}
+function __record(el, fields) {
+    var record = {};
+    Object.keys(fields).forEach(function (key) { record[key] = __field(el, fields[key]); });
+    return record;
+}
+"""
+
+EXTRACT_JS = _HELPERS_JS + """
+var specs = arguments[0], root = arguments[1] || document, output = {};
+Object.keys(specs).forEach(function (name) {
+    var spec = specs[name];
+    output[name] = __elements(root, spec).map(function (el) { return __record(el, spec.fields); });
+});
+return output;
+"""
+
+# Scrolls the last element matching an extraction spec to the top of the viewport, so the
+# next part of a lazy-loaded or virtualized list renders. Returns whether anything scrolled.
+SCROLL_PAST_JS = _HELPERS_JS + """
+var elements = __elements(document, arguments[0]), last = elements[elements.length - 1];
+if (!last) return false;
+var top = last.getBoundingClientRect().top;
+last.scrollIntoView({block: 'start'});
+return last.getBoundingClientRect().top !== top;
+"""
+
+# In-page rule check for BasePage.verify_records. Evaluates rules on every matched element and
+# returns only counts and the failing records, so large listings never cross the wire.
+#
+# Spec:    extraction spec (see above) plus "rules": [[field, op, value], ...] and "max_mismatches"
+# Ops:     "contains" / "equals" (case-insensitive), "matches" (case-insensitive regex), "not_empty"
+#
+# failed_rules applies the same rules to records already extracted (e.g. streamed in chunks).
+VERIFY_JS = _HELPERS_JS + """
+function __passes(value, op, expected) {
+    var text = value === null || value === undefined ? '' : String(value).trim();
+    switch (op) {
+        case 'contains': return text.toLowerCase().indexOf(String(expected).toLowerCase()) !== -1;
+        case 'equals': return text.toLowerCase() === String(expected).toLowerCase();
+        case 'matches': return new RegExp(expected, 'i').test(text);
+        case 'not_empty': return text.length > 0;
+    }
+    throw new Error('Unsupported rule operator: ' + op);
+}
+var spec = arguments[0], root = arguments[1] || document;
+var elements = __elements(root, spec), mismatched = 0, mismatches = [], failures = {};
+spec.rules.forEach(function (rule) { failures[rule[0] + ' ' + rule[1] + ' ' + rule[2]] = 0; });
+elements.forEach(function (el, index) {
+    var record = __record(el, spec.fields), failed = [];
+    spec.rules.forEach(function (rule) {
+        if (!__passes(record[rule[0]], rule[1], rule[2])) {
+            var name = rule[0] + ' ' + rule[1] + ' ' + rule[2];
+            failures[name] += 1;
+            failed.push(name);
+        }
+    });
+    if (failed.length) mismatched += 1;
+    if (failed.length && mismatches.length < spec.max_mismatches) {
+        record.index = index;
+        record.failed_rules = failed;
+        mismatches.push(record);
+    }
+});
+return {total: elements.length, mismatched: mismatched, failures: failures, mismatches: mismatches};
+"""
+
+
+def failed_rules(record, rules):
+    """
+    Python counterpart of the VERIFY_JS rule check, for records extracted chunk by chunk.
+
+    :param dict record: Extracted record
+    :param rules: Iterable of (field, op, expected) rules
+    :return: Names of the failed rules, formatted like VERIFY_JS ("field op expected")
+    :rtype: list
+
+    """
+    failed = []
+    for field, op, expected in rules:
+        value = record.get(field)
+        text = "" if value is None else str(value).strip()
+        if op == "contains":
+            passed = str(expected).lower() in text.lower()
+        elif op == "equals":
+            passed = text.lower() == str(expected).lower()
+        elif op == "matches":
+            passed = re.search(expected, text, re.IGNORECASE) is not None
+        elif op == "not_empty":
+            passed = bool(text)
+        else:
+            raise ValueError(f"Unsupported rule operator: {op}")
+        if not passed:
+            failed.append(f"{field} {op} {expected}")
+    return failed
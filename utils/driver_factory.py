@@ -0,0 +1,109 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from utils.browser_profiles import get_browser_profile
+from utils.driver_resolver import resolve_driver
+from utils.resource_policy import get_resource_policy
+
+SUPPORTED_BROWSERS = ("chrome", "firefox")
+
+
+def build_options(browser, resource_policy="full", proxy=None, profile="default"):
+    """
+    Builds the browser options of a session: browser-specific flags, the browser profile
+    (headless, page load strategy, lean startup), resource policy prefs and the proxy.
+    Shared by create_driver and async sessions (utils.async_webdriver).
+
+    :param str browser: "chrome" or "firefox"
+    :param str resource_policy: Name of a policy in utils.resource_policy.RESOURCE_POLICIES
+    :param str proxy: Optional "host:port" of an HTTP(S) proxy; its TLS certificate is trusted
+    :param str profile: Name of a profile in utils.browser_profiles.BROWSER_PROFILES
+    :return: ChromeOptions or FirefoxOptions
+    :raises ValueError: If the browser, policy or profile is not supported
+
+    """
+    policy = get_resource_policy(resource_policy)
+    browser_profile = get_browser_profile(profile)
+
+    if browser == "chrome":
+        chrome_options = ChromeOptions()
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+        browser_profile.configure_chrome(chrome_options)
+        if policy.chrome_prefs():
+            chrome_options.add_experimental_option("prefs", policy.chrome_prefs())
+        if proxy:
+            chrome_options.add_argument(f"--proxy-server=http://{proxy}")
+            # Chrome bypasses proxies for localhost unless told otherwise
+            chrome_options.add_argument("--proxy-bypass-list=<-loopback>")
+            chrome_options.accept_insecure_certs = True
+        return chrome_options
+
+    if browser == "firefox":
+        firefox_options = FirefoxOptions()
+        browser_profile.configure_firefox(firefox_options)
+        for name, value in policy.firefox_prefs().items():
+            firefox_options.set_preference(name, value)
+        if proxy:
+            host, port = proxy.rsplit(":", 1)
+            firefox_options.set_preference("network.proxy.type", 1)
+            for scheme in ("http", "ssl"):
+                firefox_options.set_preference(f"network.proxy.{scheme}", host)
+                firefox_options.set_preference(f"network.proxy.{scheme}_port", int(port))
+            firefox_options.set_preference("network.proxy.allow_hijacking_localhost", True)
+            firefox_options.accept_insecure_certs = True
+        return firefox_options
+
+    raise ValueError(f"Unsupported browser '{browser}', expected one of {SUPPORTED_BROWSERS}")
+
+
+def create_driver(browser, resource_policy="full", proxy=None, profile="default"):
+    """
+    Launches a new Selenium WebDriver session for the given browser.
+
+    - Configures browser-specific options and the browser profile (see build_options)
+    - Launches the driver (binary resolved once and cached, see utils.driver_resolver)
+    - Routes traffic through a local proxy when given (e.g. the HTTP archive proxy)
+    - Applies the resource policy (blocked trackers, media, images, fonts)
+    - Maximizes the window for consistency (fixed size when headless)
+
+    :param str browser: "chrome" or "firefox"
+    :param str resource_policy: Name of a policy in utils.resource_policy.RESOURCE_POLICIES
+    :param str proxy: Optional "host:port" of an HTTP(S) proxy; its TLS certificate is trusted
+    :param str profile: Name of a profile in utils.browser_profiles.BROWSER_PROFILES
+    :return: WebDriver instance
+    :raises ValueError: If the browser, policy or profile is not supported
+
+    """
+    options = build_options(browser, resource_policy, proxy, profile)
+    if browser == "chrome":
+        driver = webdriver.Chrome(service=ChromeService(executable_path=resolve_driver("chrome")), options=options)
+    else:
+        driver = webdriver.Firefox(service=FirefoxService(executable_path=resolve_driver("firefox")), options=options)
+
+    get_resource_policy(resource_policy).apply(driver)
+    get_browser_profile(profile).size_window(driver)
+    return driver
+
+
+def start_driver_service(browser):
+    """
+    Starts a chromedriver/geckodriver server that async sessions connect to over HTTP
+    (see utils.async_webdriver). One server hosts many sessions; stop it with service.stop().
+
+    :param str browser: "chrome" or "firefox"
+    :return: The running service; its URL is service.service_url
+    :raises ValueError: If the browser is not supported
+
+    """
+    if browser not in SUPPORTED_BROWSERS:
+        raise ValueError(f"Unsupported browser '{browser}', expected one of {SUPPORTED_BROWSERS}")
+    service_class = ChromeService if browser == "chrome" else FirefoxService
+    service = service_class(executable_path=resolve_driver(browser))
+    service.start()
+    return service
@@ -0,0 +1,238 @@
+import threading
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from utils.logger import get_logger
+from utils.tracing import add_command_listener, remove_command_listener
+from utils.wait_engine import forget_script_timeout
+
+logger = get_logger(__name__)
+
+
+CLEAR_STORAGE_JS = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+def reset_driver(driver, main_handle=None, origins=()):
+    """
+    Brings a used WebDriver session back to a clean state:
+    - Closes every tab/window except the main one (e.g. the Lever tab opened by 'View Role')
+    - Clears the storage of every origin the test was on: the origins passed in (e.g. those
+      navigated to with driver.get, see DriverPool) plus the origin of every open window
+    - Clears cookies (all origins on Chrome via CDP, the cleared origins elsewhere)
+    - Navigates to about:blank
+
+    Chrome clears all storage of an origin through CDP (Storage.clearDataForOrigin).
+    Other browsers can only touch the storage of the current document, so every origin is
+    opened (robots.txt, as in utils.checkpoints) and its localStorage, sessionStorage and
+    cookies are cleared there. What still leaks on those browsers: IndexedDB, Cache Storage
+    and service workers, and any storage of an origin the test only passed through (a
+    redirect hop or a page it navigated away from by clicking a link).
+
+    :param driver: Selenium WebDriver instance
+    :param str main_handle: Window handle to keep; defaults to the first handle
+    :param origins: Further origins (scheme://host[:port]) whose storage must be cleared
+    :raises WebDriverException: If the session is no longer usable
+
+    """
+    handles = driver.window_handles
+    main_handle = main_handle if main_handle in handles else handles[0]
+    visited = list(origins)
+    for handle in handles:
+        driver.switch_to.window(handle)
+        visited.append(_origin(driver.current_url))
+        if handle != main_handle:
+            driver.close()
+    driver.switch_to.window(main_handle)
+    visited = [origin for origin in dict.fromkeys(visited) if origin]
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        for origin in visited:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    else:
+        current = _origin(driver.current_url)
+        for origin in sorted(visited, key=lambda origin: origin != current):
+            if origin != _origin(driver.current_url):
+                driver.get(f"{origin}/robots.txt")
+            try:
+                driver.execute_script(CLEAR_STORAGE_JS)
+            except WebDriverException:
+                # Documents without storage access (e.g. an error page) have nothing to clear
+                pass
+            driver.delete_all_cookies()
+
+    driver.get("about:blank")
+
+
+def _origin(url):
+    """
+    :return: scheme://host[:port] of an http(s) URL, None for about:blank, data: and others
+    :rtype: str
+
+    """
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def is_healthy(driver):
+    """
+    Checks whether a WebDriver session still responds.
+
+    :param driver: Selenium WebDriver instance
+    :return: True if the session answers a cheap command, False otherwise
+    :rtype: bool
+
+    """
+    try:
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions keyed by browser type and options.
+
+    Sessions are leased with acquire() and given back with release(), which resets
+    them for the next test (see reset_driver). While leased, the origins the session
+    navigates to are recorded so their storage is cleared too. A session is only rebuilt
+    when its reset or health check fails.
+
+    :param factory: Callable `factory(browser, **options)` returning a new WebDriver
+    :param int max_idle_per_key: Max idle sessions kept per (browser, options) key
+
+    """
+
+    def __init__(self, factory, max_idle_per_key=1):
+        self.factory = factory
+        self.max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self._leased = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "created": 0,
+            "reused": 0,
+            "rebuilt": 0,
+            "discarded": 0,
+        }
+
+    @staticmethod
+    def make_key(browser, options):
+        return (browser, tuple(sorted(options.items())))
+
+    def acquire(self, browser, **options):
+        """
+        Leases a healthy session for `browser` with the given options,
+        reusing an idle one when available.
+
+        :param str browser: Browser name passed to the factory
+        :return: WebDriver instance
+        :rtype: WebDriver
+
+        """
+        key = self.make_key(browser, options)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            driver, main_handle = entry
+            if is_healthy(driver):
+                self._lease(driver, key, main_handle)
+                self._count("reused")
+                return driver
+            logger.warning("⚠️ Pooled %s session failed health check, rebuilding...", browser)
+            self._quit(driver)
+            self._count("rebuilt")
+
+        driver = self.factory(browser, **options)
+        self._lease(driver, key, driver.current_window_handle)
+        self._count("created")
+        return driver
+
+    def release(self, driver, reuse=True):
+        """
+        Returns a leased session to the pool after resetting it.
+        The session is quit instead if reuse is disabled, the reset fails or the pool is full.
+
+        :param driver: WebDriver previously returned by acquire()
+        :param bool reuse: Keep the session warm for the next lease
+
+        """
+        with self._lock:
+            _, key, main_handle, origins = self._leased.pop(id(driver), (None, None, None, None))
+        if key is None:
+            return
+        remove_command_listener(driver, origins.on_command)
+
+        if reuse:
+            try:
+                reset_driver(driver, main_handle, origins)
+            except WebDriverException as e:
+                logger.warning("⚠️ Driver reset failed, discarding session: %s", e)
+                reuse = False
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if reuse and len(idle) < self.max_idle_per_key:
+                idle.append((driver, main_handle))
+                return
+        self._quit(driver)
+
+    def close(self):
+        """
+        Quits every idle and leased session.
+
+        """
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver, _ in idle]
+            drivers += [driver for driver, _, _, _ in self._leased.values()]
+            self._idle.clear()
+            self._leased.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def summary(self):
+        """
+        :return: Copy of the pool counters
+        :rtype: dict
+
+        """
+        with self._lock:
+            return dict(self.stats)
+
+    def _lease(self, driver, key, main_handle):
+        origins = _VisitedOrigins()
+        add_command_listener(driver, origins.on_command)
+        with self._lock:
+            self._leased[id(driver)] = (driver, key, main_handle, origins)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _quit(self, driver):
+        self._count("discarded")
+        forget_script_timeout(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class _VisitedOrigins(list):
+    """
+    Origins a leased session navigated to with driver.get, in order.
+
+    """
+
+    def on_command(self, command, seconds, params=None, response=None):
+        if command == Command.GET and params:
+            origin = _origin(params.get("url"))
+            if origin and origin not in self:
+                self.append(origin)
@@ -0,0 +1,257 @@
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+DRIVER_NAMES = {"chrome": "chromedriver", "firefox": "geckodriver"}
+
+# Environment variables that pin a driver binary and skip discovery entirely
+DRIVER_PATH_ENV = {"chrome": "CHROMEDRIVER_PATH", "firefox": "GECKODRIVER_PATH"}
+
+BROWSER_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+               "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"),
+    "firefox": ("firefox", "/Applications/Firefox.app/Contents/MacOS/firefox"),
+}
+
+# Lowest Firefox major version supported by each geckodriver minor release
+GECKODRIVER_MIN_FIREFOX = {34: 115, 33: 102, 32: 102, 31: 91, 30: 78}
+
+# Caches of webdriver-manager and Selenium Manager, searched before any download
+DRIVER_CACHE_GLOBS = (
+    "~/.wdm/drivers/{name}/*/*/{name}*",
+    "~/.wdm/drivers/{name}/*/*/*/{name}*",
+    "~/.cache/selenium/{name}/*/*/{name}*",
+)
+
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "insider-ui-tests", "drivers.json")
+
+
+def parse_version(output):
+    """
+    :param str output: Output of `<binary> --version`
+    :return: Version tuple of the first dotted number, or None
+    :rtype: tuple
+
+    """
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?(?:\.(\d+))?", output or "")
+    return tuple(int(part) for part in match.groups() if part is not None) if match else None
+
+
+def binary_version(path):
+    """
+    :param str path: Executable path
+    :return: Version tuple reported by `--version`, or None if it cannot be run
+    :rtype: tuple
+
+    """
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return parse_version(output)
+
+
+def is_compatible(browser, driver_version, browser_version):
+    """
+    ChromeDriver must match the Chrome major version; geckodriver supports a range of Firefox versions.
+    Unknown versions are treated as compatible.
+
+    :rtype: bool
+
+    """
+    if not driver_version or not browser_version:
+        return True
+    if browser == "chrome":
+        return driver_version[0] == browser_version[0]
+    minimum = GECKODRIVER_MIN_FIREFOX.get(driver_version[1] if len(driver_version) > 1 else None)
+    return minimum is None or browser_version[0] >= minimum
+
+
+class DriverResolver:
+    """
+    Finds the WebDriver binary for a browser without hitting the network on every run.
+
+    Resolution order: $CHROMEDRIVER_PATH / $GECKODRIVER_PATH, the on-disk cache (valid while
+    it is younger than `ttl` and neither the driver nor the browser binary changed), local
+    binaries (PATH, webdriver-manager and Selenium Manager caches) whose version matches the
+    installed browser, and finally a webdriver-manager download unless `offline`.
+    Results are also memoized in-process, so repeated lookups in a session are free.
+
+    :param str cache_path: JSON file holding resolved drivers
+    :param float ttl: Seconds a cached resolution stays valid
+    :param bool offline: Never download; return None when nothing local matches
+                         (Selenium then falls back to its own driver lookup)
+
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, ttl=7 * 24 * 3600, offline=False):
+        self.cache_path = os.path.expanduser(cache_path)
+        self.ttl = ttl
+        self.offline = offline
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, browser):
+        """
+        :param str browser: "chrome" or "firefox"
+        :return: Path of a compatible driver binary, or None to let Selenium decide
+        :rtype: str
+
+        """
+        if browser not in DRIVER_NAMES:
+            raise ValueError(f"Unsupported browser '{browser}', expected one of {tuple(DRIVER_NAMES)}")
+        pinned = os.getenv(DRIVER_PATH_ENV[browser])
+        if pinned:
+            return pinned
+        with self._lock:
+            if browser not in self._resolved:
+                self._resolved[browser] = self._resolve(browser)
+            return self._resolved[browser]
+
+    def _resolve(self, browser):
+        cache = self._load_cache()
+        browser_binary = find_browser_binary(browser)
+        entry = cache.get(browser)
+        if entry and self._is_fresh(entry, browser_binary):
+            return entry["driver_path"]
+
+        browser_version = binary_version(browser_binary) if browser_binary else None
+        driver_path, driver_version = self._find_local(browser, browser_version)
+        if driver_path is None and not self.offline:
+            driver_path = self._download(browser)
+            driver_version = binary_version(driver_path) if driver_path else None
+        if driver_path is None:
+            logger.warning("⚠️ No local %s found, leaving driver lookup to Selenium", DRIVER_NAMES[browser])
+            return None
+
+        cache[browser] = {
+            "driver_path": driver_path,
+            "driver_version": ".".join(map(str, driver_version or ())),
+            "driver_mtime": os.path.getmtime(driver_path),
+            "browser_path": browser_binary,
+            "browser_version": ".".join(map(str, browser_version or ())),
+            "browser_mtime": os.path.getmtime(browser_binary) if browser_binary else None,
+            "resolved_at": time.time(),
+        }
+        self._save_cache(cache)
+        logger.info("🔧 Resolved %s %s: %s", DRIVER_NAMES[browser], cache[browser]["driver_version"], driver_path)
+        return driver_path
+
+    def _is_fresh(self, entry, browser_binary):
+        # Only stat() calls: a browser or driver update changes the mtime and invalidates the entry
+        try:
+            if time.time() - entry["resolved_at"] > self.ttl:
+                return False
+            if os.path.getmtime(entry["driver_path"]) != entry["driver_mtime"]:
+                return False
+            if entry["browser_path"] != browser_binary:
+                return False
+            return browser_binary is None or os.path.getmtime(browser_binary) == entry["browser_mtime"]
+        except (OSError, KeyError):
+            return False
+
+    def _find_local(self, browser, browser_version):
+        best = (None, None)
+        for path in local_driver_candidates(DRIVER_NAMES[browser]):
+            version = binary_version(path)
+            if not is_compatible(browser, version, browser_version):
+                continue
+            if best[0] is None or (version or ()) > (best[1] or ()):
+                best = (path, version)
+        return best
+
+    @staticmethod
+    def _download(browser):
+        try:
+            if browser == "chrome":
+                from webdriver_manager.chrome import ChromeDriverManager
+                return ChromeDriverManager().install()
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        except Exception as e:
+            logger.error("❌ Driver download failed for %s: %s", browser, e)
+            return None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, self.cache_path)
+
+
+def find_browser_binary(browser):
+    """
+    :param str browser: "chrome" or "firefox"
+    :return: Path of the installed browser, or None
+    :rtype: str
+
+    """
+    for candidate in BROWSER_BINARIES[browser]:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def local_driver_candidates(name):
+    """
+    :param str name: Driver executable name ("chromedriver" or "geckodriver")
+    :return: Executable driver binaries on PATH and in driver manager caches
+    :rtype: list
+
+    """
+    suffix = ".exe" if sys.platform.startswith("win") else ""
+    candidates = []
+    on_path = shutil.which(name)
+    if on_path:
+        candidates.append(on_path)
+    for pattern in DRIVER_CACHE_GLOBS:
+        for path in glob.glob(os.path.expanduser(pattern.format(name=name))):
+            if os.path.basename(path) == name + suffix and os.access(path, os.X_OK):
+                candidates.append(path)
+    return list(dict.fromkeys(candidates))
+
+
+_default_resolver = DriverResolver()
+
+
+def configure_driver_resolver(**kwargs):
+    """
+    Replaces the resolver used by resolve_driver (e.g. from pytest options).
+
+    :param kwargs: DriverResolver arguments
+    :return: The new resolver
+    :rtype: DriverResolver
+
+    """
+    global _default_resolver
+    _default_resolver = DriverResolver(**kwargs)
+    return _default_resolver
+
+
+def resolve_driver(browser):
+    """
+    :param str browser: "chrome" or "firefox"
+    :return: Path of a compatible driver binary, or None to let Selenium decide
+    :rtype: str
+
+    """
+    return _default_resolver.resolve(browser)
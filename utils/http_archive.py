@@ -0,0 +1,344 @@
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Headers that describe a single connection and must not be replayed or forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailer", "transfer-encoding", "upgrade", "content-length",
+}
+
+# Query parameters that only bust caches; ignored when matching requests
+VOLATILE_QUERY_PARAMS = {"_", "cb", "_ga", "_gl"}
+
+
+def archive_key(method, url, body=b""):
+    """
+    Builds the lookup key of a request: method, URL without volatile query params
+    and a hash of the request body.
+
+    :param str method: HTTP method
+    :param str url: Absolute request URL
+    :param bytes body: Request body
+    :return: Archive key
+    :rtype: str
+
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k not in VOLATILE_QUERY_PARAMS))
+    normalized = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or "/", query, ""))
+    key = f"{method.upper()} {normalized}"
+    if body:
+        key += f" {hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class HttpArchive:
+    """
+    On-disk archive of recorded HTTP responses.
+
+    Layout: `<path>/index.json` maps request keys to the list of responses recorded for them
+    (in order); bodies are stored once per content hash under `<path>/bodies/`. A key
+    recorded again replaces the responses an earlier recording left for it.
+
+    :param str path: Archive directory
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._recorded = set()
+        self._lock = threading.Lock()
+        index = self._index_path()
+        if os.path.exists(index):
+            with open(index) as f:
+                self.entries = json.load(f)["entries"]
+
+    def add(self, key, status, reason, headers, body, occurrence=None):
+        """
+        Records a response for a request key.
+
+        :param str key: Key from archive_key()
+        :param int status: HTTP status code
+        :param str reason: HTTP reason phrase
+        :param headers: List of (name, value) response headers
+        :param bytes body: Response body (as received, possibly content-encoded)
+        :param int occurrence: Zero-based request count for this key; None appends
+
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            with open(body_path, "wb") as f:
+                f.write(body)
+        response = {
+            "status": status,
+            "reason": reason,
+            "headers": [[name, value] for name, value in headers if name.lower() not in HOP_BY_HOP_HEADERS],
+            "body": digest,
+        }
+        with self._lock:
+            if key not in self._recorded:
+                self._recorded.add(key)
+                self.entries[key] = []
+            responses = self.entries[key]
+            if occurrence is None:
+                responses.append(response)
+            else:
+                # Concurrent requests for a key may complete out of order
+                responses.extend([response] * (occurrence + 1 - len(responses)))
+                responses[occurrence] = response
+
+    def get(self, key, occurrence=0):
+        """
+        Returns the response recorded for the n-th request with this key.
+        Later occurrences than recorded repeat the last response.
+
+        :param str key: Key from archive_key()
+        :param int occurrence: Zero-based request count for this key
+        :return: (status, reason, headers, body) or None if the key was never recorded
+        :rtype: tuple
+
+        """
+        responses = self.entries.get(key)
+        if not responses:
+            return None
+        response = responses[min(occurrence, len(responses) - 1)]
+        with open(self._body_path(response["body"]), "rb") as f:
+            body = f.read()
+        return response["status"], response["reason"], response["headers"], body
+
+    def save(self):
+        """
+        Writes the index, merging keys recorded by other processes since it was loaded.
+
+        """
+        os.makedirs(self.path, exist_ok=True)
+        index = self._index_path()
+        with self._lock:
+            entries = dict(self.entries)
+        if os.path.exists(index):
+            with open(index) as f:
+                on_disk = json.load(f)["entries"]
+            entries = {**on_disk, **entries}
+        tmp = index + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "entries": entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, index)
+
+    def _index_path(self):
+        return os.path.join(self.path, "index.json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.path, "bodies", digest[:2], digest)
+
+
+def ensure_proxy_certificate(directory):
+    """
+    Returns a self-signed certificate/key pair used to terminate intercepted HTTPS,
+    creating it with the openssl CLI on first use. Browsers accept it because sessions
+    using the proxy are started with acceptInsecureCerts.
+
+    :param str directory: Where to keep proxy-cert.pem / proxy-key.pem
+    :return: (cert_path, key_path)
+    :rtype: tuple
+
+    """
+    cert = os.path.join(directory, "proxy-cert.pem")
+    key = os.path.join(directory, "proxy-key.pem")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        os.makedirs(directory, exist_ok=True)
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+             "-subj", "/CN=insider-ui-tests archive proxy", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+    return cert, key
+
+
+class _ArchiveProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    _tunnel_host = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_CONNECT(self):
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            tls = self.server.tls_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        self.connection = tls
+        self.rfile = tls.makefile("rb", self.rbufsize)
+        self.wfile = tls.makefile("wb", 0)
+        self._tunnel_host = self.path
+        self.close_connection = False
+
+    def do_GET(self):
+        self._handle()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = do_GET
+
+    def _handle(self):
+        url = self._absolute_url()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        key = archive_key(self.command, url, body)
+
+        if self.server.mode == "record":
+            occurrence = self.server.next_occurrence(key)
+            response = self._forward(url, body)
+            if response is None:
+                return
+            self.server.archive.add(key, *response, occurrence=occurrence)
+        else:
+            response = self.server.archive.get(key, self.server.next_occurrence(key))
+            if response is None:
+                self.server.count("misses")
+                self._reply(504, "Not In Archive", [("Content-Type", "text/plain")],
+                            f"Not recorded in HTTP archive: {key}".encode())
+                return
+        self.server.count("requests")
+        self._reply(*response)
+
+    def _absolute_url(self):
+        if self._tunnel_host:
+            host = self._tunnel_host
+            if host.endswith(":443"):
+                host = host[:-4]
+            return f"https://{host}{self.path}"
+        return self.path
+
+    def _forward(self, url, body):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.netloc, timeout=self.server.upstream_timeout)
+        path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS}
+        try:
+            connection.request(self.command, path, body=body or None, headers=headers)
+            upstream = connection.getresponse()
+            data = upstream.read()
+        except OSError as e:
+            self.server.count("errors")
+            self._reply(502, "Bad Gateway", [("Content-Type", "text/plain")], str(e).encode())
+            return None
+        finally:
+            connection.close()
+        return upstream.status, upstream.reason, upstream.getheaders(), data
+
+    def _reply(self, status, reason, headers, body):
+        self.send_response(status, reason)
+        for name, value in headers:
+            if name.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class ArchiveProxy:
+    """
+    Local HTTP(S) proxy that records responses into an HttpArchive or replays them from it.
+
+    - record: forwards every request to the live site and stores the response
+    - replay: serves responses from the archive only (no network); unknown requests get 504.
+      The n-th request for a key gets the n-th recorded response, so replays are deterministic.
+      Requests are counted per test (see reset_occurrences), in both modes, so a test gets
+      the same responses whichever tests ran before it on the worker.
+
+    HTTPS is intercepted by terminating TLS with a self-signed certificate kept next to the archive.
+
+    :param HttpArchive archive: Archive to record into or replay from
+    :param str mode: "record" or "replay"
+    :param str host: Interface to listen on
+    :param int port: Port to listen on (0 picks a free one)
+    :param float upstream_timeout: Timeout for live requests in record mode
+
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, archive, mode="replay", host="127.0.0.1", port=0, upstream_timeout=30):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown archive mode '{mode}', expected one of {self.MODES}")
+        self.archive = archive
+        self.mode = mode
+        self._server = ThreadingHTTPServer((host, port), _ArchiveProxyHandler)
+        self._server.daemon_threads = True
+        self._server.archive = archive
+        self._server.mode = mode
+        self._server.upstream_timeout = upstream_timeout
+        self._server.stats = {"requests": 0, "misses": 0, "errors": 0}
+        self._server.occurrences = {}
+        self._lock = threading.Lock()
+        self._server.count = self._count
+        self._server.next_occurrence = self._next_occurrence
+
+        cert, key = ensure_proxy_certificate(archive.path)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        context.set_alpn_protocols(["http/1.1"])
+        self._server.tls_context = context
+        self._thread = threading.Thread(target=self._server.serve_forever, name="archive-proxy", daemon=True)
+
+    @property
+    def address(self):
+        """
+        :return: "host:port" the proxy listens on
+        :rtype: str
+
+        """
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(self._server.stats)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the proxy and, in record mode, saves the archive index.
+
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self.mode == "record":
+            self.archive.save()
+
+    def reset_occurrences(self):
+        """
+        Starts counting requests per key from zero again; call it before every test.
+
+        """
+        with self._lock:
+            self._server.occurrences.clear()
+
+    def _count(self, key):
+        with self._lock:
+            self._server.stats[key] += 1
+
+    def _next_occurrence(self, key):
+        with self._lock:
+            occurrence = self._server.occurrences.get(key, 0)
+            self._server.occurrences[key] = occurrence + 1
+            return occurrence
@@ -0,0 +1,110 @@
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Servers that do not implement HEAD answer with one of these; the link is retried with GET
+HEAD_UNSUPPORTED = (405, 501)
+
+
+class _SameMethodRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """
+    Follows redirects of a HEAD request with HEAD; urllib's default handler turns them into
+    GET requests that download every redirect target's body.
+
+    """
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        redirect = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if redirect is not None and req.get_method() == "HEAD":
+            redirect.method = "HEAD"
+        return redirect
+
+
+_opener = urllib.request.build_opener(_SameMethodRedirectHandler)
+
+
+class LinkResult:
+    """
+    Outcome of resolving one link outside the browser.
+
+    :param str url: Requested URL
+    :param int status: Final HTTP status, or None if no response was received
+    :param str final_url: URL after redirects
+    :param float seconds: Time to resolve the link
+    :param str error: Connection error, if any
+
+    """
+
+    __slots__ = ("url", "status", "final_url", "seconds", "error")
+
+    def __init__(self, url, status=None, final_url=None, seconds=0.0, error=None):
+        self.url = url
+        self.status = status
+        self.final_url = final_url or url
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.status is not None and 200 <= self.status < 400
+
+    def __repr__(self):
+        return f"LinkResult({self.url!r}, status={self.status}, final_url={self.final_url!r})"
+
+
+def resolve_link(url, timeout=10, headers=None):
+    """
+    Resolves a link with a HEAD request, following redirects with HEAD too. Falls back to
+    GET (body not read) when the server does not support HEAD.
+
+    :param str url: Absolute URL
+    :param float timeout: Socket timeout in seconds
+    :param dict headers: Extra request headers (e.g. the browser's User-Agent)
+    :return: Status and final URL of the link
+    :rtype: LinkResult
+
+    """
+    started = time.perf_counter()
+    method = "HEAD"
+    while True:
+        request = urllib.request.Request(url, headers=dict(headers or {}), method=method)
+        try:
+            with _opener.open(request, timeout=timeout) as response:
+                return LinkResult(url, response.status, response.url, time.perf_counter() - started)
+        except urllib.error.HTTPError as e:
+            if method == "HEAD" and e.code in HEAD_UNSUPPORTED:
+                method = "GET"
+                continue
+            return LinkResult(url, e.code, e.url, time.perf_counter() - started)
+        except (urllib.error.URLError, OSError) as e:
+            reason = getattr(e, "reason", e)
+            return LinkResult(url, seconds=time.perf_counter() - started, error=str(reason))
+
+
+def check_links(urls, concurrency=16, timeout=10, headers=None):
+    """
+    Resolves links concurrently over HTTP instead of opening a browser tab per link.
+    Duplicate URLs are requested once.
+
+    :param urls: Absolute URLs
+    :param int concurrency: Max requests in flight
+    :param float timeout: Socket timeout per request in seconds
+    :param dict headers: Extra request headers sent with every request
+    :return: One result per distinct URL, in input order
+    :rtype: list
+
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique)), thread_name_prefix="link-check") as pool:
+        results = list(pool.map(lambda url: resolve_link(url, timeout, headers), unique))
+    logger.debug("🔗 Resolved %d links in %.2fs (%d failed)", len(results),
+                 time.perf_counter() - started, sum(not result.ok for result in results))
+    return results
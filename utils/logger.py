@@ -1,11 +1,186 @@
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+from contextlib import contextmanager
+
+ROOT_LOGGER = "insider_ui"
+
+_log_context = contextvars.ContextVar("log_context", default={})
+_listener = None
+
 
 def get_logger(name="test_logger"):
-    logger = logging.getLogger(name)
-    if not logger.hasHandlers():
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
\ No newline at end of file
+    """
+    Returns a logger under the "insider_ui" hierarchy.
+
+    Use %-style arguments (`logger.debug("Card %d: %s", index, text)`) so messages are only
+    formatted when the level is enabled. Records carry the per-test context (see log_context)
+    and propagate to the root logger, where pytest captures them per test phase.
+
+    :param str name: Logger name, usually the module's __name__
+    :rtype: logging.Logger
+
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Adds fields (e.g. browser, test_id) to every record logged inside the block.
+
+    """
+    token = bind_log_context(**fields)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def bind_log_context(**fields):
+    """
+    Adds fields to the log context until the returned token is reset.
+
+    :return: contextvars token for unbind_log_context
+    :rtype: contextvars.Token
+
+    """
+    return _log_context.set({**_log_context.get(), **fields})
+
+
+def unbind_log_context(token):
+    _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the log context and the current page-object step (utils.tracing) onto the record.
+    Handler filters only run for records that passed level gating, so disabled levels cost nothing here.
+
+    """
+
+    def filter(self, record):
+        for key, value in _log_context.get().items():
+            setattr(record, key, value)
+        if not hasattr(record, "step"):
+            from utils.tracing import current_tracer
+            tracer = current_tracer()
+            span = tracer.current_span() if tracer else None
+            record.step = span.name if span else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, context fields and
+    any `extra={"fields": {...}}` passed to the logging call.
+
+    """
+
+    CONTEXT_FIELDS = ("test_id", "browser", "worker_id", "step")
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in self.CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() runs the formatter on the calling thread; only resolve the message
+    # (so mutable args are captured) and leave formatting to the listener thread.
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _BlockingStopListener(logging.handlers.QueueListener):
+    # The bounded queue may be full at shutdown: wait for room instead of raising queue.Full
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(level="INFO", json_path=None, console=False, queue_size=10000):
+    """
+    Sets up the "insider_ui" logger: level gating, context enrichment and a non-blocking
+    queue feeding the JSON-lines file and/or console handlers on a listener thread.
+
+    :param level: Minimum level of "insider_ui" records
+    :param str json_path: Optional file receiving JSON lines
+    :param bool console: Also write human-readable lines to stderr (outside pytest)
+    :param int queue_size: Max queued records; when full, records are dropped instead of blocking
+    :return: The configured logger
+    :rtype: logging.Logger
+
+    """
+    global _listener
+    shutdown_logging()
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+
+    handlers = []
+    if json_path:
+        os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+        file_handler = logging.FileHandler(json_path, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s"))
+        handlers.append(stream_handler)
+    if handlers:
+        records = queue.Queue(maxsize=queue_size)
+        queue_handler = _DeferredQueueHandler(records)
+        queue_handler.enqueue = lambda record: _put_nowait(records, record)
+        # Handler filters run on the logging thread, where the context variables live
+        queue_handler.addFilter(ContextFilter())
+        logger.addHandler(queue_handler)
+        _listener = _BlockingStopListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """
+    Detaches the queue handler, flushes queued records and stops the listener thread.
+
+    """
+    global _listener
+    logger = logging.getLogger(ROOT_LOGGER)
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _put_nowait(records, record):
+    try:
+        records.put_nowait(record)
+    except queue.Full:
+        pass
+
+
+atexit.register(shutdown_logging)
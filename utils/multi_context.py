@@ -0,0 +1,371 @@
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+from utils.logger import get_logger, log_context
+from utils.page_metrics import PageMetricsCollector, current_collector
+from utils.tracing import Tracer, add_command_listener, current_tracer, remove_command_listener
+
+logger = get_logger(__name__)
+
+ISOLATION_MODES = ("auto", "contexts", "tabs")
+# Max seconds one flow's in-page wait holds the shared session (see EventWaiter.wait_slice)
+DEFAULT_WAIT_SLICE = 0.25
+# Owner of the window the session had before the flows; no flow can claim it
+_HOME_OWNER = "<home>"
+
+
+class _SharedSession:
+    """
+    State shared by every WindowBoundDriver of one WebDriver session: the lock that
+    serializes commands, the window WebDriver currently targets and which flow owns
+    which window.
+
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.current = driver.current_window_handle
+        self.owners = {}
+        self.switches = 0
+
+
+class WindowBoundDriver:
+    """
+    WebDriver stand-in bound to one window of a shared session. Every command first
+    switches the session to the flow's window (only when another flow used it last) and
+    runs under the session lock, so page objects built on BasePage work unchanged while
+    other flows drive other windows of the same browser.
+
+    - window_handles only lists the flow's own windows and windows nobody claimed yet
+      (e.g. a tab the flow just opened); switching to one claims it
+    - WebElements it returns are bound to it too, so element commands also switch and lock
+    - quit() is refused: the session belongs to the FlowScheduler
+    - Frame switches do not survive other flows' commands; flows must not rely on them
+
+    Do not pass it to utils.tracing.add_command_listener: listeners belong on the real driver.
+
+    :param _SharedSession session: Session shared with the other flows
+    :param str handle: Window the flow starts in
+    :param str name: Flow name
+    :param float wait_slice: Max seconds a single wait holds the session
+
+    """
+
+    def __init__(self, session, handle, name, wait_slice=DEFAULT_WAIT_SLICE):
+        self._session = session
+        self.main_handle = self.handle = handle
+        self.name = name
+        self.wait_slice = wait_slice
+        session.owners[handle] = name
+
+    def __getattr__(self, name):
+        session = self._session
+        with session.lock:
+            self._activate()
+            value = getattr(session.driver, name)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def bound(*args, **kwargs):
+            with session.lock:
+                self._activate()
+                return self._rebind(value(*args, **kwargs))
+
+        return bound
+
+    def _rebind(self, value):
+        """
+        Points WebElements of a command's result (also inside lists and dicts, e.g. the raw
+        response of execute) at this driver, so their own commands (click, send_keys, text)
+        take the session lock and run in the flow's window too.
+
+        """
+        if isinstance(value, WebElement):
+            value._parent = self
+        elif isinstance(value, list):
+            for item in value:
+                self._rebind(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                self._rebind(item)
+        return value
+
+    def _activate(self):
+        session = self._session
+        if session.current != self.handle:
+            session.driver.switch_to.window(self.handle)
+            session.current = self.handle
+            session.switches += 1
+
+    @property
+    def window_handles(self):
+        session = self._session
+        with session.lock:
+            handles = session.driver.window_handles
+        visible = [handle for handle in handles if handle != self.main_handle
+                   and session.owners.get(handle) in (None, self.name)]
+        return ([self.main_handle] if self.main_handle in handles else []) + visible
+
+    @property
+    def current_window_handle(self):
+        return self.handle
+
+    @property
+    def switch_to(self):
+        return _BoundSwitchTo(self)
+
+    def close(self):
+        session = self._session
+        with session.lock:
+            self._activate()
+            session.driver.close()
+            session.owners.pop(self.handle, None)
+            session.current = None
+            closed, self.handle = self.handle, self.main_handle
+            if closed == self.main_handle:
+                self.handle = None
+
+    def quit(self):
+        raise WebDriverException(f"Flow '{self.name}' shares its session; close the FlowScheduler instead")
+
+
+class _BoundSwitchTo:
+    """
+    switch_to of a WindowBoundDriver: window switches rebind the flow instead of the session.
+
+    """
+
+    def __init__(self, bound):
+        self._bound = bound
+
+    def window(self, handle):
+        bound, session = self._bound, self._bound._session
+        with session.lock:
+            owner = session.owners.setdefault(handle, bound.name)
+            if owner != bound.name:
+                raise WebDriverException(f"Window {handle} belongs to flow '{owner}'")
+            bound.handle = handle
+            bound._activate()
+
+    def new_window(self, type_hint=None):
+        bound, session = self._bound, self._bound._session
+        with session.lock:
+            bound._activate()
+            session.driver.switch_to.new_window(type_hint)
+            bound.handle = session.current = session.driver.current_window_handle
+            session.owners[bound.handle] = bound.name
+
+    def __getattr__(self, name):
+        return getattr(WindowBoundDriver.__getattr__(self._bound, "switch_to"), name)
+
+
+class FlowResult:
+    """
+    Outcome of one flow run by FlowScheduler.run.
+
+    :param str name: Flow name
+    :param value: Return value of the flow
+    :param Exception error: Exception raised by the flow, if any
+    :param float seconds: Wall time of the flow
+
+    """
+
+    __slots__ = ("name", "value", "error", "seconds")
+
+    def __init__(self, name, value=None, error=None, seconds=0.0):
+        self.name = name
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.error is None and self.value is not False
+
+    def __repr__(self):
+        return f"FlowResult({self.name!r}, value={self.value!r}, error={self.error!r})"
+
+
+class FlowScheduler:
+    """
+    Runs independent page-object flows concurrently in one WebDriver session, one window
+    per flow, instead of launching a browser per flow.
+
+    - "contexts": every flow gets its own browser context (separate cookies, storage and
+      cache, like an incognito window) through CDP; Chromium only
+    - "tabs": every flow gets a tab of the default context; cookies are shared
+    - "auto": contexts where supported, tabs otherwise
+
+    Flows run on threads and their WebDriver commands are serialized by the session lock;
+    waits are cut into `wait_slice` pieces, so while one flow waits for its page the others
+    keep driving theirs.
+
+    :param driver: Selenium WebDriver instance (e.g. leased from the DriverPool)
+    :param str isolation: "auto", "contexts" or "tabs"
+    :param prepare: Optional callable run with every new flow driver (e.g. consent cookies)
+    :param float wait_slice: Max seconds a single wait holds the session
+
+    """
+
+    def __init__(self, driver, isolation="auto", prepare=None, wait_slice=DEFAULT_WAIT_SLICE):
+        if isolation not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation '{isolation}', expected one of {ISOLATION_MODES}")
+        self.driver = driver
+        self.isolation = isolation
+        self.prepare = prepare
+        self.wait_slice = wait_slice
+        self._session = _SharedSession(driver)
+        self._home = self._session.current
+        self._session.owners[self._home] = _HOME_OWNER
+        self._contexts = []
+        self.flows = {}
+        self.stats = {"contexts": 0, "tabs": 0}
+
+    @property
+    def switches(self):
+        return self._session.switches
+
+    def open_flow(self, name):
+        """
+        Opens a window for a flow and returns the driver page objects of the flow use.
+
+        :param str name: Flow name, unique per scheduler
+        :return: Driver bound to the flow's window
+        :rtype: WindowBoundDriver
+        :raises WebDriverException: If isolation is "contexts" and the browser has none
+
+        """
+        if name in self.flows:
+            raise ValueError(f"Flow '{name}' is already open")
+        with self._session.lock:
+            handle = self._open_window()
+        flow_driver = WindowBoundDriver(self._session, handle, name, self.wait_slice)
+        self.flows[name] = flow_driver
+        if self.prepare is not None:
+            self.prepare(flow_driver)
+        return flow_driver
+
+    def _open_window(self):
+        driver = self.driver
+        if self.isolation != "tabs":
+            handle = self._open_context()
+            if handle is not None:
+                return handle
+            if self.isolation == "contexts":
+                raise WebDriverException("Browser contexts need a Chromium session (execute_cdp_cmd)")
+        if self._session.current is None:
+            driver.switch_to.window(self._home)
+        driver.switch_to.new_window("tab")
+        self._session.current = driver.current_window_handle
+        self.stats["tabs"] += 1
+        return self._session.current
+
+    def _open_context(self):
+        """
+        :return: Window handle of a page in a new browser context, or None if not supported
+        :rtype: str
+
+        """
+        driver = self.driver
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return None
+        try:
+            context = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            self._contexts.append(context)
+            target = driver.execute_cdp_cmd("Target.createTarget",
+                                            {"url": "about:blank", "browserContextId": context})["targetId"]
+        except WebDriverException as e:
+            logger.warning("⚠️ Browser context not available, using tabs: %s", e)
+            return None
+        # ChromeDriver uses the DevTools target id as window handle
+        if target not in driver.window_handles:
+            logger.warning("⚠️ Context page %s is not a window of this session, using tabs", target)
+            return None
+        self.stats["contexts"] += 1
+        return target
+
+    def run(self, flows):
+        """
+        Runs flows concurrently, each with its own window and driver. A flow is a callable
+        taking its WindowBoundDriver; its exceptions are captured in its result. Step spans
+        of the flows are added to the test's tracer and their page metrics (see
+        utils.page_metrics) to the test's collector.
+
+        :param dict flows: {name: callable(flow_driver)}
+        :return: {name: FlowResult}
+        :rtype: dict
+
+        """
+        if not flows:
+            return {}
+        flow_drivers = {name: self.open_flow(name) for name in flows}
+        parent = current_tracer()
+        switches = self.switches
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(flows), thread_name_prefix="flow") as pool:
+            futures = {
+                name: pool.submit(contextvars.copy_context().run, self._run_flow, name, flow, flow_drivers[name], parent)
+                for name, flow in flows.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        logger.info("🗂 %d flows in one session: %.2fs, %d window switches, %d failed", len(results),
+                    time.perf_counter() - started, self.switches - switches,
+                    sum(not result.ok for result in results.values()))
+        return results
+
+    @staticmethod
+    def _run_flow(name, flow, flow_driver, parent):
+        # The flow runs in a copy of the test's context: give it its own tracer and page
+        # metrics collector, bound to its window, instead of the test's
+        driver = flow_driver._session.driver
+        tracer = Tracer(f"{parent.name}[{name}]" if parent else name)
+        add_command_listener(driver, tracer.on_command)
+        tracer.activate()
+        collector = current_collector()
+        page_metrics = PageMetricsCollector(flow_driver, collector.timeout).activate() if collector else None
+        started = time.perf_counter()
+        value = error = None
+        with log_context(flow=name):
+            try:
+                value = flow(flow_driver)
+            except Exception as e:
+                logger.error("❌ Flow '%s' failed: %s", name, e)
+                error = e
+        if page_metrics is not None:
+            page_metrics.deactivate()
+            collector.records.extend(page_metrics.records)
+        tracer.deactivate()
+        remove_command_listener(driver, tracer.on_command)
+        if parent is not None:
+            parent.merge(tracer)
+        return FlowResult(name, value, error, time.perf_counter() - started)
+
+    def close(self):
+        """
+        Closes every flow window, disposes the browser contexts and switches back to the
+        window the session had before. The session itself stays open.
+
+        """
+        driver = self.driver
+        with self._session.lock:
+            for handle in driver.window_handles:
+                if handle != self._home:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(self._home)
+            self._session.current = self._home
+            for context in self._contexts:
+                try:
+                    driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context})
+                except WebDriverException as e:
+                    logger.warning("⚠️ Browser context %s not disposed: %s", context, e)
+            self._contexts.clear()
+            self._session.owners = {self._home: _HOME_OWNER}
+            self.flows.clear()
@@ -0,0 +1,175 @@
+import contextvars
+import functools
+
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+_active_collector = contextvars.ContextVar("active_page_metrics", default=None)
+
+# Installed before page scripts run (Chrome, via CDP) so LCP, layout shifts and long tasks
+# are observed from the start of every document.
+OBSERVER_JS = """
+(function () {
+    if (window.__uiPerf) return;
+    var perf = window.__uiPerf = {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0};
+    function observe(type, handle) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(handle); })
+                .observe({type: type, buffered: true});
+        } catch (e) { /* entry type not supported by this browser */ }
+    }
+    observe('largest-contentful-paint', function (e) { perf.lcp = e.renderTime || e.startTime; });
+    observe('layout-shift', function (e) { if (!e.hadRecentInput) perf.cls += e.value; });
+    observe('longtask', function (e) { perf.longTasks += 1; perf.longTaskMs += e.duration; });
+})();
+"""
+
+# Async script: waits for a document other than `previous` (by timeOrigin) to finish loading,
+# then reads Navigation Timing, paint, resource sizes and the observer values.
+COLLECT_JS = OBSERVER_JS + """
+var previous = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+function read() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    var paint = {};
+    performance.getEntriesByType('paint').forEach(function (e) { paint[e.name] = e.startTime; });
+    var resources = performance.getEntriesByType('resource');
+    function ms(value) { return value > 0 ? value : null; }
+    return {
+        url: location.href,
+        time_origin: performance.timeOrigin,
+        navigation_type: nav.type,
+        dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+        connect_ms: nav.connectEnd - nav.connectStart,
+        ttfb_ms: ms(nav.responseStart),
+        response_ms: nav.responseEnd - nav.responseStart,
+        dom_interactive_ms: ms(nav.domInteractive),
+        dom_content_loaded_ms: ms(nav.domContentLoadedEventEnd),
+        load_ms: ms(nav.loadEventEnd),
+        fcp_ms: paint['first-contentful-paint'] || null,
+        lcp_ms: window.__uiPerf.lcp,
+        cls: window.__uiPerf.cls,
+        long_tasks: window.__uiPerf.longTasks,
+        long_task_ms: window.__uiPerf.longTaskMs,
+        document_transfer_bytes: nav.transferSize || 0,
+        resources: resources.length,
+        resource_transfer_bytes: resources.reduce(function (sum, e) { return sum + (e.transferSize || 0); }, 0)
+    };
+}
+(function poll() {
+    var fresh = performance.timeOrigin !== previous && document.readyState === 'complete';
+    if (fresh || Date.now() > deadline) {
+        // One more tick so buffered observer callbacks have run
+        return setTimeout(function () { done(fresh ? read() : null); }, 50);
+    }
+    setTimeout(poll, 100);
+})();
+"""
+
+
+def current_collector():
+    """
+    :return: The PageMetricsCollector of the running test, or None when collection is off
+    :rtype: PageMetricsCollector
+
+    """
+    return _active_collector.get()
+
+
+def capture_page_metrics(step):
+    """
+    Collects browser performance metrics for the current document if a collector is active.
+    Use it inside page-object methods after a navigation; see measure_navigation.
+
+    :param str step: Name of the navigation step (e.g. "lever_job")
+    :return: Metrics dict, or None if collection is off or failed
+
+    """
+    collector = _active_collector.get()
+    return collector.collect(step) if collector else None
+
+
+def measure_navigation(step):
+    """
+    Decorator collecting page metrics after a page-object method that navigates.
+
+    :param str step: Name of the navigation step (e.g. "home")
+
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            capture_page_metrics(step)
+            return result
+        return wrapper
+    return decorator
+
+
+class PageMetricsCollector:
+    """
+    Reads Navigation Timing, first/largest contentful paint, CLS, long tasks and transfer
+    sizes of each navigation step through the browser's Performance APIs.
+
+    On Chrome the observers are injected into every new document through CDP, so long tasks
+    and layout shifts are seen from the first byte; other browsers get them from the
+    buffered entries when the metrics are collected.
+
+    :param driver: Selenium WebDriver instance
+    :param float timeout: Max seconds to wait for a new document to finish loading
+
+    """
+
+    def __init__(self, driver, timeout=10):
+        self.driver = driver
+        self.timeout = timeout
+        self.records = []
+        self._previous_origin = None
+        self._token = None
+
+    def activate(self):
+        """
+        Installs the observers and makes this the collector used by capture_page_metrics.
+
+        """
+        if hasattr(self.driver, "execute_cdp_cmd") and not getattr(self.driver, "_ui_perf_observers", False):
+            try:
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_JS})
+                self.driver._ui_perf_observers = True
+            except WebDriverException:
+                pass
+        self._token = _active_collector.set(self)
+        return self
+
+    def deactivate(self):
+        if self._token is not None:
+            _active_collector.reset(self._token)
+            self._token = None
+
+    def collect(self, step, attempts=3):
+        """
+        Waits for the document loaded by the step and records its metrics.
+        Retries when the script is interrupted by the navigation itself.
+
+        :param str step: Navigation step name
+        :param int attempts: Max script attempts
+        :return: Metrics dict with "step", or None if no new document loaded in time
+
+        """
+        for _ in range(attempts):
+            try:
+                metrics = self.driver.execute_async_script(COLLECT_JS, self._previous_origin, self.timeout * 1000)
+                break
+            except WebDriverException:
+                metrics = None
+        if not metrics:
+            logger.warning("⚠️ Page metrics not available for step: %s", step)
+            return None
+        self._previous_origin = metrics.pop("time_origin")
+        metrics["step"] = step
+        self.records.append(metrics)
+        return metrics
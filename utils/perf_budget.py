@@ -0,0 +1,220 @@
+import json
+import math
+import os
+import threading
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+MODES = ("off", "warn", "fail")
+
+
+class PerfBudgetWarning(UserWarning):
+    """
+    Issued for a budget violation in "warn" mode.
+
+    """
+
+
+def percentile(values, q):
+    """
+    Linear-interpolated percentile.
+
+    :param values: Samples
+    :param float q: Percentile between 0 and 100
+    :return: The percentile, or None for no samples
+    :rtype: float
+
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class FileBaselineStore:
+    """
+    Local JSON history of durations per (browser, name), newest last, capped at `keep` runs.
+    Works without InfluxDB and is merged with the file on disk when saved, so several
+    pytest-xdist workers can share it.
+
+    :param str path: JSON file path
+    :param int keep: Max samples kept per key
+
+    """
+
+    def __init__(self, path, keep=50):
+        self.path = path
+        self.keep = keep
+        self._history = self._load()
+        self._new = {}
+        self._lock = threading.Lock()
+
+    def history(self, name, browser, runs, kind="test", test=None):
+        """
+        :param str test: Test a step ran in; steps are kept per test
+        :return: Up to `runs` most recent durations in seconds
+        :rtype: list
+
+        """
+        with self._lock:
+            return list(self._history.get(self._key(name, browser, test), [])[-runs:])
+
+    def record(self, name, browser, duration, test=None):
+        with self._lock:
+            self._new.setdefault(self._key(name, browser, test), []).append(float(duration))
+
+    def save(self):
+        """
+        Appends the durations recorded this session to the history on disk.
+
+        """
+        with self._lock:
+            if not self._new:
+                return
+            history = self._load()
+            for key, durations in self._new.items():
+                history[key] = (history.get(key, []) + durations)[-self.keep:]
+            self._new = {}
+            self._history = history
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(name, browser, test=None):
+        return f"{browser or 'any'}|{test}|{name}" if test else f"{browser or 'any'}|{name}"
+
+
+class InfluxBaselineStore:
+    """
+    Reads duration history from InfluxDB: 'ui_test_results' for tests and
+    'ui_step_durations' (the slowest call of a step per passed test run, written by the
+    budget check) for page-object steps. Only passed runs count.
+
+    :param client: InfluxDBClient
+    :param str database: Database holding the measurements
+
+    """
+
+    def __init__(self, client, database):
+        self.client = client
+        self.database = database
+
+    def history(self, name, browser, runs, kind="test", test=None):
+        """
+        :param str kind: "test" or "step"
+        :param str test: Test a step ran in; steps are compared per test
+        :return: Up to `runs` most recent durations in seconds
+        :rtype: list
+        :raises Exception: When InfluxDB cannot be queried
+
+        """
+        params = {"name": name, "browser": browser or "", "runs": runs}
+        if kind == "step":
+            query = ('SELECT "duration" FROM "ui_step_durations" WHERE "step" = $name AND "test_name" = $test '
+                     'AND "browser" = $browser ORDER BY time DESC LIMIT $runs')
+            params["test"] = test or ""
+        else:
+            query = ('SELECT "duration" FROM "ui_test_results" WHERE "test_name" = $name AND "status" = \'passed\' '
+                     'AND "browser" = $browser ORDER BY time DESC LIMIT $runs')
+        result = self.client.query(query, bind_params=params, database=self.database)
+        return [point["duration"] for point in result.get_points()][::-1]
+
+
+class PerfBudget:
+    """
+    Checks test and step durations against latency budgets.
+
+    A budget is either explicit (seconds) or derived from the rolling baseline: the
+    `percentile` of the last `runs` passed durations times (1 + `threshold`). Baselines
+    come from the first store that answers (InfluxDB, then the local file); steps without
+    an explicit budget and with fewer than `min_runs` samples are not checked yet.
+
+    :param stores: Baseline stores in order of preference
+    :param str mode: "off", "warn" or "fail"
+    :param int runs: Number of recent runs forming the baseline
+    :param float percentile: Baseline percentile
+    :param float threshold: Allowed regression over the baseline (0.2 = 20 %)
+    :param int min_runs: Samples needed before a baseline is trusted
+
+    """
+
+    def __init__(self, stores, mode="warn", runs=20, percentile=95, threshold=0.2, min_runs=5):
+        if mode not in MODES:
+            raise ValueError(f"Unknown perf budget mode '{mode}', expected one of {MODES}")
+        self.stores = list(stores)
+        self.mode = mode
+        self.runs = runs
+        self.percentile = percentile
+        self.threshold = threshold
+        self.min_runs = min_runs
+
+    def baseline(self, name, browser=None, kind="test", test=None):
+        """
+        :return: (baseline seconds, samples, store name), or (None, 0, None) without enough history
+        :rtype: tuple
+
+        """
+        for store in list(self.stores):
+            try:
+                history = store.history(name, browser, self.runs, kind, test)
+            except Exception as e:
+                # Do not retry an unreachable store for every test of the session
+                logger.warning("⚠️ Baseline store %s unavailable, skipping it: %s", type(store).__name__, e)
+                self.stores.remove(store)
+                continue
+            if len(history) >= self.min_runs:
+                return percentile(history, self.percentile), len(history), type(store).__name__
+        return None, 0, None
+
+    def check(self, name, duration, budget=None, browser=None, kind="test", test=None):
+        """
+        :param str name: Test or step name
+        :param float duration: Measured seconds
+        :param float budget: Explicit budget in seconds; None derives it from the baseline
+        :param str browser: Browser the duration was measured on
+        :param str kind: "test" or "step"
+        :param str test: Test a step ran in; its baseline only holds runs of that test
+        :return: Result dict (name, duration, limit, source, exceeded), or None if nothing to check against
+        :rtype: dict
+
+        """
+        if budget is not None:
+            limit, source = float(budget), "budget"
+        else:
+            baseline, samples, store = self.baseline(name, browser, kind, test)
+            if baseline is None:
+                return None
+            limit = baseline * (1 + self.threshold)
+            source = f"p{self.percentile:g} of {samples} runs ({store}) +{self.threshold:.0%}"
+        return {"name": name, "duration": duration, "limit": limit, "source": source, "exceeded": duration > limit}
+
+
+def slowest_step_durations(spans):
+    """
+    Slowest call per step name. A step may run several times in a test, so its baseline
+    is the history of this per-test maximum for the same test, not of single calls.
+
+    :param spans: Finished utils.tracing.Span objects
+    :return: {name: seconds}
+    :rtype: dict
+
+    """
+    slowest = {}
+    for span in spans:
+        if not span.failed:
+            slowest[span.name] = max(slowest.get(span.name, 0.0), span.duration)
+    return slowest
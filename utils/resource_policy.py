@@ -0,0 +1,234 @@
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+# Third-party analytics/marketing hosts loaded by useinsider.com and the careers pages
+TRACKER_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*linkedin.com/px*",
+    "*snap.licdn.com*",
+    "*bat.bing.com*",
+    "*clarity.ms*",
+    "*hubspot.com*",
+    "*hs-analytics.net*",
+    "*hs-scripts.com*",
+    "*youtube.com/embed*",
+    "*vimeo.com*",
+)
+
+RESOURCE_TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "media": ("*.mp4*", "*.webm*", "*.mov*", "*.m3u8*", "*.mp3*", "*.ogg*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+}
+
+
+class ResourcePolicy:
+    """
+    Describes which requests a browser session should not load.
+
+    On Chrome the URL patterns are enforced through CDP (Network.setBlockedURLs).
+    Firefox has no CDP request blocking, so the nearest preferences are used instead:
+    image/font loading switches and Enhanced Tracking Protection for trackers.
+
+    :param str name: Policy name used on the command line and in pool keys
+    :param url_patterns: Extra wildcard URL patterns to block
+    :param resource_types: Resource types to block ("image", "media", "font")
+    :param bool block_trackers: Block known analytics/marketing hosts
+
+    """
+
+    def __init__(self, name, url_patterns=(), resource_types=(), block_trackers=False):
+        unknown = set(resource_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {sorted(unknown)}")
+        self.name = name
+        self.url_patterns = tuple(url_patterns)
+        self.resource_types = tuple(resource_types)
+        self.block_trackers = block_trackers
+
+    @property
+    def blocks_anything(self):
+        return bool(self.url_patterns or self.resource_types or self.block_trackers)
+
+    def blocked_url_patterns(self):
+        """
+        :return: Every wildcard URL pattern this policy blocks
+        :rtype: list
+
+        """
+        patterns = list(self.url_patterns)
+        if self.block_trackers:
+            patterns.extend(TRACKER_PATTERNS)
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+    def chrome_prefs(self):
+        """
+        :return: Chrome profile preferences complementing the CDP URL blocking
+        :rtype: dict
+
+        """
+        prefs = {}
+        if "image" in self.resource_types:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        return prefs
+
+    def firefox_prefs(self):
+        """
+        :return: Firefox preferences approximating this policy
+        :rtype: dict
+
+        """
+        prefs = {}
+        if "image" in self.resource_types:
+            prefs["permissions.default.image"] = 2
+        if "media" in self.resource_types:
+            prefs["media.autoplay.default"] = 5
+            prefs["media.autoplay.blocking_policy"] = 2
+        if "font" in self.resource_types:
+            prefs["browser.display.use_document_fonts"] = 0
+        if self.block_trackers:
+            prefs["privacy.trackingprotection.enabled"] = True
+            prefs["privacy.trackingprotection.socialtracking.enabled"] = True
+        return prefs
+
+    def apply(self, driver):
+        """
+        Enables request blocking on a running session (Chrome only, no-op elsewhere).
+
+        :param driver: Selenium WebDriver instance
+
+        """
+        if not self.blocks_anything or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()})
+
+
+RESOURCE_POLICIES = {
+    "full": ResourcePolicy("full"),
+    "no-trackers": ResourcePolicy("no-trackers", block_trackers=True),
+    "no-media": ResourcePolicy("no-media", resource_types=("media", "font"), block_trackers=True),
+    "lean": ResourcePolicy("lean", resource_types=("image", "media", "font"), block_trackers=True),
+}
+
+
+def get_resource_policy(name):
+    """
+    :param str name: Policy name
+    :return: The named ResourcePolicy
+    :rtype: ResourcePolicy
+    :raises ValueError: If the name is unknown
+
+    """
+    try:
+        return RESOURCE_POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown resource policy '{name}', expected one of {sorted(RESOURCE_POLICIES)}")
+
+
+class ResourceMonitor:
+    """
+    Measures requests and bytes loaded by a session during one test, and how many were saved.
+
+    Chrome: parses the performance log (Network.* events) across every navigation of the test.
+    Blocked requests are counted from Network.loadingFailed and their bytes are estimated
+    from the average size of loaded requests of the same resource type.
+    Firefox: falls back to Resource Timing of the current document; savings are not measurable.
+
+    :param driver: Selenium WebDriver instance
+
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        # Chrome sessions are created with goog:loggingPrefs performance logging (see driver_factory)
+        self.uses_performance_log = hasattr(driver, "execute_cdp_cmd")
+
+    def start(self):
+        """
+        Discards log entries left over from earlier tests on a pooled session.
+
+        """
+        if self.uses_performance_log:
+            self._read_log()
+        return self
+
+    def stop(self):
+        """
+        :return: Dict with requests, bytes, blocked_requests and estimated bytes_saved
+                 (blocked_requests/bytes_saved are None when not measurable)
+        :rtype: dict
+
+        """
+        if self.uses_performance_log:
+            entries = self._read_log()
+            if entries is not None:
+                return summarize_network_events(entries)
+        return self._resource_timing()
+
+    def _read_log(self):
+        try:
+            return [json.loads(entry["message"])["message"] for entry in self.driver.get_log("performance")]
+        except (WebDriverException, KeyError, ValueError):
+            self.uses_performance_log = False
+            return None
+
+    def _resource_timing(self):
+        try:
+            stats = self.driver.execute_script("""
+                var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+                return {requests: entries.length,
+                        bytes: entries.reduce(function (sum, e) { return sum + (e.transferSize || 0); }, 0)};
+            """)
+        except WebDriverException:
+            stats = {"requests": 0, "bytes": 0}
+        return {"requests": stats["requests"], "bytes": stats["bytes"], "blocked_requests": None, "bytes_saved": None}
+
+
+def summarize_network_events(events):
+    """
+    Aggregates CDP Network events from a Chrome performance log.
+
+    :param events: List of {"method": ..., "params": ...} CDP events
+    :return: Dict with requests, bytes, blocked_requests and bytes_saved (estimate)
+    :rtype: dict
+
+    """
+    types = {}
+    loaded = {}
+    blocked = {}
+    for event in events:
+        method, params = event.get("method"), event.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            types[request_id] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            loaded[request_id] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked[request_id] = params.get("type") or types.get(request_id, "Other")
+
+    sizes_by_type = {}
+    for request_id, size in loaded.items():
+        sizes_by_type.setdefault(types.get(request_id, "Other"), []).append(size)
+    all_sizes = [size for sizes in sizes_by_type.values() for size in sizes]
+    overall_avg = sum(all_sizes) / len(all_sizes) if all_sizes else 0
+
+    bytes_saved = 0
+    for resource_type in blocked.values():
+        sizes = sizes_by_type.get(resource_type)
+        bytes_saved += sum(sizes) / len(sizes) if sizes else overall_avg
+
+    return {
+        "requests": len(loaded),
+        "bytes": int(sum(loaded.values())),
+        "blocked_requests": len(blocked),
+        "bytes_saved": int(bytes_saved),
+    }
@@ -0,0 +1,341 @@
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_active_log = contextvars.ContextVar("step_retry_log", default=None)
+
+# Session-wide overrides of the per-step policy (see configure_retries)
+_overrides = {}
+
+OUTCOMES = ("passed", "flaky", "failed")
+
+
+class RetryPolicy:
+    """
+    How often and how fast a page-object step is retried.
+
+    :param int attempts: Max calls, including the first one
+    :param float backoff: Seconds before the first retry
+    :param float factor: Backoff multiplier per further retry
+    :param float max_delay: Upper bound of a single delay
+    :param float jitter: Random extra delay as a fraction of the delay
+    :param tuple retry_on: Exceptions that trigger a retry; others propagate at once
+    :param bool retry_if_false: Also retry when the step returns False
+
+    """
+
+    def __init__(self, attempts=3, backoff=0.5, factor=2.0, max_delay=5.0, jitter=0.1,
+                 retry_on=(WebDriverException, AssertionError), retry_if_false=True):
+        if attempts < 1:
+            raise ValueError("A step needs at least one attempt")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.retry_if_false = retry_if_false
+
+    def delay(self, retry):
+        """
+        :param int retry: 1 for the first retry
+        :return: Seconds to sleep before that retry
+        :rtype: float
+
+        """
+        delay = min(self.backoff * self.factor ** (retry - 1), self.max_delay)
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def with_overrides(self, **overrides):
+        """
+        :return: A copy with the given attributes replaced (None values are ignored)
+        :rtype: RetryPolicy
+
+        """
+        policy = RetryPolicy.__new__(RetryPolicy)
+        policy.__dict__.update(self.__dict__)
+        policy.__dict__.update({key: value for key, value in overrides.items() if value is not None})
+        return policy
+
+
+def configure_retries(attempts=None, backoff=None):
+    """
+    Overrides the attempts and backoff of every @retry_step for the session
+    (e.g. from pytest options); `attempts=1` turns retries off.
+
+    """
+    _overrides.clear()
+    _overrides.update({key: value for key, value in {"attempts": attempts, "backoff": backoff}.items()
+                       if value is not None})
+
+
+class StepAttempts:
+    """
+    Result of one call of a retried step.
+
+    """
+
+    __slots__ = ("step", "attempts", "outcome", "retry_seconds", "error")
+
+    def __init__(self, step, attempts, outcome, retry_seconds, error=None):
+        self.step = step
+        self.attempts = attempts
+        self.outcome = outcome
+        self.retry_seconds = retry_seconds
+        self.error = error
+
+
+class StepRetryLog:
+    """
+    Collects the StepAttempts of the steps called during one test.
+
+    """
+
+    def __init__(self):
+        self.records = []
+        self._token = None
+
+    def activate(self):
+        """
+        Makes this the log of the current context until deactivate().
+
+        """
+        self._token = _active_log.set(self)
+        return self
+
+    def deactivate(self):
+        if self._token is not None:
+            _active_log.reset(self._token)
+            self._token = None
+
+    def failed_steps(self):
+        """
+        :return: Names of steps that failed after all attempts
+        :rtype: list
+
+        """
+        return list(dict.fromkeys(record.step for record in self.records if record.outcome == "failed"))
+
+
+def retry_step(attempts=3, backoff=0.5, on_retry=None, **policy):
+    """
+    Decorator retrying a page-object step with exponential backoff, instead of rerunning
+    the whole test. A step fails when it raises one of `retry_on` or returns False; after
+    the last attempt the exception is re-raised or False is returned, as without retries.
+
+    Every call is recorded in the active StepRetryLog (flake statistics, see FlakeQuarantine).
+
+    :param int attempts: Max calls, including the first one
+    :param float backoff: Seconds before the first retry
+    :param str on_retry: Name of a method of the page object restoring state before a retry
+    :param policy: Other RetryPolicy arguments
+
+    """
+    base = RetryPolicy(attempts=attempts, backoff=backoff, **policy)
+
+    def decorator(func):
+        step = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = base.with_overrides(**_overrides)
+            retry_seconds, error = 0.0, None
+            for attempt in range(1, current.attempts + 1):
+                if attempt > 1:
+                    started = time.perf_counter()
+                    _prepare_retry(args, on_retry, step)
+                    time.sleep(current.delay(attempt - 1))
+                    retry_seconds += time.perf_counter() - started
+                try:
+                    result = func(*args, **kwargs)
+                except current.retry_on as e:
+                    error = e
+                else:
+                    if not (current.retry_if_false and result is False):
+                        _record(step, attempt, "passed" if attempt == 1 else "flaky", retry_seconds)
+                        return result
+                    error = None
+                if attempt < current.attempts:
+                    logger.warning("🔁 %s failed (attempt %d/%d)%s, retrying", step, attempt, current.attempts,
+                                   f": {error}" if error else "")
+            _record(step, current.attempts, "failed", retry_seconds, error)
+            if error is not None:
+                raise error
+            return result
+        return wrapper
+    return decorator
+
+
+def _prepare_retry(args, on_retry, step):
+    if not on_retry or not args:
+        return
+    try:
+        getattr(args[0], on_retry)()
+    except Exception as e:
+        logger.warning("⚠️ %s could not restore state before retrying: %s", step, e)
+
+
+def _record(step, attempts, outcome, retry_seconds, error=None):
+    log = _active_log.get()
+    if log is not None:
+        log.records.append(StepAttempts(step, attempts, outcome, retry_seconds,
+                                        f"{type(error).__name__}: {error}" if error else None))
+
+
+class FileFlakeStore:
+    """
+    Local JSON history of step outcomes ("passed", "flaky", "failed"), newest last,
+    capped at `keep` per step and merged with the file on disk when saved.
+
+    :param str path: JSON file path
+    :param int keep: Max outcomes kept per step
+
+    """
+
+    def __init__(self, path, keep=100):
+        self.path = path
+        self.keep = keep
+        self._history = self._load()
+        self._new = {}
+        self._lock = threading.Lock()
+
+    def history(self, step, runs):
+        """
+        :return: Up to `runs` most recent outcomes
+        :rtype: list
+
+        """
+        with self._lock:
+            return list(self._history.get(step, [])[-runs:])
+
+    def record(self, step, outcome):
+        with self._lock:
+            self._new.setdefault(step, []).append(outcome)
+
+    def save(self):
+        """
+        Appends the outcomes recorded this session to the history on disk.
+
+        """
+        with self._lock:
+            if not self._new:
+                return
+            history = self._load()
+            for step, outcomes in self._new.items():
+                history[step] = (history.get(step, []) + outcomes)[-self.keep:]
+            self._new = {}
+            self._history = history
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+class InfluxFlakeStore:
+    """
+    Reads step outcomes from the 'ui_step_retries' measurement.
+
+    :param client: InfluxDBClient
+    :param str database: Database holding the measurement
+
+    """
+
+    def __init__(self, client, database):
+        self.client = client
+        self.database = database
+
+    def history(self, step, runs):
+        """
+        :return: Up to `runs` most recent outcomes
+        :rtype: list
+        :raises Exception: When InfluxDB cannot be queried
+
+        """
+        result = self.client.query(
+            'SELECT "flaky", "failed" FROM "ui_step_retries" WHERE "step" = $step ORDER BY time DESC LIMIT $runs',
+            bind_params={"step": step, "runs": runs}, database=self.database)
+        return [("failed" if point["failed"] else "flaky" if point["flaky"] else "passed")
+                for point in result.get_points()][::-1]
+
+
+class FlakeQuarantine:
+    """
+    Decides which steps are quarantined from their recent outcomes.
+
+    The flake rate of a step is the share of its last `runs` calls that needed a retry or
+    failed. A step is quarantined once that rate reaches `threshold` over at least
+    `min_runs` calls and it still passed at least once: a step that always fails is
+    broken, not flaky, and keeps failing tests. Decisions are made once per session.
+
+    :param stores: Outcome stores in order of preference
+    :param float threshold: Flake rate from which a step is quarantined
+    :param int runs: Number of recent calls considered
+    :param int min_runs: Calls needed before a step can be quarantined
+
+    """
+
+    def __init__(self, stores, threshold=0.2, runs=50, min_runs=10):
+        self.stores = list(stores)
+        self.threshold = threshold
+        self.runs = runs
+        self.min_runs = min_runs
+        self._decisions = {}
+        self._lock = threading.Lock()
+
+    def flake_rate(self, step):
+        """
+        :return: (flake rate, samples), or (None, 0) without enough history
+        :rtype: tuple
+
+        """
+        for store in list(self.stores):
+            try:
+                history = store.history(step, self.runs)
+            except Exception as e:
+                logger.warning("⚠️ Flake store %s unavailable, skipping it: %s", type(store).__name__, e)
+                self.stores.remove(store)
+                continue
+            if len(history) >= self.min_runs:
+                if "passed" not in history and "flaky" not in history:
+                    return 0.0, len(history)
+                return sum(outcome != "passed" for outcome in history) / len(history), len(history)
+        return None, 0
+
+    def is_quarantined(self, step):
+        """
+        :rtype: bool
+
+        """
+        with self._lock:
+            if step not in self._decisions:
+                rate, samples = self.flake_rate(step)
+                self._decisions[step] = rate is not None and rate >= self.threshold
+                if self._decisions[step]:
+                    logger.warning("🧯 %s quarantined: flake rate %.0f%% over %d calls", step, rate * 100, samples)
+            return self._decisions[step]
+
+    def quarantined(self):
+        """
+        :return: Steps quarantined so far this session
+        :rtype: list
+
+        """
+        with self._lock:
+            return sorted(step for step, quarantined in self._decisions.items() if quarantined)
@@ -0,0 +1,491 @@
+"""
+Local stand-in for the useinsider.com pages the page objects walk through, plus a
+Lever-like job page, for hermetic runs and filtering benchmarks at any listing size.
+
+    python -m utils.stand_in_site --jobs 1000 --filter-latency 0.5 --port 8000
+
+The markup keeps the ids, classes and nesting the locators in pages/locators.py rely on.
+
+"""
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from utils.browser_profiles import CONSENT_COOKIE_NAME
+
+DEPARTMENTS = (
+    "Quality Assurance", "Software Development", "Sales", "Customer Success", "Marketing",
+    "Business Intelligence", "Product Management", "Finance & Business Support",
+)
+LOCATIONS = (
+    "Istanbul, Turkiye", "London, United Kingdom", "Amsterdam, Netherlands", "Singapore, Singapore",
+    "New York, United States", "Warsaw, Poland", "Dubai, United Arab Emirates",
+)
+LEVELS = ("", "Senior ", "Lead ", "Junior ", "Principal ")
+ROLES = {
+    "Quality Assurance": ("Quality Assurance Engineer", "Software QA Tester", "QA Automation Engineer"),
+    "Software Development": ("Backend Engineer", "Frontend Engineer", "Site Reliability Engineer"),
+}
+MIN_JOBS, MAX_JOBS = 10, 10000
+
+# Team blocks on the careers page; only the first three are shown until "See all teams"
+TEAMS = ("Customer Success", "Sales", "Product & Engineering", "Marketing", "Quality Assurance",
+         "Business Intelligence", "Finance & Business Support")
+
+
+def slugify(text, separator="-"):
+    return re.sub(r"[^a-z0-9]+", separator, text.lower()).strip(separator)
+
+
+def department_slug(department):
+    # The site's department query values have no separators ("qualityassurance")
+    return slugify(department, "")
+
+
+def generate_jobs(count, seed=0, mismatches=0):
+    """
+    Deterministic job postings, about a quarter of them Quality Assurance and a third of
+    those in Istanbul, so the QA + Istanbul listing is never empty.
+
+    :param int count: Number of postings (10 to 10,000)
+    :param int seed: Random seed
+    :param int mismatches: QA + Istanbul postings whose card text breaks the listing
+                           criteria (wrong department label), to exercise verification
+    :return: Dicts with id, title, department, location and their slugs
+    :rtype: list
+
+    """
+    if not MIN_JOBS <= count <= MAX_JOBS:
+        raise ValueError(f"Job count must be between {MIN_JOBS} and {MAX_JOBS}, got {count}")
+    rng = random.Random(seed)
+    jobs = []
+    for index in range(count):
+        department = DEPARTMENTS[0] if index % 4 == 0 else rng.choice(DEPARTMENTS[1:])
+        location = LOCATIONS[0] if index % 12 == 0 else rng.choice(LOCATIONS)
+        role = rng.choice(ROLES.get(department, (f"{department} Specialist",)))
+        jobs.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": f"{rng.choice(LEVELS)}{role}",
+            "department": department,
+            "location": location,
+        })
+    broken = [job for job in jobs if job["department"] == DEPARTMENTS[0] and job["location"] == LOCATIONS[0]]
+    for job in broken[1:mismatches + 1]:
+        job["label"] = DEPARTMENTS[1]
+    for job in jobs:
+        job["department_slug"] = department_slug(job["department"])
+        job["location_slug"] = slugify(job["location"])
+    return jobs
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+.dropdown-menu, .select2-dropdown, .team-hidden {{ display: none; }}
+.dropdown-menu.show, .select2-dropdown.open {{ display: block; }}
+.position-list-item {{ display: inline-block; width: 30%; margin: 8px; padding: 8px; border: 1px solid #ddd; }}
+#wt-cli-cookie-banner {{ position: fixed; bottom: 0; width: 100%; background: #eee; padding: 12px; }}
+</style>
+</head>
+<body>
+<nav class="navbar">
+  <div class="collapse navbar-collapse" id="navbarNavDropdown">
+    <ul class="navbar-nav">
+      <li class="nav-item"><a class="nav-link" href="/why-insider/">Why Insider</a></li>
+      {menus}
+    </ul>
+  </div>
+</nav>
+{body}
+<div id="wt-cli-cookie-banner" style="display: none">
+  We use cookies. <a id="wt-cli-accept-all-btn" role="button" href="javascript:void(0)">Accept All</a>
+</div>
+<script>
+(function () {{
+  var banner = document.getElementById('wt-cli-cookie-banner');
+  if (document.cookie.indexOf('{consent}=') === -1) banner.style.display = 'block';
+  document.getElementById('wt-cli-accept-all-btn').addEventListener('click', function () {{
+    document.cookie = '{consent}=yes; path=/';
+    banner.style.display = 'none';
+  }});
+  document.querySelectorAll('a#navbarDropdownMenuLink').forEach(function (link) {{
+    link.addEventListener('click', function (event) {{
+      event.preventDefault();
+      link.nextElementSibling.classList.toggle('show');
+    }});
+  }});
+}})();
+</script>
+{script}
+</body>
+</html>
+"""
+
+MENU = """<li class="nav-item dropdown">
+        <a class="nav-link dropdown-toggle" href="#" id="navbarDropdownMenuLink">{name}</a>
+        <div class="dropdown-menu"><div class="col">{name} overview</div><div class="col">{links}</div></div>
+      </li>"""
+
+HOME_BODY = """<section class="home-hero"><h1>Insider, the #1 AI-native platform for individualized, cross-channel experiences</h1></section>"""
+
+CAREERS_BODY = """<section id="career-our-location">
+  <div class="container"><div class="row"><div class="col-12">
+    {locations}
+  </div></div></div>
+</section>
+<section id="career-find-our-calling">
+  <div class="container">
+    <div class="row">
+      {teams}
+      <a class="btn btn-outline-secondary" href="javascript:void(0)">See all teams</a>
+    </div>
+  </div>
+</section>
+<section class="life-at-insider"><h2>Life at Insider</h2><p>We're here to grow and drive growth.</p></section>
+<script>
+document.querySelector('#career-find-our-calling a.btn').addEventListener('click', function () {{
+  document.querySelectorAll('.team-hidden').forEach(function (team) {{ team.classList.remove('team-hidden'); }});
+}});
+</script>"""
+
+QA_BODY = """<section class="qa-hero">
+  <h1>Quality Assurance</h1>
+  <a class="btn btn-outline-secondary" href="/careers/open-positions/?department=qualityassurance">See all QA jobs</a>
+</section>"""
+
+POSITIONS_BODY = """<section id="career-position-filter">
+  <select id="filter-by-location" name="filter-by-location" class="select2-hidden-accessible">{location_options}</select>
+  <span class="select2-selection"><span class="select2-selection__rendered" id="select2-filter-by-location-container" title="All">All</span></span>
+  <span class="select2-dropdown" id="location-options"><ul class="select2-results__options">{location_items}</ul></span>
+  <select id="filter-by-department" name="filter-by-department" class="select2-hidden-accessible">{department_options}</select>
+  <span class="select2-selection"><span class="select2-selection__rendered" id="select2-filter-by-department-container" title="All">All</span></span>
+</section>
+<section id="career-position-list"><div id="jobs-list" class="row"></div></section>"""
+
+POSITIONS_SCRIPT = """<script>
+(function () {
+  var departments = %(departments)s;
+  var list = document.getElementById('jobs-list');
+  var locationBox = document.getElementById('select2-filter-by-location-container');
+  var departmentBox = document.getElementById('select2-filter-by-department-container');
+  var options = document.getElementById('location-options');
+  var state = {department: 'all', location: 'all'};
+  var sequence = 0;
+  var pageSize = %(page_size)d, pending = [], rendering = false;
+  // Virtualized listing: only `pageSize` card nodes exist; scrolling re-fills them with other jobs
+  var virtual = %(virtual)s, rowHeight = 160, loaded = [], nodes = [], scheduled = false;
+
+  function escape(text) {
+    return String(text).replace(/[&<>"]/g, function (c) { return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]; });
+  }
+  function card(job) {
+    return '<div class="position-list-item col-12 col-lg-4 ' + job.department_slug + ' ' + job.location_slug + '"' +
+      ' data-team="' + job.department_slug + '" data-location="' + job.location_slug + '" data-job-id="' + job.id + '">' +
+      '<div class="position-list-item-wrapper bg-light">' +
+      '<p class="position-title font-weight-bold">' + escape(job.title) + '</p>' +
+      '<span class="position-department text-large font-weight-600 text-primary">' + escape(job.label || job.department) + '</span>' +
+      '<div class="position-location text-large">' + escape(job.location) + '</div>' +
+      '<a href="/jobs.lever.co/useinsider/' + job.id + '" target="_blank" class="btn btn-navy rounded">View Role</a>' +
+      '</div></div>';
+  }
+  function renderMore() {
+    rendering = false;
+    list.insertAdjacentHTML('beforeend', pending.splice(0, pageSize || pending.length).map(card).join(''));
+  }
+  function fill(node, job) {
+    var template = document.createElement('div');
+    template.innerHTML = card(job);
+    var fresh = template.firstChild;
+    node.className = fresh.className;
+    ['data-team', 'data-location', 'data-job-id'].forEach(function (name) {
+      node.setAttribute(name, fresh.getAttribute(name));
+    });
+    node.innerHTML = fresh.innerHTML;
+  }
+  function renderWindow() {
+    scheduled = false;
+    var offset = window.scrollY - (list.getBoundingClientRect().top + window.scrollY);
+    var first = Math.max(0, Math.min(loaded.length - nodes.length, Math.floor(offset / rowHeight)));
+    nodes.forEach(function (node, i) {
+      fill(node, loaded[first + i]);
+      node.style.top = ((first + i) * rowHeight) + 'px';
+    });
+  }
+  function renderVirtual(jobs) {
+    loaded = jobs;
+    list.style.position = 'relative';
+    list.style.height = (jobs.length * rowHeight) + 'px';
+    nodes = [];
+    for (var i = 0; i < Math.min(pageSize, jobs.length); i++) {
+      var node = document.createElement('div');
+      node.style.position = 'absolute';
+      node.style.left = '0';
+      node.style.right = '0';
+      node.style.height = rowHeight + 'px';
+      list.appendChild(node);
+      nodes.push(node);
+    }
+    renderWindow();
+  }
+  function load() {
+    var current = ++sequence;
+    list.innerHTML = '';
+    pending = [];
+    nodes = [];
+    return fetch('/api/jobs?department=' + state.department + '&location=' + state.location)
+      .then(function (response) { return response.json(); })
+      .then(function (jobs) {
+        if (current !== sequence) return;
+        if (virtual) { renderVirtual(jobs); } else { pending = jobs; renderMore(); }
+      });
+  }
+  // With a page size, further cards are rendered when the end of the list is scrolled into view
+  window.addEventListener('scroll', function () {
+    if (virtual) {
+      if (nodes.length && !scheduled) { scheduled = true; requestAnimationFrame(renderWindow); }
+      return;
+    }
+    if (!pending.length || rendering) return;
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {
+      rendering = true;
+      setTimeout(renderMore, 100);
+    }
+  });
+  function select(box, text) { box.textContent = text; box.title = text; }
+
+  locationBox.addEventListener('click', function () { options.classList.toggle('open'); });
+  options.querySelectorAll('.select2-results__option').forEach(function (option) {
+    option.addEventListener('click', function () {
+      options.classList.remove('open');
+      select(locationBox, option.textContent);
+      state.location = option.getAttribute('data-value');
+      load();
+    });
+  });
+
+  var department = new URLSearchParams(window.location.search).get('department');
+  load().then(function () {
+    if (department && departments[department]) {
+      select(departmentBox, departments[department]);
+      state.department = department;
+      load();
+    }
+  });
+})();
+</script>"""
+
+LEVER_BODY = """<div class="posting-headline">
+  <h2>{title}</h2>
+  <div class="posting-categories">
+    <div class="sort-by-time posting-category">{location}</div>
+    <div class="sort-by-team posting-category">{department}</div>
+  </div>
+</div>
+<div class="section page-centered"><a class="postings-btn template-btn-submit" href="#apply">Apply for this job</a></div>"""
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        site = self.server.site
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        site.count("requests")
+        status, content_type, body = site.route(parts.path, query)
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(payload)
+
+
+class StandInSite:
+    """
+    Local HTTP server standing in for the careers flow of useinsider.com and the Lever job pages.
+
+    - /, /careers/, /careers/quality-assurance/, /careers/open-positions/?department=...
+    - /jobs.lever.co/useinsider/<id>: job page (the URL contains "lever.co" like the real one)
+    - /api/jobs?department=&location=: filtered listing used by the open-positions page,
+      answered after `filter_latency` seconds (can be changed while running); with `page_size`
+      the page renders that many cards and appends the next ones when scrolled to the end, or
+      with `virtual` keeps that many card nodes and re-fills them with the jobs scrolled to
+    - GET and HEAD on every path; unknown paths and job ids get 404
+
+    :param int jobs: Number of generated postings (10 to 10,000)
+    :param float filter_latency: Seconds before every listing response
+    :param int page_size: Cards rendered per scroll (0 renders the whole listing at once)
+    :param bool virtual: Render a virtualized listing of `page_size` recycled card nodes
+    :param int seed: Random seed of the generated postings
+    :param int mismatches: QA + Istanbul postings with a wrong department label
+    :param str host: Interface to listen on
+    :param int port: Port to listen on (0 picks a free one)
+
+    """
+
+    def __init__(self, jobs=200, filter_latency=0.3, page_size=0, virtual=False, seed=0, mismatches=0,
+                 host="127.0.0.1", port=0):
+        if virtual and page_size <= 0:
+            raise ValueError("A virtualized listing needs a page size")
+        self.jobs = generate_jobs(jobs, seed, mismatches)
+        self._by_id = {job["id"]: job for job in self.jobs}
+        self.filter_latency = filter_latency
+        self.page_size = page_size
+        self.virtual = virtual
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "listings": 0}
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.site = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-site", daemon=True)
+
+    @property
+    def url(self):
+        """
+        :return: Base URL without a trailing slash, e.g. "http://127.0.0.1:8000"
+        :rtype: str
+
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def listing(self, department="all", location="all"):
+        """
+        :param str department: Department slug ("qualityassurance") or "all"
+        :param str location: Location slug ("istanbul-turkiye") or "all"
+        :return: Matching postings
+        :rtype: list
+
+        """
+        return [job for job in self.jobs
+                if department in ("all", job["department_slug"]) and location in ("all", job["location_slug"])]
+
+    def route(self, path, query):
+        """
+        :return: (status, content type, body)
+        :rtype: tuple
+
+        """
+        if path == "/api/jobs":
+            self.count("listings")
+            time.sleep(self.filter_latency)
+            jobs = self.listing(query.get("department", "all"), query.get("location", "all"))
+            return 200, "application/json", json.dumps(jobs)
+        if path == "/robots.txt":
+            return 200, "text/plain", "User-agent: *\nAllow: /\n"
+        if path.startswith("/jobs.lever.co/useinsider/"):
+            job = self._by_id.get(path.rstrip("/").rsplit("/", 1)[-1])
+            if job is None:
+                return 404, "text/plain", "Not found"
+            body = LEVER_BODY.format(**{key: html.escape(job[key]) for key in ("title", "location", "department")})
+            return 200, "text/html; charset=utf-8", self._page(f"Insider. - {html.escape(job['title'])}", body)
+        pages = {
+            "/": ("#1 Leader in Individualized, Cross-Channel CX — Insider", HOME_BODY),
+            "/careers/": ("Ready to disrupt? | Insider Careers", self._careers_body()),
+            "/careers/quality-assurance/": ("Insider quality assurance job opportunities", QA_BODY),
+            "/careers/open-positions/": ("Insider Open Positions | Insider Careers", self._positions_body()),
+        }
+        if path not in pages:
+            return 404, "text/plain", "Not found"
+        title, body = pages[path]
+        script = self._positions_script() if path == "/careers/open-positions/" else ""
+        return 200, "text/html; charset=utf-8", self._page(title, body, script)
+
+    @staticmethod
+    def _page(title, body, script=""):
+        menus = [MENU.format(name=name, links=f'<a href="#">{name} home</a>')
+                 for name in ("Platform", "Solutions", "Customers", "Resources")]
+        menus.append(MENU.format(name="Company", links='<a href="/about-us/">About Us</a><a href="/careers/">Careers</a>'))
+        return PAGE.format(title=title, menus="\n      ".join(menus), body=body, script=script,
+                           consent=CONSENT_COOKIE_NAME)
+
+    @staticmethod
+    def _careers_body():
+        locations = "".join(f'<div class="location-info">{html.escape(location)}</div>' for location in LOCATIONS)
+        teams = "".join(
+            f'<div class="job-item{" team-hidden" if index >= 3 else ""}"><h3>{html.escape(team)}</h3>'
+            f'<a href="/careers/{slugify(team)}/">Open Positions</a></div>'
+            for index, team in enumerate(TEAMS))
+        return CAREERS_BODY.format(locations=locations, teams=teams)
+
+    @staticmethod
+    def _positions_body():
+        def options(values, slug):
+            return '<option value="all">All</option>' + "".join(
+                f'<option value="{slug(value)}">{html.escape(value)}</option>' for value in values)
+
+        location_items = '<li class="select2-results__option" data-value="all">All</li>' + "".join(
+            f'<li class="select2-results__option" data-value="{slugify(location)}">{html.escape(location)}</li>'
+            for location in LOCATIONS)
+        return POSITIONS_BODY.format(location_options=options(LOCATIONS, slugify),
+                                     department_options=options(DEPARTMENTS, department_slug),
+                                     location_items=location_items)
+
+    def _positions_script(self):
+        departments = {department_slug(department): department for department in DEPARTMENTS}
+        return POSITIONS_SCRIPT % {"departments": json.dumps(departments), "page_size": self.page_size,
+                                   "virtual": json.dumps(self.virtual)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--filter-latency", type=float, default=0.3)
+    parser.add_argument("--page-size", type=int, default=0)
+    parser.add_argument("--virtual", action="store_true", help="Recycle --page-size card nodes while scrolling")
+    parser.add_argument("--mismatches", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    site = StandInSite(jobs=args.jobs, filter_latency=args.filter_latency, page_size=args.page_size,
+                       virtual=args.virtual, mismatches=args.mismatches, port=args.port).start()
+    print(f"🏗 Stand-in site with {len(site.jobs)} jobs on {site.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
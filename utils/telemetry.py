@@ -0,0 +1,194 @@
+import os
+import queue
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TelemetryWorker:
+    """
+    Background worker that runs reporting jobs (InfluxDB points, screenshot writes)
+    off the test thread through a bounded queue.
+
+    When the queue is full, `policy` decides what happens to a new job:
+    - "block": wait up to `put_timeout` seconds for room (backpressure), then drop it
+    - "drop_newest": drop the new job immediately
+    - "drop_oldest": evict the oldest queued job to make room
+
+    :param int maxsize: Maximum number of queued jobs
+    :param str policy: Queue-full policy ("block", "drop_newest" or "drop_oldest")
+    :param float put_timeout: Max seconds a producer blocks under the "block" policy
+    :param float idle_interval: Seconds without jobs after which `on_idle` is called
+    :param on_idle: Optional callable run on the worker thread when idle (e.g. a timed flush)
+
+    """
+
+    POLICIES = ("block", "drop_newest", "drop_oldest")
+    _STOP = object()
+
+    def __init__(self, maxsize=1000, policy="block", put_timeout=1.0, idle_interval=1.0,
+                 on_idle=None, name="telemetry-worker"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown drop policy '{policy}', expected one of {self.POLICIES}")
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.idle_interval = idle_interval
+        self.on_idle = on_idle
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._stopping = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "blocked_seconds": 0.0,
+            "max_depth": 0,
+        }
+
+    def start(self):
+        """
+        Starts the worker thread.
+
+        :return: self, for chaining
+        :rtype: TelemetryWorker
+
+        """
+        self._thread.start()
+        return self
+
+    def submit(self, job, *args, **kwargs):
+        """
+        Queues `job(*args, **kwargs)` for the worker thread according to the drop policy.
+
+        :param job: Callable to run in the background
+        :return: True if queued, False if dropped
+        :rtype: bool
+
+        """
+        if self._stopping:
+            self._count("dropped")
+            return False
+
+        item = (job, args, kwargs)
+        try:
+            if self.policy == "block":
+                started = time.monotonic()
+                try:
+                    self._queue.put(item, timeout=self.put_timeout)
+                finally:
+                    self._count("blocked_seconds", time.monotonic() - started)
+            elif self.policy == "drop_oldest":
+                while True:
+                    try:
+                        self._queue.put_nowait(item)
+                        break
+                    except queue.Full:
+                        try:
+                            self._queue.get_nowait()
+                            self._queue.task_done()
+                            self._count("dropped")
+                        except queue.Empty:
+                            pass
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning("⚠️ Telemetry queue full, dropped job: %s", getattr(job, "__name__", job))
+            return False
+
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+        return True
+
+    def drain(self, timeout=30.0):
+        """
+        Stops accepting jobs, waits for queued jobs to finish and stops the thread.
+
+        :param float timeout: Max seconds to wait for the queue to drain
+        :return: True if every queued job was processed in time
+        :rtype: bool
+
+        """
+        self._stopping = True
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return False
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        return not self._thread.is_alive()
+
+    def pending(self):
+        """
+        :return: Number of jobs waiting in the queue
+        :rtype: int
+
+        """
+        return self._queue.qsize()
+
+    def summary(self):
+        """
+        :return: Copy of the worker counters plus the current queue depth
+        :rtype: dict
+
+        """
+        with self._lock:
+            summary = dict(self.stats)
+        summary["pending"] = self.pending()
+        return summary
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_interval)
+            except queue.Empty:
+                self._run_idle()
+                continue
+
+            if item is self._STOP:
+                self._queue.task_done()
+                self._run_idle()
+                return
+
+            job, args, kwargs = item
+            try:
+                job(*args, **kwargs)
+                self._count("completed")
+            except Exception as e:
+                self._count("failed")
+                logger.error("❌ Telemetry job failed (%s): %s", getattr(job, "__name__", job), e)
+            finally:
+                self._queue.task_done()
+
+    def _run_idle(self):
+        if self.on_idle is None:
+            return
+        try:
+            self.on_idle()
+        except Exception as e:
+            logger.error("❌ Telemetry idle callback failed: %s", e)
+
+
+def write_bytes(path, data):
+    """
+    Writes raw bytes to `path`, creating parent directories as needed.
+    Used as a background job for files produced on the test thread (e.g. trace files).
+
+    :param str path: Destination file path
+    :param bytes data: File content
+
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
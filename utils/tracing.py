@@ -0,0 +1,309 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import time
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_active_tracer = contextvars.ContextVar("active_tracer", default=None)
+
+
+def current_tracer():
+    """
+    :return: The Tracer of the running test, or None outside of a traced test
+    :rtype: Tracer
+
+    """
+    return _active_tracer.get()
+
+
+def add_command_listener(driver, listener):
+    """
+    Calls `listener(command, seconds, params, response)` after every WebDriver command
+    the session sends (`response` is None if the command raised).
+
+    The first listener wraps `driver.execute` on the instance; the wrapper stays in place
+    for pooled sessions and simply has no listeners between tests.
+
+    :param driver: Selenium WebDriver instance
+    :param listener: Callable taking the command name, its round-trip time in seconds,
+                     the request parameters and the response
+    :return: The listener, for remove_command_listener
+    :rtype: callable
+
+    """
+    listeners = driver.__dict__.get("_command_listeners")
+    if listeners is None:
+        listeners = driver._command_listeners = []
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def execute_with_listeners(command, params=None):
+            started = time.perf_counter()
+            response = None
+            try:
+                response = execute(command, params)
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                for notify in list(listeners):
+                    notify(command, elapsed, params, response)
+
+        driver.execute = execute_with_listeners
+    if listener not in listeners:
+        listeners.append(listener)
+    return listener
+
+
+def remove_command_listener(driver, listener):
+    """
+    :param driver: Selenium WebDriver instance
+    :param listener: Listener passed to add_command_listener
+
+    """
+    listeners = driver.__dict__.get("_command_listeners", [])
+    if listener in listeners:
+        listeners.remove(listener)
+
+
+class Span:
+    """
+    One timed page-object step.
+
+    `wait_seconds` is the time spent in wait steps (this span if it is a wait, otherwise
+    its wait descendants); the rest of the duration is action time. `driver_calls`
+    includes the WebDriver commands sent by descendants.
+
+    """
+
+    __slots__ = ("name", "kind", "parent", "depth", "started", "duration", "wait_seconds",
+                 "driver_calls", "failed")
+
+    def __init__(self, name, kind, parent, depth, started):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.depth = depth
+        self.started = started
+        self.duration = 0.0
+        self.wait_seconds = 0.0
+        self.driver_calls = 0
+        self.failed = False
+
+    @property
+    def action_seconds(self):
+        return max(self.duration - self.wait_seconds, 0.0)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "parent": self.parent.name if self.parent else None,
+            "depth": self.depth,
+            "duration": self.duration,
+            "wait_seconds": self.wait_seconds,
+            "action_seconds": self.action_seconds,
+            "driver_calls": self.driver_calls,
+            "failed": self.failed,
+        }
+
+
+class Tracer:
+    """
+    Collects the spans and WebDriver commands of a single test.
+
+    Spans are opened by @traced page-object methods while the tracer is active
+    (see activate) and WebDriver commands are counted through add_command_listener.
+
+    :param str name: Trace name (usually the test name)
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.spans = []
+        self.commands = []
+        self.started_wall = time.time()
+        self._started = time.perf_counter()
+        self._stack = []
+        self._token = None
+
+    def activate(self):
+        """
+        Makes this the tracer of the current context until deactivate().
+
+        """
+        self._token = _active_tracer.set(self)
+        return self
+
+    def deactivate(self):
+        if self._token is not None:
+            _active_tracer.reset(self._token)
+            self._token = None
+
+    def start_span(self, name, kind="action"):
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, kind, parent, len(self._stack), time.perf_counter() - self._started)
+        self._stack.append(span)
+        return span
+
+    def end_span(self, span, failed=False):
+        span.duration = time.perf_counter() - self._started - span.started
+        span.failed = failed
+        if span.kind == "wait":
+            span.wait_seconds = span.duration
+        # Spans close in LIFO order; tolerate a span left open by a generator or an error
+        while self._stack and self._stack.pop() is not span:
+            pass
+        if span.parent is not None:
+            span.parent.wait_seconds += span.wait_seconds
+            span.parent.driver_calls += span.driver_calls
+        else:
+            # Steps called by the test itself
+            logger.info("⏱ %s: %.2fs", span.name, span.duration)
+        self.spans.append(span)
+
+    def merge(self, other):
+        """
+        Adds the spans of a tracer that ran alongside this one (e.g. a flow run by
+        utils.multi_context.FlowScheduler), shifted onto this tracer's clock.
+
+        :param Tracer other: Finished tracer
+
+        """
+        offset = other._started - self._started
+        for span in other.spans:
+            span.started += offset
+        self.spans.extend(other.spans)
+
+    def current_span(self):
+        """
+        :return: The innermost open span, or None between steps
+        :rtype: Span
+
+        """
+        return self._stack[-1] if self._stack else None
+
+    def on_command(self, command, seconds, params=None, response=None):
+        """
+        Command listener: counts the command on the innermost open span. Commands sent
+        while another tracer is active (a flow sharing the session, see
+        utils.multi_context) belong to that tracer and are skipped.
+
+        """
+        active = _active_tracer.get()
+        if active is not None and active is not self:
+            return
+        now = time.perf_counter() - self._started
+        self.commands.append((command, now - seconds, seconds))
+        if self._stack:
+            self._stack[-1].driver_calls += 1
+
+    def trace_events(self, pid=None, tid=0):
+        """
+        Converts spans and commands to Chrome trace-event format (chrome://tracing, Perfetto).
+
+        :param pid: Process id shown in the viewer (default: current process)
+        :param tid: Thread id shown in the viewer
+        :return: {"traceEvents": [...]}
+        :rtype: dict
+
+        """
+        pid = os.getpid() if pid is None else pid
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": self.name}}]
+        for span in sorted(self.spans, key=lambda s: (s.started, s.depth)):
+            details = span.as_dict()
+            del details["name"], details["kind"]
+            events.append({
+                "name": span.name, "cat": span.kind, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round(span.started * 1e6), "dur": round(span.duration * 1e6), "args": details,
+            })
+        for command, started, seconds in self.commands:
+            events.append({
+                "name": command, "cat": "webdriver", "ph": "X", "pid": pid, "tid": tid,
+                "ts": round(started * 1e6), "dur": round(seconds * 1e6),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"trace": self.name, "started": self.started_wall}}
+
+    def trace_json(self):
+        """
+        :return: trace_events() serialized as UTF-8 JSON
+        :rtype: bytes
+
+        """
+        return json.dumps(self.trace_events()).encode()
+
+
+def traced(name, kind="action"):
+    """
+    Decorator recording a span around a method while a tracer is active.
+    Costs one context variable lookup when no tracer is active. Coroutine methods
+    (async page objects) are recorded until they complete.
+
+    :param str name: Span name
+    :param str kind: "action" or "wait"
+
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _active_tracer.get()
+                if tracer is None:
+                    return await func(*args, **kwargs)
+                span = tracer.start_span(name, kind)
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    tracer.end_span(span, failed=failed)
+
+            async_wrapper.__traced__ = True
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer.get()
+            if tracer is None:
+                return func(*args, **kwargs)
+            span = tracer.start_span(name, kind)
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                tracer.end_span(span, failed=failed)
+
+        wrapper.__traced__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls):
+    """
+    Wraps every public method defined on `cls` with @traced("<Class>.<method>").
+    Methods whose name starts with "wait" are recorded as wait spans. Generator methods
+    are left as they are: their body runs while the caller iterates, so the steps they call
+    are recorded under the caller's span.
+
+    :param type cls: Page-object class
+    :return: The same class
+    :rtype: type
+
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value) or getattr(value, "__traced__", False):
+            continue
+        if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+            continue
+        kind = "wait" if attr.startswith("wait") else "action"
+        setattr(cls, attr, traced(f"{cls.__name__}.{attr}", kind)(value))
+    return cls
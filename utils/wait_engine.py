@@ -0,0 +1,417 @@
+import asyncio
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Script timeout of each WebDriver session, read from the session once and only ever
+# raised. The limit applies to the whole session, which outlives the page objects (and
+# their waiters) that use it; forget_script_timeout drops a session when it is quit.
+_script_timeouts = {}
+
+# W3C default script timeout, assumed when the session cannot report its own
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+def _session_key(driver):
+    return getattr(driver, "session_id", None) or driver
+
+
+def _seconds(script_timeout):
+    # A null script timeout means scripts never time out
+    return float("inf") if script_timeout is None else script_timeout
+
+
+def forget_script_timeout(driver):
+    """
+    Drops the recorded script timeout of a session; call it when the session is quit.
+
+    :param driver: Selenium WebDriver or AsyncWebDriver instance
+
+    """
+    _script_timeouts.pop(_session_key(driver), None)
+
+
+# Shared in-page condition check. Tries each (by, value) strategy in order and returns
+# {index, value} for the first one that satisfies the condition, or null. The time spent
+# querying each strategy is accumulated into `costs` (milliseconds).
+_CHECK_JS = """
+function __find(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'xpath': return document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'css selector': return document.querySelector(value);
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'link text':
+        case 'partial link text':
+            var links = document.getElementsByTagName('a');
+            for (var i = 0; i < links.length; i++) {
+                var text = links[i].innerText.trim();
+                if (by === 'link text' ? text === value : text.indexOf(value) !== -1) return links[i];
+            }
+            return null;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function __count(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value) ? 1 : 0;
+        case 'xpath': return document.evaluate(value, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+        case 'css selector': return document.querySelectorAll(value).length;
+        case 'class name': return document.getElementsByClassName(value).length;
+        case 'name': return document.getElementsByName(value).length;
+        case 'tag name': return document.getElementsByTagName(value).length;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function __all(by, value) {
+    switch (by) {
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'name': return Array.from(document.getElementsByName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'id': var el = document.getElementById(value); return el ? [el] : [];
+        case 'xpath':
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+// Field syntax of utils.dom_extract: "attr:<name>", "prop:<name>", "text" or {"selector", "value"}
+function __key(el, field) {
+    if (field !== null && typeof field === 'object') {
+        var child = el.querySelector(field.selector);
+        return child ? __key(child, field.value || 'text') : null;
+    }
+    if (field === 'text') return (el.innerText || el.textContent || '').trim();
+    if (field.indexOf('attr:') === 0) return el.getAttribute(field.slice(5));
+    if (field.indexOf('prop:') === 0) return el[field.slice(5)];
+    throw new Error('Unsupported key field: ' + field);
+}
+// Number of elements none of whose key fields has a value in `seen` (an object used as a set)
+function __unseen(elements, fields, seen) {
+    return elements.filter(function (el) {
+        return !fields.some(function (field) {
+            var value = __key(el, field);
+            return value !== null && value !== undefined && seen.hasOwnProperty(String(value));
+        });
+    }).length;
+}
+function __visible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function __match(kind, el, expected) {
+    switch (kind) {
+        case 'present': return el;
+        case 'clickable': return el && __visible(el) && !el.disabled ? el : null;
+        case 'text':
+            return el && (el.innerText || el.textContent || '').indexOf(expected) !== -1 ? true : null;
+    }
+    throw new Error('Unsupported wait condition: ' + kind);
+}
+function __check(kind, strategies, expected, costs) {
+    if (kind === 'ready') {
+        var state = document.readyState;
+        return state === 'complete' || state === expected ? {index: -1, value: true} : null;
+    }
+    for (var i = 0; i < strategies.length; i++) {
+        var started = performance.now();
+        if (kind === 'unseen') {
+            if (!expected.seen) {
+                expected.seen = {};
+                expected.values.forEach(function (value) { expected.seen[value] = true; });
+            }
+            var fresh = __unseen(__all(strategies[i][0], strategies[i][1]), expected.fields, expected.seen);
+            costs[i] += performance.now() - started;
+            if (fresh) return {index: i, value: fresh};
+            continue;
+        }
+        if (kind === 'more') {
+            var count = __count(strategies[i][0], strategies[i][1]);
+            costs[i] += performance.now() - started;
+            if (count > expected) return {index: i, value: count};
+            continue;
+        }
+        var el = __find(strategies[i][0], strategies[i][1]);
+        costs[i] += performance.now() - started;
+        if (kind === 'invisible') {
+            if (el && __visible(el)) return null;
+            continue;
+        }
+        var value = __match(kind, el, expected);
+        if (value) return {index: i, value: value};
+    }
+    return kind === 'invisible' ? {index: 0, value: true} : null;
+}
+function __costs(strategies) {
+    var costs = [];
+    for (var i = 0; i < strategies.length; i++) costs.push(0);
+    return costs;
+}
+"""
+
+_ASYNC_WAIT_JS = _CHECK_JS + """
+var done = arguments[arguments.length - 1];
+var kind = arguments[0], strategies = arguments[1], expected = arguments[2];
+var costs = __costs(strategies);
+var finished = false, observer = null, interval = null, timer = null;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    document.removeEventListener('readystatechange', evaluate);
+    result = result || {index: -1, value: null};
+    result.costs = costs;
+    done(result);
+}
+function evaluate() {
+    var result = __check(kind, strategies, expected, costs);
+    if (result) finish(result);
+}
+evaluate();
+if (!finished) {
+    observer = new MutationObserver(evaluate);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    document.addEventListener('readystatechange', evaluate);
+    // Style-only changes (CSS transitions, stylesheet loads) do not trigger mutations
+    interval = setInterval(evaluate, 100);
+    timer = setTimeout(function () { finish(null); }, arguments[3]);
+}
+"""
+
+_SYNC_CHECK_JS = _CHECK_JS + """
+var costs = __costs(arguments[1]);
+var result = __check(arguments[0], arguments[1], arguments[2], costs) || {index: -1, value: null};
+result.costs = costs;
+return result;
+"""
+
+
+class EventWaiter:
+    """
+    Event-driven replacement for WebDriverWait polling.
+
+    A single execute_async_script installs a MutationObserver and a readyState listener
+    in the page and resolves as soon as the condition holds. If the page navigates away
+    while waiting, the listener is re-armed on the new document; if that keeps failing,
+    the waiter falls back to polling with an adaptive interval (poll_min doubling up to poll_max).
+
+    Supported conditions: "present", "clickable", "invisible", "text", "more" (more than
+    `expected` elements match, e.g. after lazy loading), "unseen" (an element matches whose
+    key fields have none of the values in `expected`, e.g. after a virtualized list recycled
+    its nodes) and "ready".
+
+    :param driver: Selenium WebDriver instance
+    :param float poll_min: First polling interval of the fallback, in seconds
+    :param float poll_max: Max polling interval of the fallback, in seconds
+    :param int max_rearms: Navigations tolerated before switching to polling
+    :param float wait_slice: Max seconds a single in-page wait holds the session; longer
+        waits are re-issued slice by slice so flows sharing the session can run in between
+        (see utils.multi_context). None waits in one piece.
+
+    """
+
+    def __init__(self, driver, poll_min=0.05, poll_max=0.5, max_rearms=3, wait_slice=None):
+        self.driver = driver
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.max_rearms = max_rearms
+        self.wait_slice = wait_slice
+        self.stats = {"async_waits": 0, "rearms": 0, "polls": 0}
+
+    def until(self, condition, by=None, locator=None, expected=None, timeout=15):
+        """
+        Waits until `condition` holds for the element located by (by, locator).
+
+        :param str condition: "present", "clickable", "invisible", "text", "more", "unseen" or "ready"
+        :param by: Selenium By strategy (not needed for "ready")
+        :param locator: The locator string (not needed for "ready")
+        :param expected: Expected text for "text", element count to exceed for "more",
+            {"fields": [field, ...], "values": [...]} for "unseen", "interactive" for "ready"
+            to also accept a document that is parsed but still loading subresources
+        :param float timeout: Max wait time in seconds
+        :return: WebElement for "present"/"clickable", element count for "more"/"unseen", True otherwise
+        :raises TimeoutException: If the condition does not hold in time
+
+        """
+        strategies = [(by, locator)] if by is not None else []
+        _, value, _ = self.until_any(condition, strategies, expected=expected, timeout=timeout)
+        return value
+
+    def until_any(self, condition, strategies, expected=None, timeout=15):
+        """
+        Waits until `condition` holds for the first of several locator strategies.
+        Strategies are evaluated in order inside the page, so the whole fallback chain
+        costs a single round-trip.
+
+        :param str condition: "present", "clickable", "invisible", "text", "more", "unseen" or "ready"
+        :param strategies: Ordered list of (by, locator) pairs
+        :param expected: See until
+        :param float timeout: Max wait time in seconds
+        :return: (index of the matching strategy, WebElement or True, in-page query ms per strategy)
+        :rtype: tuple
+        :raises TimeoutException: If the condition does not hold in time
+
+        """
+        deadline = time.monotonic() + timeout
+        args = (condition, [list(strategy) for strategy in strategies], expected)
+        label = strategies[0][1] if strategies else "document"
+
+        rearms = 0
+        while rearms <= self.max_rearms:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            window = min(remaining, self.wait_slice) if self.wait_slice else remaining
+            try:
+                result = self._wait_async(args, window)
+            except TimeoutException:
+                # Driver-side script timeout: the session limit was lower than recorded (changed
+                # elsewhere). Not a navigation; read the limit again and raise it while time remains.
+                _script_timeouts.pop(_session_key(self.driver), None)
+                if deadline - time.monotonic() <= 0:
+                    raise TimeoutException(f"Condition '{condition}' not met for {label} within {timeout}s")
+                continue
+            except WebDriverException:
+                # Document unloaded while waiting (navigation): re-arm on the new page
+                rearms += 1
+                self.stats["rearms"] += 1
+                continue
+            if result and result.get("value"):
+                return result["index"], result["value"], result.get("costs", [])
+            if window < remaining:
+                continue
+            raise TimeoutException(f"Condition '{condition}' not met for {label} within {timeout}s")
+
+        return self._poll(args, deadline, timeout, label)
+
+    def _wait_async(self, args, remaining):
+        self._ensure_script_timeout(remaining)
+        self.stats["async_waits"] += 1
+        return self.driver.execute_async_script(_ASYNC_WAIT_JS, *args, int(remaining * 1000))
+
+    def _ensure_script_timeout(self, remaining):
+        # The in-page timer resolves first; the driver-side limit only guards against a hung page.
+        # It is never lowered: other scripts of the session (e.g. utils.page_metrics) rely on it.
+        needed = int(remaining) + 5
+        key = _session_key(self.driver)
+        if key not in _script_timeouts:
+            try:
+                _script_timeouts[key] = self.driver.timeouts.script
+            except (TypeError, WebDriverException):
+                # Selenium cannot represent a null (unlimited) script timeout
+                _script_timeouts[key] = DEFAULT_SCRIPT_TIMEOUT
+        if _script_timeouts[key] < needed:
+            self.driver.set_script_timeout(needed)
+            _script_timeouts[key] = needed
+
+    def _poll(self, args, deadline, timeout, label):
+        interval = self.poll_min
+        while True:
+            self.stats["polls"] += 1
+            try:
+                result = self.driver.execute_script(_SYNC_CHECK_JS, *args)
+            except WebDriverException:
+                result = None
+            if result and result.get("value"):
+                return result["index"], result["value"], result.get("costs", [])
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Condition '{args[0]}' not met for {label} within {timeout}s")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.poll_max)
+
+
+class AsyncEventWaiter:
+    """
+    asyncio counterpart of EventWaiter for utils.async_webdriver sessions: the same
+    in-page wait, awaited without blocking the event loop, so other flows keep running.
+
+    :param driver: AsyncWebDriver instance
+    :param float poll_min: First polling interval of the fallback, in seconds
+    :param float poll_max: Max polling interval of the fallback, in seconds
+    :param int max_rearms: Navigations tolerated before switching to polling
+
+    """
+
+    def __init__(self, driver, poll_min=0.05, poll_max=0.5, max_rearms=3):
+        self.driver = driver
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.max_rearms = max_rearms
+        self.stats = {"async_waits": 0, "rearms": 0, "polls": 0}
+
+    async def until(self, condition, by=None, locator=None, expected=None, timeout=15):
+        """
+        See EventWaiter.until.
+
+        """
+        strategies = [(by, locator)] if by is not None else []
+        _, value, _ = await self.until_any(condition, strategies, expected=expected, timeout=timeout)
+        return value
+
+    async def until_any(self, condition, strategies, expected=None, timeout=15):
+        """
+        See EventWaiter.until_any.
+
+        """
+        deadline = time.monotonic() + timeout
+        args = (condition, [list(strategy) for strategy in strategies], expected)
+        label = strategies[0][1] if strategies else "document"
+
+        rearms = 0
+        while rearms <= self.max_rearms:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # See EventWaiter._ensure_script_timeout
+            needed = int(remaining) + 5
+            key = _session_key(self.driver)
+            if key not in _script_timeouts:
+                try:
+                    _script_timeouts[key] = _seconds(await self.driver.script_timeout())
+                except WebDriverException:
+                    _script_timeouts[key] = DEFAULT_SCRIPT_TIMEOUT
+            if _script_timeouts[key] < needed:
+                await self.driver.set_script_timeout(needed)
+                _script_timeouts[key] = needed
+            self.stats["async_waits"] += 1
+            try:
+                result = await self.driver.execute_async_script(_ASYNC_WAIT_JS, *args, int(remaining * 1000))
+            except TimeoutException:
+                # Driver-side script timeout, see EventWaiter.until_any
+                _script_timeouts.pop(key, None)
+                if deadline - time.monotonic() <= 0:
+                    raise TimeoutException(f"Condition '{condition}' not met for {label} within {timeout}s")
+                continue
+            except WebDriverException:
+                rearms += 1
+                self.stats["rearms"] += 1
+                continue
+            if result and result.get("value"):
+                return result["index"], result["value"], result.get("costs", [])
+            raise TimeoutException(f"Condition '{condition}' not met for {label} within {timeout}s")
+
+        interval = self.poll_min
+        while True:
+            self.stats["polls"] += 1
+            try:
+                result = await self.driver.execute_script(_SYNC_CHECK_JS, *args)
+            except WebDriverException:
+                result = None
+            if result and result.get("value"):
+                return result["index"], result["value"], result.get("costs", [])
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Condition '{condition}' not met for {label} within {timeout}s")
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.poll_max)